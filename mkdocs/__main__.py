@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import shutil
@@ -13,6 +14,7 @@ import warnings
 import click
 
 from mkdocs import __version__, config, utils
+from mkdocs.utils import memory, profiling, tracing
 
 if sys.platform.startswith("win"):
     try:
@@ -107,7 +109,10 @@ class State:
 
 pass_state = click.make_pass_decorator(State, ensure=True)
 
-clean_help = "Remove old files from the site_dir before building (the default)."
+clean_help = (
+    "Remove old files from the site_dir before building (the default). "
+    "With --dirty, only write the pages that changed since the previous build."
+)
 config_help = (
     "Provide a specific MkDocs config. This can be a file name, or '-' to read from stdin."
 )
@@ -117,10 +122,29 @@ strict_help = "Enable strict mode. This will cause MkDocs to abort the build on
 theme_help = "The theme to use when building your documentation."
 theme_choices = sorted(utils.get_theme_names())
 site_dir_help = "The directory to output the result of the documentation build."
+jobs_help = "The number of processes to use for rendering pages (0 means one per CPU)."
+no_cache_help = "Don't use the cache of rendered pages, even if `cache_dir` is configured."
+plugin_stats_help = "Show how much time each plugin spent in each event after the build."
+profile_pages_help = (
+    "Profile the rendering of each page, report the slowest pages "
+    "and write the profile of all pages to this file (readable with `pstats`). Implies --jobs=1."
+)
+memory_report_help = (
+    "Report how much memory each phase of the build used, and the size of the objects that the "
+    "build keeps. Slows down the build. Implies --jobs=1."
+)
+trace_help = (
+    "Write the timings of the phases of the build to this file, in the Chrome trace event format "
+    "(viewable in chrome://tracing or https://ui.perfetto.dev)."
+)
 use_directory_urls_help = "Use directory URLs when building pages (the default)."
 reload_help = "Enable the live reloading in the development server (this is the default)"
 no_reload_help = "Disable the live reloading in the development server."
 serve_dirty_help = "Only re-build files that have changed."
+serve_lazy_help = (
+    "Render pages only when they're requested (or in the background), to start serving big sites "
+    "sooner. Has no effect with --clean."
+)
 serve_clean_help = (
     "Build the site without any effects of `mkdocs serve` - pure `mkdocs build`, then serve."
 )
@@ -258,10 +282,13 @@ def cli():
 @click.option('--dirtyreload', 'build_type', flag_value='dirty', hidden=True)
 @click.option('--dirty', 'build_type', flag_value='dirty', help=serve_dirty_help)
 @click.option('-c', '--clean', 'build_type', flag_value='clean', help=serve_clean_help)
+@click.option('--lazy', is_flag=True, help=serve_lazy_help)
 @click.option('--watch-theme', help=watch_theme_help, is_flag=True)
 @click.option(
     '-w', '--watch', help=watch_help, type=click.Path(exists=True), multiple=True, default=[]
 )
+@click.option('-j', '--jobs', type=int, help=jobs_help)
+@click.option('--no-cache', is_flag=True, help=no_cache_help)
 @common_config_options
 @common_options
 def serve_command(**kwargs):
@@ -276,18 +303,36 @@ def serve_command(**kwargs):
 @click.option('-c', '--clean/--dirty', is_flag=True, default=True, help=clean_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
+@click.option('-j', '--jobs', type=int, help=jobs_help)
+@click.option('--no-cache', is_flag=True, help=no_cache_help)
+@click.option('--trace', type=click.Path(dir_okay=False), help=trace_help)
+@click.option('--plugin-stats', is_flag=True, help=plugin_stats_help)
+@click.option('--profile-pages', type=click.Path(dir_okay=False), help=profile_pages_help)
+@click.option('--memory-report', is_flag=True, help=memory_report_help)
 @common_options
-def build_command(clean, **kwargs):
+def build_command(clean, no_cache, trace, plugin_stats, profile_pages, memory_report, **kwargs):
     """Build the MkDocs documentation."""
     from mkdocs.commands import build
 
     _enable_warnings()
-    cfg = config.load_config(**kwargs)
-    cfg.plugins.on_startup(command='build', dirty=not clean)
-    try:
-        build.build(cfg, dirty=not clean)
-    finally:
-        cfg.plugins.on_shutdown()
+    with contextlib.ExitStack() as stack:
+        if trace:
+            stack.enter_context(tracing.trace_to_file(trace))
+        if profile_pages:
+            stack.enter_context(profiling.profile_pages_to_file(profile_pages))
+        if memory_report:
+            stack.enter_context(memory.report_memory())
+        with tracing.span('load_config', 'mkdocs'):
+            cfg = config.load_config(**kwargs)
+        if no_cache:
+            cfg.cache_dir = None
+        cfg.plugins.on_startup(command='build', dirty=not clean)
+        try:
+            build.build(cfg, dirty=not clean)
+        finally:
+            cfg.plugins.on_shutdown()
+            if plugin_stats:
+                build.log.info(f"Time spent in plugin events:\n{cfg.plugins._format_event_stats()}")
 
 
 @cli.command(name="gh-deploy")
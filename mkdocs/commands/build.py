@@ -1,10 +1,35 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
 import gzip
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import multiprocessing
 import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
 import time
-from typing import TYPE_CHECKING, Sequence
+import weakref
+import zlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
 from urllib.parse import urljoin, urlsplit
 
 import jinja2
@@ -13,19 +38,82 @@ from jinja2.exceptions import TemplateNotFound
 import mkdocs
 from mkdocs import utils
 from mkdocs.exceptions import Abort, BuildError
-from mkdocs.structure.files import File, Files, InclusionLevel, get_files, set_exclusions
+from mkdocs.plugins import BasePlugin, EventStats
+from mkdocs.structure.files import (
+    File,
+    Files,
+    InclusionLevel,
+    _DocsDirSnapshot,
+    _get_exclude,
+    _get_files_from_listing,
+    _list_docs_dir,
+    get_files,
+    set_exclusions,
+)
 from mkdocs.structure.nav import Navigation, get_navigation
-from mkdocs.structure.pages import Page
+from mkdocs.structure.pages import Page, _fingerprint_default, _RenderCache
+from mkdocs.structure.toc import _get_toc_tokens
+from mkdocs.theme import Theme
 from mkdocs.utils import DuplicateFilter  # noqa: F401 - legacy re-export
-from mkdocs.utils import templates
+from mkdocs.utils import memory, profiling, templates, tracing
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure import StructureItem
 
 
 log = logging.getLogger(__name__)
 
 
+class _SharedContext:
+    """The parts of the template context that are the same for many pages, computed once per build."""
+
+    def __init__(self) -> None:
+        self.build_date_utc = utils.get_build_datetime()
+        self._extra: tuple[tuple, tuple] | None = None
+        self._prefix_len = 0
+        self._urls: dict[tuple, tuple[str, list[str], list[str]]] = {}
+
+    def get_urls(
+        self, config: MkDocsConfig, page: Page | None, base_url: str
+    ) -> tuple[str, list[str], list[str]]:
+        """Get `base_url` and the URLs of `extra_javascript` and `extra_css`, relative to the page."""
+        # Plugins may still change these configs while pages are being built.
+        extra = (tuple(config.extra_javascript), tuple(config.extra_css))
+        if extra != self._extra:
+            self._extra = extra
+            self._urls.clear()
+            # A relative URL from a page depends on how deep the page is, and on the
+            # directories that the page shares with the target, which are no more than this.
+            self._prefix_len = max(
+                (
+                    len(utils._norm_parts(path))
+                    for path in map(str, itertools.chain(*extra))
+                    if utils._get_norm_url(path)[1] != -1
+                ),
+                default=0,
+            )
+        if page is None:
+            key: tuple = (None, base_url)
+        else:
+            dirname, _, basename = page.url.rpartition('/')
+            parts = utils._norm_parts(dirname if '.' in basename else page.url)
+            key = (len(parts), *parts[: self._prefix_len])
+        if (urls := self._urls.get(key)) is None:
+            if page is not None:
+                base_url = utils.get_relative_url('.', page.url)
+            urls = self._urls[key] = (
+                base_url,
+                [utils.normalize_url(str(script), page, base_url) for script in extra[0]],
+                [utils.normalize_url(str(path), page, base_url) for path in extra[1]],
+            )
+        return urls
+
+
+_shared_contexts: weakref.WeakKeyDictionary[Navigation, _SharedContext]
+_shared_contexts = weakref.WeakKeyDictionary()
+
+
 def get_context(
     nav: Navigation,
     files: Sequence[File] | Files,
@@ -34,13 +122,13 @@ def get_context(
     base_url: str = '',
 ) -> templates.TemplateContext:
     """Return the template context for a given page or template."""
-    if page is not None:
-        base_url = utils.get_relative_url('.', page.url)
-
-    extra_javascript = [
-        utils.normalize_url(str(script), page, base_url) for script in config.extra_javascript
-    ]
-    extra_css = [utils.normalize_url(path, page, base_url) for path in config.extra_css]
+    try:
+        shared = _shared_contexts.get(nav)
+        if shared is None:
+            shared = _shared_contexts[nav] = _SharedContext()
+    except TypeError:  # A `nav` that can't be used as a key, nothing to keep the context with.
+        shared = _SharedContext()
+    base_url, extra_javascript, extra_css = shared.get_urls(config, page, base_url)
 
     if isinstance(files, Files):
         files = files.documentation_pages()
@@ -49,19 +137,60 @@ def get_context(
         nav=nav,
         pages=files,
         base_url=base_url,
-        extra_css=extra_css,
-        extra_javascript=extra_javascript,
+        # Copies, as plugins may modify the lists in the context.
+        extra_css=list(extra_css),
+        extra_javascript=list(extra_javascript),
         mkdocs_version=mkdocs.__version__,
-        build_date_utc=utils.get_build_datetime(),
+        build_date_utc=shared.build_date_utc,
         config=config,
         page=page,
     )
 
 
-def _build_template(
+def _output_required(config: MkDocsConfig, event_name: str) -> bool:
+    """Check whether any handler of the `post_page` or `post_template` event needs the whole output."""
+    return any(
+        getattr(method, 'mkdocs_requires_output', True)
+        for method in config.plugins.events[event_name]
+    )
+
+
+def _write_output(chunks: Iterable[str], output_path: str, errors: str = 'strict') -> bool:
+    """
+    Write the chunks of a rendered output to `output_path`, as they are generated.
+
+    An existing file is only replaced once all of the output is written. Nothing is written if
+    all of the output is whitespace. Returns whether the file was written.
+    """
+    chunks = iter(chunks)
+    leading = []
+    for chunk in chunks:
+        leading.append(chunk)
+        if chunk.strip():
+            break
+    else:
+        return False
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Write to a temporary file first, so that if the template fails halfway through, the output
+    # of the previous build is kept instead of a partial one.
+    temp_path = f'{output_path}.{os.getpid()}-{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8', errors=errors, newline='') as f:
+            f.writelines(leading)
+            f.writelines(chunks)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+    return True
+
+
+def _generate_template(
     name: str, template: jinja2.Template, files: Files, config: MkDocsConfig, nav: Navigation
-) -> str:
-    """Return rendered output for given template as a string."""
+) -> Iterator[str]:
+    """Generate the output of the given template, in chunks unless a plugin needs all of it."""
     # Run `pre_template` plugin events.
     template = config.plugins.on_pre_template(template, template_name=name, config=config)
 
@@ -80,12 +209,23 @@ def _build_template(
     # Run `template_context` plugin events.
     context = config.plugins.on_template_context(context, template_name=name, config=config)
 
-    output = template.render(context)
+    if _output_required(config, 'post_template'):
+        output = template.render(context)
+
+        # Run `post_template` plugin events.
+        yield config.plugins.on_post_template(output, template_name=name, config=config)
+    else:
+        yield from template.generate(context)
+
+        # Run `post_template` plugin events, none of them use the output.
+        config.plugins.on_post_template('', template_name=name, config=config)
 
-    # Run `post_template` plugin events.
-    output = config.plugins.on_post_template(output, template_name=name, config=config)
 
-    return output
+def _build_template(
+    name: str, template: jinja2.Template, files: Files, config: MkDocsConfig, nav: Navigation
+) -> str:
+    """Return rendered output for given template as a string."""
+    return ''.join(_generate_template(name, template, files, config, nav))
 
 
 def _build_theme_template(
@@ -100,23 +240,20 @@ def _build_theme_template(
         log.warning(f"Template skipped: '{template_name}' not found in theme directories.")
         return
 
-    output = _build_template(template_name, template, files, config, nav)
-
-    if output.strip():
-        output_path = os.path.join(config.site_dir, template_name)
-        utils.write_file(output.encode('utf-8'), output_path)
-
+    output_path = os.path.join(config.site_dir, template_name)
+    output = _generate_template(template_name, template, files, config, nav)
+    if _write_output(output, output_path):
         if template_name == 'sitemap.xml':
             log.debug(f"Gzipping template: {template_name}")
             gz_filename = f'{output_path}.gz'
-            with open(gz_filename, 'wb') as f:
+            with open(output_path, 'rb') as src, open(gz_filename, 'wb') as f:
                 timestamp = utils.get_build_timestamp(
                     pages=[f.page for f in files.documentation_pages() if f.page is not None]
                 )
                 with gzip.GzipFile(
                     fileobj=f, filename=gz_filename, mode='wb', mtime=timestamp
                 ) as gz_buf:
-                    gz_buf.write(output.encode('utf-8'))
+                    shutil.copyfileobj(src, gz_buf)
     else:
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
@@ -136,15 +273,19 @@ def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig
         log.warning(f"Error reading template '{template_name}': {e}")
         return
 
-    output = _build_template(template_name, template, files, config, nav)
-
-    if output.strip():
-        utils.write_file(output.encode('utf-8'), file.abs_dest_path)
-    else:
+    output = _generate_template(template_name, template, files, config, nav)
+    if not _write_output(output, file.abs_dest_path):
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
 
-def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool = False) -> None:
+def _populate_page(
+    page: Page,
+    config: MkDocsConfig,
+    files: Files,
+    dirty: bool = False,
+    *,
+    render_cache: _RenderCache | None = None,
+) -> None:
     """Read page content from docs_dir and render Markdown."""
     config._current_page = page
     try:
@@ -153,24 +294,29 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
         if dirty and not page.file.is_modified():
             return
 
-        # Run the `pre_page` plugin event
-        page = config.plugins.on_pre_page(page, config=config, files=files)
+        page_span = tracing.span('populate_page', 'mkdocs', page=page.file.src_uri)
+        with page_span, profiling.profile_page(page.file.src_uri):
+            # Run the `pre_page` plugin event
+            page = config.plugins.on_pre_page(page, config=config, files=files)
 
-        page.read_source(config)
-        assert page.markdown is not None
+            page.read_source(config)
+            assert page.markdown is not None
 
-        # Run `page_markdown` plugin events.
-        page.markdown = config.plugins.on_page_markdown(
-            page.markdown, page=page, config=config, files=files
-        )
+            # Run `page_markdown` plugin events.
+            page.markdown = config.plugins.on_page_markdown(
+                page.markdown, page=page, config=config, files=files
+            )
 
-        page.render(config, files)
-        assert page.content is not None
+            if render_cache is not None:
+                render_cache.render(page, config, files)
+            else:
+                page.render(config, files)
+            assert page.content is not None
 
-        # Run `page_content` plugin events.
-        page.content = config.plugins.on_page_content(
-            page.content, page=page, config=config, files=files
-        )
+            # Run `page_content` plugin events.
+            page.content = config.plugins.on_page_content(
+                page.content, page=page, config=config, files=files
+            )
     except Exception as e:
         message = f"Error reading page '{page.file.src_uri}':"
         # Prevent duplicated the error message because it will be printed immediately afterwards.
@@ -182,57 +328,261 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
         config._current_page = None
 
 
-def _build_page(
-    page: Page,
-    config: MkDocsConfig,
-    doc_files: Sequence[File],
-    nav: Navigation,
-    env: jinja2.Environment,
-    dirty: bool = False,
-    excluded: bool = False,
-) -> None:
-    """Pass a Page to theme template and write output to site_dir."""
-    config._current_page = page
-    try:
-        # When --dirty is used, only build the page if the file has been modified since the
-        # previous build of the output.
-        if dirty and not page.file.is_modified():
-            return
+_PARALLEL_PAGE_EVENTS = ('pre_page', 'page_read_source', 'page_markdown', 'page_content')
+
+
+class _WorkerState:
+    """The state of a worker process, inherited from the parent when it's forked."""
+
+    config: MkDocsConfig
+    files: Files
+    render_cache: _RenderCache | None
+
+
+_worker_state = _WorkerState()
+
+
+def _can_fork_workers() -> tuple[bool, str]:
+    """Return whether pages can be rendered by forked worker processes, and if not, why."""
+    # Forking is unsafe on macOS, and in a process that runs other threads (e.g. `mkdocs serve`).
+    if sys.platform == 'darwin' or 'fork' not in multiprocessing.get_all_start_methods():
+        return False, "worker processes aren't supported on this platform"
+    if threading.active_count() > 1:
+        return False, "other threads are running"
+    return True, ''
+
+
+def _get_jobs(config: MkDocsConfig, count: int, events: Sequence[str], stage: str) -> int:
+    """
+    Return the number of workers to use for processing `count` pages in the given stage.
+
+    All plugins that handle any of the `events` must declare `supports_parallel_build`.
+    """
+    jobs = config.jobs
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, count)
+    if jobs <= 1:
+        return 1
+    if profiling.PageProfiler.active is not None:
+        log.info(f"{stage} serially, because pages are being profiled.")
+        return 1
+    if memory.MemoryReport.active is not None:
+        log.info(f"{stage} serially, because the memory of the build is being measured.")
+        return 1
+
+    plugins = config.plugins
+    unsupported = []
+    for event_name in events:
+        for method in plugins.events[event_name]:
+            plugin_name = plugins._event_origins.get(method, '<unknown>')
+            if not getattr(plugins.get(plugin_name), 'supports_parallel_build', False):
+                unsupported.append(plugin_name)
+    if unsupported:
+        unsupported = utils.reduce_list(unsupported)
+        log.info(
+            f"{stage} serially, because these plugins don't declare "
+            f"`supports_parallel_build`: {', '.join(unsupported)}"
+        )
+        return 1
+    return jobs
 
-        log.debug(f"Building page {page.file.src_uri}")
 
-        # Activate page. Signals to theme that this is the current page.
-        page.active = True
+class _LogRecorder(logging.Handler):
+    """Collects log records in a worker process so that the parent can emit them in order."""
 
-        context = get_context(nav, doc_files, config, page)
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
 
-        # Allow 'template:' override in md source files.
-        template = env.get_template(page.meta.get('template', 'main.html'))
+    def emit(self, record: logging.LogRecord) -> None:
+        # Same as `QueueHandler.prepare`: make the record picklable.
+        message = self.format(record)
+        record.msg = record.message = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
 
-        # Run `page_context` plugin events.
-        context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
 
-        if excluded:
-            page.content = (
-                '<div class="mkdocs-draft-marker" title="This page will not be included into the built site.">'
-                'DRAFT'
-                '</div>' + (page.content or '')
-            )
+def _init_worker(config: MkDocsConfig, files: Files, render_cache: _RenderCache | None) -> None:
+    _worker_state.config = config
+    _worker_state.files = files
+    _worker_state.render_cache = render_cache
+    logger = logging.getLogger('mkdocs')
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.propagate = False
+    # Drop the spans and stats inherited from the parent process, only send back the new ones.
+    tracing._take_events()
+    config.plugins._take_event_stats()
+
+
+class _WorkerResult(NamedTuple):
+    state: dict[str, Any] | None
+    """The state of the page for `_apply_page_state`, unless there was an error."""
+    records: list[logging.LogRecord]
+    spans: list[dict[str, Any]]
+    event_stats: dict[tuple[str, str], EventStats]
+    error: BaseException | None
+
+
+def _populate_page_in_worker(src_uri: str) -> _WorkerResult:
+    """Populate a page in a worker process and return its state and everything it logged."""
+    config, files = _worker_state.config, _worker_state.files
+    render_cache = _worker_state.render_cache
+    file = files.src_uris[src_uri]
+
+    recorder = _LogRecorder()
+    logger = logging.getLogger('mkdocs')
+    logger.addHandler(recorder)
+    state, error = None, None
+    try:
+        assert file.page is not None
+        _populate_page(file.page, config, files, render_cache=render_cache)
+        state = _get_page_state(file.page)
+    except Exception as e:
+        error = e
+    finally:
+        logger.removeHandler(recorder)
+    return _WorkerResult(
+        state,
+        recorder.records,
+        tracing._take_events(),
+        config.plugins._take_event_stats(),
+        error,
+    )
 
-        # Render the template.
-        output = template.render(context)
 
-        # Run `post_page` plugin events.
-        output = config.plugins.on_post_page(output, page=page, config=config)
+def _get_page_state(page: Page) -> dict[str, Any]:
+    state = {
+        'markdown': page.markdown,
+        'meta': page.meta,
+        'content': page.content,
+        'toc': page.toc,
+        '_title_from_render': page._title_from_render,
+        'present_anchor_ids': page.present_anchor_ids,
+    }
+    if 'title' in vars(page):
+        state['title'] = page.title
+    if page.links_to_anchors is not None:
+        state['links_to_anchors'] = {
+            file.src_uri: links for file, links in page.links_to_anchors.items()
+        }
+    return state
+
+
+def _apply_page_state(page: Page, state: dict[str, Any], files: Files) -> None:
+    links_to_anchors = state.pop('links_to_anchors', None)
+    for key, value in state.items():
+        setattr(page, key, value)
+    if links_to_anchors is not None:
+        page.links_to_anchors = {
+            files.src_uris[src_uri]: links for src_uri, links in links_to_anchors.items()
+        }
+
+
+def _populate_pages(
+    pages: Sequence[Page],
+    config: MkDocsConfig,
+    files: Files,
+    spilled: _SpilledPages | None = None,
+) -> None:
+    """Populate all pages, using a pool of worker processes if `config.jobs` allows it."""
+    render_cache = _RenderCache(config) if config.cache_dir else None
+    jobs = _get_jobs(config, len(pages), _PARALLEL_PAGE_EVENTS, "Rendering pages")
+    if jobs > 1:
+        can_fork, reason = _can_fork_workers()
+        if not can_fork:
+            log.info(f"Rendering pages serially, because {reason}.")
+            jobs = 1
+
+    try:
+        if jobs == 1:
+            for page in pages:
+                _populate_page(page, config, files, render_cache=render_cache)
+                if spilled is not None:
+                    spilled.spill(page)
+            return
 
-        # Write the output file.
-        if output.strip():
-            utils.write_file(
-                output.encode('utf-8', errors='xmlcharrefreplace'), page.file.abs_dest_path
+        log.debug(f"Rendering {len(pages)} pages using {jobs} processes.")
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(config, files, render_cache),
+        ) as executor:
+            results = executor.map(
+                _populate_page_in_worker,
+                [page.file.src_uri for page in pages],
+                chunksize=max(1, len(pages) // (jobs * 4)),
             )
-        else:
-            log.info(f"Page skipped: '{page.file.src_uri}'. Generated empty output.")
-
+            # Results arrive in the original order, so the log output matches a serial build.
+            for page, result in zip(pages, results):
+                for record in result.records:
+                    logging.getLogger(record.name).handle(record)
+                tracing._add_events(result.spans)
+                config.plugins._add_event_stats(result.event_stats)
+                if result.error is not None:
+                    raise result.error
+                assert result.state is not None
+                _apply_page_state(page, result.state, files)
+                if spilled is not None:
+                    spilled.spill(page)
+    finally:
+        if render_cache is not None:
+            render_cache.trim()
+
+
+class _SpilledPages:
+    """
+    Keeps the Markdown and HTML of pages in a temporary file while they're not needed, for the
+    `low_memory` config.
+
+    Pages are spilled after their Markdown is rendered, restored just before their template is
+    rendered, and released after they're written. So only the pages that are being written are
+    kept in memory, along with the title, toc and anchors of all pages.
+    """
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._positions: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def spill(self, page: Page) -> None:
+        # The title is derived from the Markdown, keep it for the navigation of the other pages.
+        page.title = page.title
+        data = zlib.compress(json.dumps([page.markdown, page.content]).encode(), 1)
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+            self._positions[page.file.src_uri] = (offset, len(data))
+        self.release(page)
+
+    def restore(self, page: Page) -> None:
+        with self._lock:
+            position = self._positions.pop(page.file.src_uri, None)
+            if position is None:
+                return
+            self._file.seek(position[0])
+            data = self._file.read(position[1])
+        page.markdown, page.content = json.loads(zlib.decompress(data))
+
+    def release(self, page: Page) -> None:
+        page.markdown = page.content = None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@contextlib.contextmanager
+def _building_page(page: Page, config: MkDocsConfig) -> Iterator[None]:
+    """Make the page the current one (in this thread only) and report errors that occur while building it."""
+    config._current_page = page
+    # Activate page. Signals to theme that this is the current page.
+    page.active = True
+    try:
+        yield
     except Exception as e:
         message = f"Error building page '{page.file.src_uri}':"
         # Prevent duplicated the error message because it will be printed immediately afterwards.
@@ -246,7 +596,742 @@ def _build_page(
         config._current_page = None
 
 
-def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = False) -> None:
+def _get_page_template(
+    page: Page,
+    config: MkDocsConfig,
+    doc_files: Sequence[File],
+    nav: Navigation,
+    env: jinja2.Environment,
+    excluded: bool = False,
+) -> tuple[jinja2.Template, templates.TemplateContext]:
+    """Run the `page_context` event of a page and return the template and context to render."""
+    log.debug(f"Building page {page.file.src_uri}")
+
+    context = get_context(nav, doc_files, config, page)
+
+    # Allow 'template:' override in md source files.
+    template = env.get_template(page.meta.get('template', 'main.html'))
+
+    # Run `page_context` plugin events.
+    context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+
+    if excluded:
+        page.content = (
+            '<div class="mkdocs-draft-marker" title="This page will not be included into the built site.">'
+            'DRAFT'
+            '</div>' + (page.content or '')
+        )
+    return template, context
+
+
+def _render_page(
+    page: Page, config: MkDocsConfig, template: jinja2.Template, context: templates.TemplateContext
+) -> str:
+    """Render the template of a page. This can run in a worker thread."""
+    with tracing.span('render_page', 'mkdocs', page=page.file.src_uri):
+        with _building_page(page, config):
+            return template.render(context)
+
+
+def _write_page(page: Page, config: MkDocsConfig, output: str | Iterable[str]) -> None:
+    """
+    Write the output file of a page. This can run in a worker thread.
+
+    The output can be the chunks generated by the template, then the template is rendered here.
+    """
+    with tracing.span('write_page', 'mkdocs', page=page.file.src_uri), _building_page(page, config):
+        if isinstance(output, str):
+            output = (output,)
+        if not _write_output(output, page.file.abs_dest_path, errors='xmlcharrefreplace'):
+            log.info(f"Page skipped: '{page.file.src_uri}'. Generated empty output.")
+
+
+def _build_page(
+    page: Page,
+    config: MkDocsConfig,
+    doc_files: Sequence[File],
+    nav: Navigation,
+    env: jinja2.Environment,
+    dirty: bool = False,
+    excluded: bool = False,
+    *,
+    build_state: _BuildState | None = None,
+    spilled: _SpilledPages | None = None,
+) -> None:
+    """Pass a Page to theme template and write output to site_dir."""
+    # When --dirty is used, only build the page if the file has been modified since the
+    # previous build of the output.
+    if dirty and not page.file.is_modified():
+        return
+    if spilled is not None:
+        spilled.restore(page)
+    page_span = tracing.span('build_page', 'mkdocs', page=page.file.src_uri)
+    with page_span, profiling.profile_page(page.file.src_uri):
+        try:
+            with _building_page(page, config):
+                template, context = _get_page_template(page, config, doc_files, nav, env, excluded)
+
+                # When --dirty is used, only build the page if anything that it depends on has
+                # changed since the previous build.
+                if build_state is not None and build_state.is_page_unchanged(
+                    page, template, context
+                ):
+                    log.debug(f"Skip building unchanged page: '{page.file.src_uri}'")
+                    return
+
+                output: str | Iterator[str]
+                if output_required := _output_required(config, 'post_page'):
+                    # Render the template.
+                    output = template.render(context)
+
+                    # Run `post_page` plugin events.
+                    output = config.plugins.on_post_page(output, page=page, config=config)
+                else:
+                    # The template is rendered while the output file is written.
+                    output = template.generate(context)
+
+            # Write the output file.
+            _write_page(page, config, output)
+
+            if not output_required:
+                with _building_page(page, config):
+                    # Run `post_page` plugin events, none of them use the output.
+                    config.plugins.on_post_page('', page=page, config=config)
+        finally:
+            if spilled is not None:
+                spilled.release(page)
+
+
+_PARALLEL_OUTPUT_EVENTS = ('env', 'page_context', 'post_page')
+
+
+def _build_pages(
+    doc_files: Sequence[File],
+    config: MkDocsConfig,
+    nav: Navigation,
+    env: jinja2.Environment,
+    build_state: _BuildState | None = None,
+    spilled: _SpilledPages | None = None,
+) -> None:
+    """Build all pages, rendering templates and writing files in a thread pool if `config.jobs` allows it."""
+    jobs = _get_jobs(config, len(doc_files), _PARALLEL_OUTPUT_EVENTS, "Writing pages")
+    if jobs == 1:
+        for file in doc_files:
+            assert file.page is not None
+            _build_page(
+                file.page,
+                config,
+                doc_files,
+                nav,
+                env,
+                excluded=file.inclusion.is_excluded(),
+                build_state=build_state,
+                spilled=spilled,
+            )
+        return
+
+    log.debug(f"Writing {len(doc_files)} pages using {jobs} threads.")
+    # Plugin events still run in the main thread, and each event runs for the pages in order.
+    # Only the template rendering and the writing of files runs concurrently.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        # When no `post_page` handler needs the output, pages are written while they're rendered.
+        output_required = _output_required(config, 'post_page')
+        rendering: collections.deque[
+            tuple[Page, concurrent.futures.Future[str] | concurrent.futures.Future[None]]
+        ]
+        rendering = collections.deque()
+        writing: list[concurrent.futures.Future[None]] = []
+
+        def finish_page() -> None:
+            page, future = rendering.popleft()
+            output = future.result()
+            with _building_page(page, config):
+                # Run `post_page` plugin events.
+                if output is None:
+                    config.plugins.on_post_page('', page=page, config=config)
+                else:
+                    output = config.plugins.on_post_page(output, page=page, config=config)
+            if spilled is not None:
+                spilled.release(page)
+            if output is not None:
+                writing.append(executor.submit(_write_page, page, config, output))
+
+        try:
+            for file in doc_files:
+                page = file.page
+                assert page is not None
+                if spilled is not None:
+                    spilled.restore(page)
+                page_span = tracing.span('page_context', 'mkdocs', page=page.file.src_uri)
+                with page_span, _building_page(page, config):
+                    template, context = _get_page_template(
+                        page, config, doc_files, nav, env, excluded=file.inclusion.is_excluded()
+                    )
+                    if build_state is not None and build_state.is_page_unchanged(
+                        page, template, context
+                    ):
+                        log.debug(f"Skip building unchanged page: '{page.file.src_uri}'")
+                        if spilled is not None:
+                            spilled.release(page)
+                        continue
+                future: concurrent.futures.Future[str] | concurrent.futures.Future[None]
+                if output_required:
+                    future = executor.submit(_render_page, page, config, template, context)
+                else:
+                    # The template is rendered while the output file is written.
+                    future = executor.submit(_write_page, page, config, template.generate(context))
+                rendering.append((page, future))
+                # Limit the number of rendered pages that are held in memory.
+                if len(rendering) > jobs * 2:
+                    finish_page()
+            while rendering:
+                finish_page()
+            for written in writing:
+                written.result()
+        except BaseException:
+            for _, rendered in rendering:
+                rendered.cancel()
+            raise
+
+
+class _BuildState:
+    """
+    The record of a previous build that lets `build(dirty=True)` skip unchanged pages.
+
+    For each page, this records a digest of everything that its output depends on: the site-wide
+    config, the navigation (including all titles), the templates that the page's template includes
+    or extends, the rendered content and metadata of the page, and any extra template context
+    added by plugins. A page is only built again if its digest differs from the previous build.
+
+    The state is kept in `cache_dir` if that's configured, otherwise in the temporary directory
+    of the system (only by dirty builds). Either way, it's keyed by the `site_dir`. Other builds
+    remove the state first, as they may change the site without recording it. During
+    `mkdocs serve`, the state of the previous build is also kept in memory.
+    """
+
+    version = 1
+
+    # Settings that don't affect the output of the build.
+    _ignored_settings = frozenset(
+        {
+            'config_file_path',
+            'site_dir',
+            'jobs',
+            'cache_dir',
+            'cache_max_size',
+            'low_memory',
+            'dev_addr',
+            'dev_server',
+            'watch',
+            'watch_method',
+        }
+    )
+
+    def __init__(
+        self, config: MkDocsConfig, *, dirty: bool = False, session: _ServeSession | None = None
+    ) -> None:
+        self.config = config
+        self.path = self.get_path(config)
+        self.save = dirty or config.cache_dir is not None
+        self.enabled = self.save or session is not None
+        if not dirty:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log.debug(f"Failed to remove the state of the previous build in '{self.path}': {e}")
+
+        self.previous_pages: dict[str, str] = {}
+        self.previous_outputs: list[str] = []
+        self.has_previous = False
+        if session is not None and session.build_state is not None:
+            self.previous_pages = session.build_state.pages
+            self.previous_outputs = session.build_state.outputs
+            self.has_previous = True
+        elif dirty:
+            self._load(self.path)
+
+        self.pages: dict[str, str] = {}
+        self.outputs: list[str] = []
+        self.site_digest: str | None = None
+        self._template_digests: dict[str, str] = {}
+
+    @classmethod
+    def get_path(cls, config: MkDocsConfig) -> str:
+        key = hashlib.sha256(os.path.abspath(config.site_dir).encode()).hexdigest()[:16]
+        if config.cache_dir is not None:
+            return os.path.join(config.cache_dir, 'builds', f'{key}.json')
+        return os.path.join(tempfile.gettempdir(), 'mkdocs-build-state', f'{key}.json')
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.debug(f"Ignoring the state of the previous build in '{path}': {e}")
+            return
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return
+        self.previous_pages = data['pages']
+        self.previous_outputs = data['outputs']
+        self.has_previous = True
+
+    def start(self, nav: Navigation, files: Files, env: jinja2.Environment) -> None:
+        """Record the parts of the site that all pages depend on. Call this after `on_env`."""
+        if not self.enabled:
+            return
+        try:
+            site = [
+                mkdocs.__version__,
+                {k: v for k, v in self.config.items() if k not in self._ignored_settings},
+                [_get_nav_item_state(item) for item in nav],
+                nav.homepage.url if nav.homepage else None,
+                [
+                    [file.src_uri, file.url, file.page.title if file.page else None]
+                    for file in files.documentation_pages()
+                ],
+                sorted(env.globals),
+                sorted(env.filters),
+            ]
+            fingerprint = json.dumps(site, sort_keys=True, default=_get_state_default)
+        except Exception as e:
+            log.debug(f"Can't record the state of the site, all pages will be built: {e}")
+            return
+        self.site_digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+
+    def _get_template_digest(self, env: jinja2.Environment, name: str) -> str:
+        """Get a digest of the sources of a template and all templates that it references."""
+        if (cached := self._template_digests.get(name)) is not None:
+            return cached
+        assert env.loader is not None
+        digest = hashlib.sha256()
+        seen: set[str] = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            source = env.loader.get_source(env, current)[0]
+            digest.update(current.encode() + b'\0' + source.encode() + b'\0')
+            for ref in templates._find_referenced_templates(env.parse(source)):
+                if ref is None:
+                    # The template name is computed at runtime, so it could be any template.
+                    pending.extend(env.list_templates())
+                else:
+                    pending.append(ref)
+        self._template_digests[name] = digest.hexdigest()
+        return self._template_digests[name]
+
+    def is_page_unchanged(
+        self, page: Page, template: jinja2.Template, context: templates.TemplateContext
+    ) -> bool:
+        """Record the digest of the page, and check whether its output from the previous build is still valid."""
+        if self.site_digest is None or template.name is None:
+            return False
+        extra_context = {
+            k: v for k, v in context.items() if k not in templates.TemplateContext.__annotations__
+        }
+        try:
+            fingerprint = json.dumps(
+                [
+                    self.site_digest,
+                    self._get_template_digest(template.environment, template.name),
+                    page.title,
+                    page.content,
+                    _get_toc_tokens(page.toc),
+                    page.meta,
+                    page.canonical_url,
+                    page.edit_url,
+                    page.file.inclusion.name,
+                    extra_context,
+                ],
+                sort_keys=True,
+                default=str,
+            )
+        except Exception as e:
+            log.debug(f"Can't record the state of page '{page.file.src_uri}': {e}")
+            return False
+        digest = hashlib.sha256(fingerprint.encode('utf-8', errors='surrogatepass')).hexdigest()
+        self.pages[page.file.src_uri] = digest
+        return self.previous_pages.get(page.file.src_uri) == digest and os.path.isfile(
+            page.file.abs_dest_path
+        )
+
+    def finish(self, files: Files, inclusion: Callable[[InclusionLevel], bool]) -> None:
+        """Remove the outputs of the previous build that are gone now, and save the state."""
+        outputs = {file.dest_uri for file in files if inclusion(file.inclusion)}
+        outputs.update(self.config.theme.static_templates)
+        outputs.update(self.config.extra_templates)
+        site_dir = os.path.abspath(self.config.site_dir)
+        for dest_uri in sorted(set(self.previous_outputs) - outputs):
+            path = os.path.normpath(os.path.join(site_dir, dest_uri))
+            if not path.startswith(os.path.join(site_dir, '')):
+                continue
+            log.debug(f"Removing stale output: '{dest_uri}'")
+            try:
+                os.remove(path)
+                directory = os.path.dirname(path)
+                while directory != site_dir:
+                    os.rmdir(directory)
+                    directory = os.path.dirname(directory)
+            except OSError:
+                pass
+
+        self.outputs = sorted(outputs)
+        if not self.save:
+            return
+        data = {'version': self.version, 'pages': self.pages, 'outputs': self.outputs}
+        try:
+            utils.write_file(json.dumps(data).encode(), self.path)
+        except OSError as e:
+            log.debug(f"Failed to save the state of the build to '{self.path}': {e}")
+
+
+def _get_nav_item_state(item: StructureItem) -> list:
+    return [
+        type(item).__name__,
+        item.title,
+        getattr(item, 'url', None),
+        [_get_nav_item_state(child) for child in getattr(item, 'children', None) or ()],
+    ]
+
+
+def _get_state_default(value: object) -> object:
+    if isinstance(value, Theme):
+        return [value.dirs, sorted(value.static_templates), dict(value)]
+    if isinstance(value, BasePlugin):
+        return dict(value.config)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    # The memory address of an object changes on every run, but it carries no information anyway.
+    result = _fingerprint_default(value)
+    if isinstance(result, str):
+        result = re.sub(r' at 0x[0-9a-fA-F]+', '', result)
+    return result
+
+
+# Markdown extensions that only read the source of the page itself.
+_PAGE_LOCAL_MARKDOWN_EXTENSIONS = frozenset(
+    {
+        'abbr',
+        'admonition',
+        'attr_list',
+        'codehilite',
+        'def_list',
+        'extra',
+        'fenced_code',
+        'footnotes',
+        'legacy_attrs',
+        'legacy_em',
+        'md_in_html',
+        'meta',
+        'nl2br',
+        'sane_lists',
+        'smarty',
+        'tables',
+        'toc',
+        'wikilinks',
+    }
+)
+
+
+def _may_include_files(config: MkDocsConfig) -> bool:
+    """Check whether a Markdown extension could include other files in a page, like `pymdownx.snippets`."""
+    for ext in config.markdown_extensions:
+        # Plugins can add instances of `markdown.Extension` after the config is validated.
+        name = ext if isinstance(ext, str) else type(ext).__module__
+        name = name.partition(':')[0]
+        if name.startswith('markdown.extensions.'):
+            name = name[len('markdown.extensions.') :]
+        if name in _PAGE_LOCAL_MARKDOWN_EXTENSIONS:
+            continue
+        if name.startswith('pymdownx.') and name != 'pymdownx.snippets':
+            continue
+        return True
+    return False
+
+
+class _ServeSession:
+    """
+    The results of previous builds that `mkdocs serve` keeps in memory to speed up rebuilds.
+
+    If only existing Markdown pages in `docs_dir` changed since the previous build (no files were
+    added, removed or renamed), the next build reuses the listing of `docs_dir` and the rendered
+    state of the unchanged pages, and it only writes the pages whose output changed. Other files
+    could be included by any page, so a change to them makes the next build a full one.
+    """
+
+    def __init__(self, *, lazy: bool = False) -> None:
+        self.docs_dir: str | None = None
+        self.listing: list[list[str]] | None = None
+        self.snapshot: _DocsDirSnapshot | None = None
+        self.page_states: dict[str, dict[str, Any]] = {}
+        self.build_state: _BuildState | None = None
+
+        self.changed_paths: Collection[str] | None = None
+        """The absolute paths that changed since the previous build, if they are known."""
+
+        self.lazy = lazy
+        """Render pages only when they're requested (or in the background), see `_LazyPages`."""
+        self.render_in_background = True
+        self.lazy_pages: _LazyPages | None = None
+        """The pages of the site that is being served."""
+        self.next_lazy_pages: _LazyPages | None = None
+        """The pages of the latest build, until `publish_lazy_pages` is called."""
+        self.build_lock = threading.Lock()
+        """Held by builds and while a page is rendered, so that plugins don't run concurrently."""
+
+    def prepare_file(self, path: str) -> None:
+        """Make sure that the file at the absolute `path` in the site is written, if it's a page."""
+        if (lazy_pages := self.lazy_pages) is not None:
+            lazy_pages.prepare_file(path)
+
+    def stop_lazy_pages(self) -> None:
+        """Stop rendering the pages of the site, when the server shuts down."""
+        lazy_pages, self.lazy_pages, self.next_lazy_pages = self.lazy_pages, None, None
+        if lazy_pages is not None:
+            lazy_pages.stop()
+
+    def publish_lazy_pages(self) -> None:
+        """Start rendering the pages of the latest build, once its site is the one being served."""
+        lazy_pages, self.next_lazy_pages = self.next_lazy_pages, None
+        if lazy_pages is None:
+            return
+        # The previous site was served until now, so its pages were still rendered on demand.
+        previous, self.lazy_pages = self.lazy_pages, lazy_pages
+        if previous is not None:
+            previous.stop()
+        if self.render_in_background:
+            lazy_pages.start()
+
+    def reset(self) -> None:
+        self.listing = None
+        self.page_states = {}
+        self.build_state = None
+
+    def is_incremental(self, config: MkDocsConfig) -> bool:
+        """Check whether the previous build can be reused, according to `changed_paths`."""
+        return self.docs_dir == config.docs_dir and self.can_reuse_build(self.changed_paths)
+
+    def can_reuse_build(self, changed_paths: Collection[str] | None) -> bool:
+        """Check whether the next build can reuse the previous one, after `changed_paths` changed."""
+        if self.lazy:
+            # Previously rendered pages can't be kept, all pages have to be rendered again on demand.
+            return False
+        if changed_paths is None or self.listing is None or self.docs_dir is None:
+            return False
+        known_paths = {
+            os.path.normpath(os.path.join(self.docs_dir, path))
+            for paths in self.listing
+            for path in paths
+        }
+        return all(
+            os.path.normpath(path) in known_paths
+            and utils.is_markdown_file(path)
+            and os.path.isfile(path)
+            for path in changed_paths
+        )
+
+    def get_files(self, config: MkDocsConfig, incremental: bool) -> Files:
+        if not incremental or self.listing is None or self.snapshot is None:
+            self.docs_dir = config.docs_dir
+            self.snapshot = _DocsDirSnapshot(config, self.snapshot)
+            self.listing = _list_docs_dir(config.docs_dir, _get_exclude(config), self.snapshot)
+        files = _get_files_from_listing(config, self.listing, self.snapshot)
+        self.snapshot.save()
+        return files
+
+    def restore_pages(
+        self, pages: Sequence[Page], config: MkDocsConfig, files: Files, incremental: bool
+    ) -> list[Page]:
+        """Restore the state of unchanged pages from the previous build, return the pages that still need populating."""
+        if (
+            not incremental
+            or any(config.plugins.events[e] for e in _PARALLEL_PAGE_EVENTS)
+            or _may_include_files(config)
+        ):
+            # Plugins could make the content of a page depend on anything, not just its source,
+            # and the changed page could be included in other pages.
+            self.page_states = {}
+            return list(pages)
+        assert self.changed_paths is not None
+        changed_paths = {os.path.normpath(path) for path in self.changed_paths}
+        result = []
+        for page in pages:
+            state = self.page_states.get(page.file.src_uri)
+            src_path = page.file.abs_src_path
+            if state is None or src_path is None or os.path.normpath(src_path) in changed_paths:
+                result.append(page)
+            else:
+                _apply_page_state(page, dict(state), files)
+        log.debug(f"Reusing {len(pages) - len(result)} unchanged pages from the previous build.")
+        return result
+
+    def store_pages(self, pages: Sequence[Page]) -> None:
+        self.page_states = {page.file.src_uri: _get_page_state(page) for page in pages}
+
+
+class _LazyPages:
+    """
+    The pages of a lazy `mkdocs serve` build, which are rendered when they're first requested.
+
+    The build itself only reads the sources of pages, which is enough to know their titles for the
+    navigation. Then each page is rendered and written on demand, when its URL is requested. Other
+    pages are rendered in a background thread: first the neighbors of the most recently requested
+    pages, then the rest in the order of the navigation.
+
+    Pages are rendered one at a time, so plugins don't need to be thread-safe. Links to anchors
+    aren't validated, as the target pages may not be rendered yet.
+    """
+
+    def __init__(
+        self,
+        config: MkDocsConfig,
+        files: Files,
+        doc_files: Sequence[File],
+        nav: Navigation,
+        env: jinja2.Environment,
+        build_lock: threading.Lock | None = None,
+    ) -> None:
+        self.config = config
+        self.files = files
+        self.doc_files = doc_files
+        self.nav = nav
+        self.env = env
+        self.render_cache = _RenderCache(config) if config.cache_dir else None
+
+        self._pages_by_path: dict[str, File] = {
+            os.path.normpath(file.abs_dest_path): file for file in doc_files
+        }
+        self._pending: dict[str, File] = {file.src_uri: file for file in doc_files}
+        # Must be held while rendering a page, it's shared with the builds of the session.
+        self._build_lock = build_lock if build_lock is not None else threading.Lock()
+
+        # Entries are (priority, order, src_uri): lower priorities are rendered first.
+        self._queue: list[tuple[int, int, str]] = [
+            (0, i, file.src_uri) for i, file in enumerate(doc_files)
+        ]
+        self._counter = itertools.count(len(doc_files))
+        self._last_priority = 0
+        self._queue_cond = threading.Condition()  # Must be held when accessing _queue.
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start rendering the pages in the background."""
+        self._thread = threading.Thread(target=self._render_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop rendering the pages, wait for the current page to finish."""
+        with self._queue_cond:
+            self._stopped = True
+            self._queue_cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        # Wait for a page that is being rendered on demand.
+        with self._build_lock:
+            pass
+        if self.render_cache is not None:
+            self.render_cache.trim()
+
+    def prepare_file(self, path: str) -> None:
+        """If `path` is the output of a page that isn't rendered yet, render it now."""
+        file = self._pages_by_path.get(os.path.normpath(path))
+        if file is None:
+            return
+        self._render(file)
+        # The pages that the user will likely open next should be ready when they click on them.
+        page = file.page
+        assert page is not None
+        neighbors: list[Page | StructureItem | None] = [page.next_page, page.previous_page]
+        neighbors.extend(page.parent.children if page.parent else self.nav.items)
+        with self._queue_cond:
+            self._last_priority -= 1
+            for item in neighbors:
+                if isinstance(item, Page) and item.file.src_uri in self._pending:
+                    heapq.heappush(
+                        self._queue, (self._last_priority, next(self._counter), item.file.src_uri)
+                    )
+            self._queue_cond.notify_all()
+
+    def _render_loop(self) -> None:
+        start = time.monotonic()
+        while True:
+            with self._queue_cond:
+                while not self._stopped and not self._queue:
+                    self._queue_cond.wait()
+                if self._stopped:
+                    return
+                src_uri = heapq.heappop(self._queue)[2]
+            file = self._pending.get(src_uri)
+            if file is None:
+                continue
+            try:
+                self._render(file)
+            except Exception:
+                pass  # The error was already logged, it'll be raised again if the page is requested.
+            if not self._pending:
+                log.info(f"All pages were rendered in {time.monotonic() - start:.2f} seconds")
+
+    def _render(self, file: File) -> None:
+        with self._build_lock:
+            if self._stopped or file.src_uri not in self._pending:
+                return
+            page = file.page
+            assert page is not None
+            try:
+                _populate_page(page, self.config, self.files, render_cache=self.render_cache)
+                # The navigation of other pages shows the table of contents of this page now.
+                templates._nav_fragments.pop(self.nav, None)
+                _build_page(
+                    page,
+                    self.config,
+                    self.doc_files,
+                    self.nav,
+                    self.env,
+                    excluded=file.inclusion.is_excluded(),
+                )
+            finally:
+                # Don't retry a failing page in the background, the next build will.
+                self._pending.pop(file.src_uri, None)
+
+
+def _read_pages(pages: Sequence[Page], config: MkDocsConfig) -> None:
+    """Read the sources of pages without rendering them, which is enough to know their titles."""
+    for page in pages:
+        config._current_page = page
+        try:
+            page.read_source(config)
+        except Exception as e:
+            log.error(f"Error reading page '{page.file.src_uri}': {e}")
+            raise
+        finally:
+            config._current_page = None
+
+
+@contextlib.contextmanager
+def _build_phase(name: str) -> Iterator[None]:
+    with tracing.span(name, 'mkdocs'), memory.phase(name):
+        yield
+
+
+def build(
+    config: MkDocsConfig,
+    *,
+    serve_url: str | None = None,
+    dirty: bool = False,
+    session: _ServeSession | None = None,
+) -> None:
     """Perform a full site build."""
     logger = logging.getLogger('mkdocs')
 
@@ -257,49 +1342,67 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         logging.getLogger('mkdocs').addHandler(warning_counter)
 
     inclusion = InclusionLevel.is_in_serve if serve_url else InclusionLevel.is_included
+    # `mkdocs serve` keeps the pages between builds, so it doesn't release them.
+    spilled = _SpilledPages() if config.low_memory and session is None else None
+    if session is not None:
+        # The pages of the site being served are still rendered on demand, but never concurrently
+        # with the build, so plugins don't have to be thread-safe.
+        session.build_lock.acquire()
 
     try:
         start = time.monotonic()
 
         # Run `config` plugin events.
-        config = config.plugins.on_config(config)
+        with _build_phase('on_config'):
+            config = config.plugins.on_config(config)
 
         # Run `pre_build` plugin events.
-        config.plugins.on_pre_build(config=config)
+        with _build_phase('on_pre_build'):
+            config.plugins.on_pre_build(config=config)
 
-        if not dirty:
+        incremental = session is not None and session.is_incremental(config)
+        build_state = _BuildState(config, dirty=dirty, session=session)
+        if not dirty and not incremental:
             log.info("Cleaning site directory")
             utils.clean_directory(config.site_dir)
-        else:  # pragma: no cover
-            # Warn user about problems that may occur with --dirty option
-            log.warning(
-                "A 'dirty' build is being performed, this will likely lead to inaccurate navigation and other"
-                " links within your site. This option is designed for site development purposes only."
-            )
+        elif dirty and build_state.has_previous:
+            log.info("A 'dirty' build is being performed, only pages that changed will be written.")
 
         if not serve_url:  # pragma: no cover
             log.info(f"Building documentation to directory: {config.site_dir}")
-            if dirty and site_directory_contains_stale_files(config.site_dir):
+            if (
+                dirty
+                and not build_state.has_previous
+                and site_directory_contains_stale_files(config.site_dir)
+            ):
                 log.info("The directory contains stale files. Use --clean to remove them.")
 
         # First gather all data from all files/pages to ensure all data is consistent across all pages.
 
-        files = get_files(config)
-        env = config.theme.get_env()
-        files.add_files_from_theme(env, config)
+        with _build_phase('get_files'):
+            if session is not None:
+                files = session.get_files(config, incremental)
+            else:
+                files = get_files(config)
+            env = config.theme.get_env()
+            files.add_files_from_theme(env, config)
 
         # Run `files` plugin events.
-        files = config.plugins.on_files(files, config=config)
+        with _build_phase('on_files'):
+            files = config.plugins.on_files(files, config=config)
         # If plugins have added files but haven't set their inclusion level, calculate it again.
         set_exclusions(files, config)
 
-        nav = get_navigation(files, config)
+        with _build_phase('get_navigation'):
+            nav = get_navigation(files, config)
 
         # Run `nav` plugin events.
-        nav = config.plugins.on_nav(nav, config=config, files=files)
+        with _build_phase('on_nav'):
+            nav = config.plugins.on_nav(nav, config=config, files=files)
 
         log.debug("Reading markdown pages.")
         excluded = []
+        pages = []
         for file in files.documentation_pages(inclusion=inclusion):
             log.debug(f"Reading: {file.src_uri}")
             if file.page is None and file.inclusion.is_not_in_nav():
@@ -307,7 +1410,17 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
                     excluded.append(urljoin(serve_url, file.url))
                 Page(None, file, config)
             assert file.page is not None
-            _populate_page(file.page, config, files, dirty)
+            pages.append(file.page)
+        lazy = session is not None and session.lazy
+        with _build_phase('populate_pages'):
+            if lazy:
+                _read_pages(pages, config)
+            elif session is not None:
+                restored = session.restore_pages(pages, config, files, incremental)
+                _populate_pages(restored, config, files)
+                session.store_pages(pages)
+            else:
+                _populate_pages(pages, config, files, spilled)
         if excluded:
             log.info(
                 "The following pages are being built only for the preview "
@@ -316,43 +1429,61 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
             )
 
         # Run `env` plugin events.
-        env = config.plugins.on_env(env, config=config, files=files)
+        with _build_phase('on_env'):
+            env = config.plugins.on_env(env, config=config, files=files)
+        build_state.start(nav, files, env)
 
         # Start writing files to site_dir now that all data is gathered. Note that order matters. Files
         # with lower precedence get written first so that files with higher precedence can overwrite them.
 
         log.debug("Copying static assets.")
-        files.copy_static_files(dirty=dirty, inclusion=inclusion)
+        with _build_phase('copy_static_files'):
+            files.copy_static_files(dirty=dirty or incremental, inclusion=inclusion)
 
-        for template in config.theme.static_templates:
-            _build_theme_template(template, env, files, config, nav)
+        with _build_phase('build_templates'):
+            for template in config.theme.static_templates:
+                _build_theme_template(template, env, files, config, nav)
 
-        for template in config.extra_templates:
-            _build_extra_template(template, files, config, nav)
+            for template in config.extra_templates:
+                _build_extra_template(template, files, config, nav)
 
-        log.debug("Building markdown pages.")
         doc_files = files.documentation_pages(inclusion=inclusion)
-        for file in doc_files:
-            assert file.page is not None
-            _build_page(
-                file.page, config, doc_files, nav, env, dirty, excluded=file.inclusion.is_excluded()
-            )
+        if lazy:
+            assert session is not None
+            lazy_pages = _LazyPages(config, files, doc_files, nav, env, session.build_lock)
+            log.info(f"{len(lazy_pages)} pages will be rendered when they're requested.")
+        else:
+            log.debug("Building markdown pages.")
+            with _build_phase('build_pages'):
+                _build_pages(doc_files, config, nav, env, build_state, spilled)
 
-        log_level = config.validation.links.anchors
-        for file in doc_files:
-            assert file.page is not None
-            file.page.validate_anchor_links(files=files, log_level=log_level)
+            log_level = config.validation.links.anchors
+            with _build_phase('validate_anchor_links'):
+                for file in doc_files:
+                    assert file.page is not None
+                    file.page.validate_anchor_links(files=files, log_level=log_level)
+
+        build_state.finish(files, inclusion)
+        if session is not None:
+            session.build_state = build_state
 
         # Run `post_build` plugin events.
-        config.plugins.on_post_build(config=config)
+        with _build_phase('on_post_build'):
+            config.plugins.on_post_build(config=config)
+        memory.measure_objects(config, files, env)
 
         if counts := warning_counter.get_counts():
             msg = ', '.join(f'{v} {k.lower()}s' for k, v in counts)
             raise Abort(f'Aborted with {msg} in strict mode!')
 
+        if lazy:
+            assert session is not None
+            session.next_lazy_pages = lazy_pages
         log.info(f'Documentation built in {time.monotonic() - start:.2f} seconds')
 
     except Exception as e:
+        if session is not None:
+            session.reset()
         # Run `build_error` plugin events.
         config.plugins.on_build_error(error=e)
         if isinstance(e, BuildError):
@@ -362,6 +1493,10 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
 
     finally:
         logger.removeHandler(warning_counter)
+        if spilled is not None:
+            spilled.close()
+        if session is not None:
+            session.build_lock.release()
 
 
 def site_directory_contains_stale_files(site_directory: str) -> bool:
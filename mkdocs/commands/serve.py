@@ -7,7 +7,7 @@ from os.path import isdir, isfile, join
 from typing import TYPE_CHECKING
 from urllib.parse import urlsplit
 
-from mkdocs.commands.build import build
+from mkdocs.commands.build import _ServeSession, build
 from mkdocs.config import load_config
 from mkdocs.livereload import LiveReloadServer, _serve_url
 
@@ -25,6 +25,8 @@ def serve(
     watch: list[str] = [],
     *,
     open_in_browser: bool = False,
+    no_cache: bool = False,
+    lazy: bool = False,
     **kwargs,
 ) -> None:
     """
@@ -34,16 +36,21 @@ def serve(
     it will rebuild the documentation and refresh the page automatically
     whenever a file is edited.
     """
-    # Create a temporary build directory, and set some options to serve it
-    site_dir = tempfile.mkdtemp(prefix='mkdocs_')
+    # Create a temporary build directory, and set some options to serve it.
+    # Rebuilds happen in a second directory, so that the server can keep serving the previous build.
+    temp_dir = tempfile.mkdtemp(prefix='mkdocs_')
+    site_dir = join(temp_dir, 'site')
+    build_dir = join(temp_dir, 'build')
 
-    def get_config():
+    def get_config(site_dir: str = site_dir):
         config = load_config(
             config_file=config_file,
             site_dir=site_dir,
             **kwargs,
         )
         config.watch.extend(watch)
+        if no_cache:
+            config.cache_dir = None
         return config
 
     is_clean = build_type == 'clean'
@@ -56,31 +63,55 @@ def serve(
     mount_path = urlsplit(config.site_url or '/').path
     config.site_url = serve_url = _serve_url(host, port, mount_path)
 
+    # Keep the results of the previous build, to rebuild only what's needed after an edit.
+    session = None if is_clean else _ServeSession(lazy=lazy)
+
     def builder(config: MkDocsConfig | None = None):
         log.info("Building documentation...")
         if config is None:
-            config = get_config()
+            config = get_config(server.build_root or site_dir)
             config.site_url = serve_url
 
-        build(config, serve_url=None if is_clean else serve_url, dirty=is_dirty)
+        if session is None:
+            build(config, serve_url=None, dirty=is_dirty)
+        else:
+            session.changed_paths = server.changed_paths
+            build(config, serve_url=serve_url, dirty=is_dirty, session=session)
 
     server = LiveReloadServer(
-        builder=builder, host=host, port=port, root=site_dir, mount_path=mount_path
+        builder=builder,
+        host=host,
+        port=port,
+        root=site_dir,
+        mount_path=mount_path,
+        watch_method=config.watch_method,
+        build_root=build_dir,
+        use_asyncio=config.dev_server == 'asyncio',
     )
 
     def error_handler(code) -> bytes | None:
         if code in (404, 500):
-            error_page = join(site_dir, f'{code}.html')
+            error_page = join(server.root, f'{code}.html')
             if isfile(error_page):
                 with open(error_page, 'rb') as f:
                     return f.read()
         return None
 
     server.error_handler = error_handler
+    if session is not None:
+        server.prepare_file = session.prepare_file
+        server.publish_build = session.publish_lazy_pages
+    if not is_dirty:
+        # Only incremental builds start from the previous version of the site.
+        server.reuses_previous_build = (
+            session.can_reuse_build if session is not None else lambda changed_paths: False
+        )
 
     try:
         # Perform the initial build
         builder(config)
+        if session is not None:
+            session.publish_lazy_pages()
 
         if livereload:
             # Watch the documentation files, the config file and the theme files.
@@ -104,7 +135,9 @@ def serve(
             log.info("Shutting down...")
         finally:
             server.shutdown()
+            if session is not None:
+                session.stop_lazy_pages()
     finally:
         config.plugins.on_shutdown()
-        if isdir(site_dir):
-            shutil.rmtree(site_dir)
+        if isdir(temp_dir):
+            shutil.rmtree(temp_dir)
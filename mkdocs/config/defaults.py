@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import contextvars
 import logging
-from typing import IO, Dict, Mapping
+from typing import IO, Any, Dict, Mapping
 
 from mkdocs.config import base
 from mkdocs.config import config_options as c
 from mkdocs.structure.pages import Page, _AbsoluteLinksValidationValue
 from mkdocs.utils.yaml import get_yaml_loader, yaml_load
 
+_current_page: contextvars.ContextVar[tuple[MkDocsConfig, Any] | None] = contextvars.ContextVar(
+    'mkdocs_current_page', default=None
+)
+
 
 class _LogLevel(c.OptionallyRequired[int]):
     levels: Mapping[str, int] = {
@@ -96,6 +101,10 @@ class MkDocsConfig(base.Config):
     dev_addr = c.IpAddress(default='127.0.0.1:8000')
     """The address on which to serve the live reloading docs server."""
 
+    dev_server = c.Choice(('threaded', 'asyncio'), default='threaded')
+    """How the live reloading docs server handles connections: with a thread per connection, or
+    with an event loop that pushes reload notifications to browsers."""
+
     use_directory_urls = c.Type(bool, default=True)
     """If `True`, use `<page_name>/index.html` style files with hyperlinks to
     the directory. If `False`, use `<page_name>.html style file with
@@ -141,6 +150,21 @@ class MkDocsConfig(base.Config):
     """Enabling strict mode causes MkDocs to stop the build when a problem is
     encountered rather than display an error."""
 
+    jobs = c.Type(int, default=1)
+    """The number of worker processes used to render Markdown pages, and of threads used to
+    render page templates. `0` means one worker per CPU."""
+
+    cache_dir = c.Optional(c.Dir(exists=False))
+    """A directory to keep the rendered Markdown pages in, to reuse them in subsequent builds.
+    The cache is disabled if this is not set."""
+
+    cache_max_size = c.Type(int, default=256)
+    """The maximum size of the cache, in megabytes."""
+
+    low_memory = c.Type(bool, default=False)
+    """Keep the Markdown and HTML of pages out of memory except while they're being written,
+    so that the memory used by a build doesn't grow with the size of the site."""
+
     remote_branch = c.Type(str, default='gh-pages')
     """The remote branch to commit to when using gh-deploy."""
 
@@ -166,6 +190,10 @@ class MkDocsConfig(base.Config):
     watch = c.ListOfPaths(default=[])
     """A list of extra paths to watch while running `mkdocs serve`."""
 
+    watch_method = c.Choice(('auto', 'native', 'polling'), default='auto')
+    """How `mkdocs serve` detects changes of the watched files. `auto` uses the native
+    mechanism of the OS, falling back to polling if that fails."""
+
     class Validation(base.Config):
         class NavValidation(base.Config):
             omitted_files = _LogLevel(default='info')
@@ -198,9 +226,25 @@ class MkDocsConfig(base.Config):
 
     validation = c.PropagatingSubConfig[Validation]()
 
-    _current_page: Page | None = None
-    """The currently rendered page. Please do not access this and instead
-    rely on the `page` argument to event handlers."""
+    @property
+    def _current_page(self) -> Page | None:
+        """
+        The currently rendered page. Please do not access this and instead
+        rely on the `page` argument to event handlers.
+
+        Each thread has its own value, so that pages can be rendered concurrently.
+        """
+        current = _current_page.get()
+        if current is None or current[0] is not self:
+            return None
+        return current[1]
+
+    @_current_page.setter
+    def _current_page(self, value: Page | None) -> None:
+        if value is not None:
+            _current_page.set((self, value))
+        elif self._current_page is not None:
+            _current_page.set(None)
 
     def load_dict(self, patch: dict) -> None:
         super().load_dict(patch)
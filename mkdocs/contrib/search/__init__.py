@@ -62,6 +62,8 @@ class _PluginConfig(base.Config):
 class SearchPlugin(BasePlugin[_PluginConfig]):
     """Add a search feature to MkDocs."""
 
+    supports_parallel_build = True
+
     def on_config(self, config: MkDocsConfig, **kwargs) -> MkDocsConfig:
         """Add plugin templates and scripts to config."""
         if config.theme.get('include_search_page'):
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import email.utils
 import functools
-import io
+import gzip
 import ipaddress
 import logging
 import mimetypes
@@ -10,6 +12,7 @@ import os.path
 import pathlib
 import posixpath
 import re
+import shutil
 import socket
 import socketserver
 import string
@@ -24,11 +27,13 @@ import wsgiref.util
 from typing import Any, BinaryIO, Callable, Iterable
 
 import watchdog.events
+import watchdog.observers
+import watchdog.observers.api
 import watchdog.observers.polling
 
 _SCRIPT_TEMPLATE_STR = """
 var livereload = function(epoch, requestId) {
-    var req, timeout;
+    var req, timeout, source;
 
     var poll = function() {
         req = new XMLHttpRequest();
@@ -43,6 +48,17 @@ var livereload = function(epoch, requestId) {
         req.send();
     }
 
+    var listen = function() {
+        source = new EventSource("/livereload/events/" + epoch);
+        source.onmessage = function(event) {
+            if (parseFloat(event.data) > epoch) {
+                location.reload();
+            }
+        };
+    };
+
+    var start = ${push} && window.EventSource ? listen : poll;
+
     var stop = function() {
         if (req) {
             req.abort();
@@ -50,17 +66,20 @@ var livereload = function(epoch, requestId) {
         if (timeout) {
             clearTimeout(timeout);
         }
-        req = timeout = undefined;
+        if (source) {
+            source.close();
+        }
+        req = timeout = source = undefined;
     };
 
     window.addEventListener("load", function() {
         if (document.visibilityState === "visible") {
-            poll();
+            start();
         }
     });
     window.addEventListener("visibilitychange", function() {
         if (document.visibilityState === "visible") {
-            poll();
+            start();
         } else {
             stop();
         }
@@ -74,6 +93,14 @@ livereload(${epoch}, ${request_id});
 _SCRIPT_TEMPLATE = string.Template(_SCRIPT_TEMPLATE_STR)
 
 
+_CHANGE_EVENT_TYPES = (
+    watchdog.events.EVENT_TYPE_CREATED,
+    watchdog.events.EVENT_TYPE_DELETED,
+    watchdog.events.EVENT_TYPE_MODIFIED,
+    watchdog.events.EVENT_TYPE_MOVED,
+)
+
+
 class _LoggerAdapter(logging.LoggerAdapter):
     def process(self, msg: str, kwargs: dict) -> tuple[str, dict]:  # type: ignore[override]
         return time.strftime("[%H:%M:%S] ") + msg, kwargs
@@ -94,6 +121,8 @@ def _serve_url(host: str, port: int, path: str) -> str:
 class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGIServer):
     daemon_threads = True
     poll_response_timeout = 60
+    push_keepalive_interval = 15
+    gzip_min_size = 256
 
     def __init__(
         self,
@@ -104,7 +133,12 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         mount_path: str = "/",
         polling_interval: float = 0.5,
         shutdown_delay: float = 0.25,
+        watch_method: str = "auto",
+        build_root: str | None = None,
+        use_asyncio: bool = False,
     ) -> None:
+        if watch_method not in ("auto", "native", "polling"):
+            raise ValueError(f"Unknown watch method: {watch_method!r}")
         self.builder = builder
         try:
             if isinstance(ipaddress.ip_address(host), ipaddress.IPv6Address):
@@ -112,12 +146,32 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         except Exception:
             pass
         self.root = os.path.abspath(root)
+        self.use_asyncio = use_asyncio
+        """Serve from an event loop in one thread, instead of one thread per connection.
+
+        In this mode, browsers are notified about rebuilds through Server-Sent Events.
+        """
+        self.build_root = os.path.abspath(build_root) if build_root is not None else None
+        """The directory where the builder should write the site on rebuilds.
+
+        If this is set, the site keeps being served from `root` during a rebuild, and the two
+        directories are swapped after a successful rebuild. Otherwise the builder writes directly
+        into `root`, and requests wait until the rebuild finishes.
+        """
         self.mount_path = _normalize_mount_path(mount_path)
         self.url = _serve_url(host, port, mount_path)
         self.build_delay = 0.1
         self.shutdown_delay = shutdown_delay
         # To allow custom error pages.
         self.error_handler: Callable[[int], bytes | None] = lambda code: None
+        # To allow writing files on demand, called with the absolute path before serving it.
+        self.prepare_file: Callable[[str], None] = lambda path: None
+        # Whether a rebuild after changes to the given paths reuses the files of the previous build.
+        # If not, the previous build isn't copied to `build_root` before the rebuild.
+        self.reuses_previous_build: Callable[[frozenset[str] | None], bool]
+        self.reuses_previous_build = lambda changed_paths: True
+        # Called when a rebuild becomes the served version of the site, with requests on hold.
+        self.publish_build: Callable[[], None] = lambda: None
 
         super().__init__((host, port), _Handler, bind_and_activate=False)
         self.set_app(self.serve_request)
@@ -127,14 +181,37 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._epoch_cond = threading.Condition()  # Must be held when accessing _visible_epoch.
 
         self._want_rebuild: bool = False
+        self._changed_paths: set[str] = set()
         self._rebuild_cond = threading.Condition()  # Must be held when accessing _want_rebuild.
 
+        self.changed_paths: frozenset[str] | None = None
+        """The paths of files that changed since the previous build, while the builder is running.
+
+        It is `None` if the builder is called for any other reason than detected file changes.
+        """
+
+        self._content_cache: dict[tuple[str, str | None], tuple[str, bytes]] = {}
+        self._content_cache_epoch = self._visible_epoch
+        self._content_cache_lock = threading.Lock()
+
         self._shutdown = False
-        self.serve_thread = threading.Thread(target=lambda: self.serve_forever(shutdown_delay))
-        self.observer = watchdog.observers.polling.PollingObserver(timeout=polling_interval)
+        if use_asyncio:
+            self.serve_thread = threading.Thread(target=lambda: asyncio.run(self._serve_async()))
+        else:
+            self.serve_thread = threading.Thread(target=lambda: self.serve_forever(shutdown_delay))
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._async_epoch_event: asyncio.Event | None = None
+        self.polling_interval = polling_interval
+        self.watch_method = watch_method
+        self.observer: watchdog.observers.api.BaseObserver
+        if watch_method == "polling":
+            self.observer = watchdog.observers.polling.PollingObserver(timeout=polling_interval)
+        else:
+            self.observer = watchdog.observers.Observer()
 
         self._watched_paths: dict[str, int] = {}
         self._watch_refs: dict[str, Any] = {}
+        self._watch_handlers: dict[str, tuple[watchdog.events.FileSystemEventHandler, bool]] = {}
 
     def watch(self, path: str, func: None = None, *, recursive: bool = True) -> None:
         """Add the 'path' to watched paths, call the function and reload when any file changes under it."""
@@ -148,17 +225,50 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._watched_paths[path] = 1
 
         def callback(event):
-            if event.is_directory:
+            if event.event_type not in _CHANGE_EVENT_TYPES:
+                # Native observers also report when files are merely opened or read (e.g. by builds).
                 return
-            log.debug(str(event))
             with self._rebuild_cond:
+                # Changes of directories don't need a rebuild by themselves, but they mean that
+                # some files could've been added or removed.
+                self._changed_paths.add(os.path.abspath(event.src_path))
+                if dest_path := getattr(event, 'dest_path', None):
+                    self._changed_paths.add(os.path.abspath(dest_path))
+                if event.is_directory:
+                    return
+                log.debug(str(event))
                 self._want_rebuild = True
                 self._rebuild_cond.notify_all()
 
         handler = watchdog.events.FileSystemEventHandler()
         handler.on_any_event = callback  # type: ignore[method-assign]
         log.debug(f"Watching '{path}'")
-        self._watch_refs[path] = self.observer.schedule(handler, path, recursive=recursive)
+        self._watch_handlers[path] = (handler, recursive)
+        try:
+            self._watch_refs[path] = self.observer.schedule(handler, path, recursive=recursive)
+        except OSError as e:
+            # The observer was already running, and the native watch of this path failed.
+            self._fall_back_to_polling(e)
+
+    def _start_observer(self) -> None:
+        try:
+            self.observer.start()
+        except OSError as e:
+            self._fall_back_to_polling(e)
+
+    def _fall_back_to_polling(self, error: OSError) -> None:
+        """Replace the native observer with a polling one, e.g. if the inotify watch limit is exceeded."""
+        if self.watch_method != "auto":
+            raise error
+        log.warning(f"Failed to watch files natively ({error}), polling them for changes instead.")
+        was_running = self.observer.is_alive()
+        self.observer.stop()
+        self.watch_method = "polling"
+        self.observer = watchdog.observers.polling.PollingObserver(timeout=self.polling_interval)
+        for path, (handler, recursive) in self._watch_handlers.items():
+            self._watch_refs[path] = self.observer.schedule(handler, path, recursive=recursive)
+        if was_running:
+            self.observer.start()
 
     def unwatch(self, path: str) -> None:
         """Stop watching file changes for path. Raises if there was no corresponding `watch` call."""
@@ -167,6 +277,7 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._watched_paths[path] -= 1
         if self._watched_paths[path] <= 0:
             self._watched_paths.pop(path)
+            self._watch_handlers.pop(path)
             self.observer.unschedule(self._watch_refs.pop(path))
 
     def serve(self, *, open_in_browser=False):
@@ -174,10 +285,11 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self.server_activate()
 
         if self._watched_paths:
-            self.observer.start()
+            self._start_observer()
 
             paths_str = ", ".join(f"'{_try_relativize_path(path)}'" for path in self._watched_paths)
             log.info(f"Watching paths for changes: {paths_str}")
+            log.info(f"Detecting file changes with {type(self.observer).__name__}")
 
         if open_in_browser:
             log.info(f"Serving on {self.url} and opening it in a browser")
@@ -206,8 +318,14 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
 
                 self._wanted_epoch = _timestamp()
                 self._want_rebuild = False
+                changed_paths = frozenset(self._changed_paths)
+                self._changed_paths.clear()
 
+            self.changed_paths = changed_paths
             try:
+                if self.build_root is not None and self.reuses_previous_build(changed_paths):
+                    # Start from the latest version of the site, so that it can be rebuilt incrementally.
+                    _sync_dir(self.root, self.build_root)
                 self.builder()
             except Exception as e:
                 if isinstance(e, SystemExit):
@@ -218,11 +336,18 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                     "An error happened during the rebuild. The server will appear stuck until build errors are resolved."
                 )
                 continue
+            finally:
+                self.changed_paths = None
 
             with self._epoch_cond:
                 log.info("Reloading browsers")
+                if self.build_root is not None:
+                    self.root, self.build_root = self.build_root, self.root
+                self.publish_build()
                 self._visible_epoch = self._wanted_epoch
                 self._epoch_cond.notify_all()
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._notify_async_waiters)
 
     def shutdown(self, wait=False) -> None:
         self.observer.stop()
@@ -230,12 +355,23 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
             self._shutdown = True
             self._rebuild_cond.notify_all()
 
-        if self.serve_thread.is_alive():
-            super().shutdown()
-        self.server_close()
+        if self.use_asyncio:
+            if self._loop is not None:
+                # Let pending long polls and event streams finish. The event loop closes the socket.
+                self._loop.call_soon_threadsafe(self._notify_async_waiters)
+            elif not self.serve_thread.is_alive():
+                self.server_close()
+            # Otherwise the event loop is starting, and it stops by itself as `_shutdown` is set.
+        else:
+            if self.serve_thread.is_alive():
+                super().shutdown()
+            self.server_close()
         if wait:
-            self.serve_thread.join()
-            self.observer.join()
+            # The threads aren't started yet if the server is shut down while it's starting.
+            if self.serve_thread.is_alive():
+                self.serve_thread.join()
+            if self.observer.is_alive():
+                self.observer.join()
 
     def serve_request(self, environ, start_response) -> Iterable[bytes]:
         try:
@@ -289,40 +425,241 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                 rel_file_path += "index.html"
             # Prevent directory traversal - normalize the path.
             rel_file_path = posixpath.normpath("/" + rel_file_path).lstrip("/")
-            file_path = os.path.join(self.root, rel_file_path)
         elif path == "/":
             start_response("302 Found", [("Location", urllib.parse.quote(self.mount_path))])
             return []
         else:
             return None  # Not found
 
-        # Wait until the ongoing rebuild (if any) finishes, so we're not serving a half-built site.
         with self._epoch_cond:
-            self._epoch_cond.wait_for(lambda: self._visible_epoch == self._wanted_epoch)
+            if self.build_root is None:
+                # Wait until the ongoing rebuild (if any) finishes, so we're not serving a half-built site.
+                self._epoch_cond.wait_for(lambda: self._visible_epoch == self._wanted_epoch)
+            # Otherwise the last complete build is served, as the rebuild happens elsewhere.
             epoch = self._visible_epoch
+            file_path = os.path.join(self.root, rel_file_path)
 
+        self.prepare_file(file_path)
         try:
             file: BinaryIO = open(file_path, "rb")
         except OSError:
-            if not path.endswith("/") and os.path.isfile(os.path.join(file_path, "index.html")):
+            index_path = os.path.join(file_path, "index.html")
+            if not path.endswith("/"):
+                self.prepare_file(index_path)
+            if not path.endswith("/") and os.path.isfile(index_path):
                 start_response("302 Found", [("Location", urllib.parse.quote(path) + "/")])
                 return []
             return None  # Not found
 
-        if self._watched_paths and file_path.endswith(".html"):
+        stat = os.fstat(file.fileno())
+        inject_js = bool(self._watched_paths) and file_path.endswith(".html")
+        content_type = self._guess_type(file_path)
+        encoding = None
+        if inject_js:
+            # The injected script contains the epoch, so the response changes with every build.
+            etag = f"{epoch:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            # Last-Modified is only precise to a second, so it's not useful for pages to be reloaded.
+            headers = [("Content-Type", content_type)]
+        else:
+            etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            mtime = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            headers = [("Content-Type", content_type), ("Last-Modified", mtime)]
+        if stat.st_size >= self.gzip_min_size and _is_compressible(content_type):
+            headers.append(("Vary", "Accept-Encoding"))
+            if _accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING", "")):
+                encoding = "gzip"
+                etag += "-gzip"
+        # Always make the browser ask whether its copy is still current, it's cheap with a 304.
+        headers += [("ETag", f'"{etag}"'), ("Cache-Control", "no-cache")]
+
+        if _is_not_modified(environ, f'"{etag}"', None if inject_js else stat.st_mtime):
+            file.close()
+            start_response("304 Not Modified", headers[1:])
+            return []
+
+        if inject_js or encoding:
             with file:
-                content = file.read()
+                content = self._get_cached_content(
+                    file, file_path, epoch, etag, inject_js, encoding
+                )
+            if encoding:
+                headers.append(("Content-Encoding", encoding))
+            headers.append(("Content-Length", str(len(content))))
+            start_response("200 OK", headers)
+            return [content]
+
+        headers.append(("Content-Length", str(stat.st_size)))
+        start_response("200 OK", headers)
+        return wsgiref.util.FileWrapper(file)
+
+    def _get_cached_content(
+        self,
+        file: BinaryIO,
+        file_path: str,
+        epoch: int,
+        etag: str,
+        inject_js: bool,
+        encoding: str | None,
+    ) -> bytes:
+        """Read the file, possibly inject the script and compress it, reusing the result for the same epoch."""
+        key = (file_path, encoding)
+        with self._content_cache_lock:
+            if epoch > self._content_cache_epoch:
+                # The site was rebuilt (or the served directory was swapped), start over.
+                self._content_cache.clear()
+                self._content_cache_epoch = epoch
+            cached = self._content_cache.get(key)
+        if cached is not None and cached[0] == etag:
+            return cached[1]
+
+        content = file.read()
+        if inject_js:
             content = self._inject_js_into_html(content, epoch)
-            file = io.BytesIO(content)
-            content_length = len(content)
-        else:
-            content_length = os.path.getsize(file_path)
+        if encoding == "gzip":
+            content = gzip.compress(content, compresslevel=6, mtime=0)
+        with self._content_cache_lock:
+            if epoch == self._content_cache_epoch:
+                self._content_cache[key] = (etag, content)
+        return content
+
+    async def _serve_async(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._async_epoch_event = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, sock=self.socket)
+        async with server:
+            while not self._shutdown:
+                await asyncio.sleep(self.shutdown_delay)
+
+    def _notify_async_waiters(self) -> None:
+        """Wake up all requests that wait for a new epoch. Runs in the event loop."""
+        assert self._async_epoch_event is not None
+        self._async_epoch_event.set()
+        self._async_epoch_event = asyncio.Event()
+
+    async def _wait_for_epoch(self, epoch: int, timeout: float) -> bool:
+        """Wait until there's a build newer than `epoch`, return whether there is one."""
+        assert self._async_epoch_event is not None
+        event = self._async_epoch_event
+        if self._visible_epoch > epoch:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._visible_epoch > epoch
 
-        content_type = self._guess_type(file_path)
-        start_response(
-            "200 OK", [("Content-Type", content_type), ("Content-Length", str(content_length))]
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            await self._handle_async_request(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            log.exception("Failed to handle a request")
+        finally:
+            writer.close()
+
+    async def _handle_async_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        request_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        headers = {}
+        while (line := await reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers["HTTP_" + name.strip().upper().replace("-", "_")] = value.strip()
+
+        method, _, target = request_line.partition(" ")
+        target, _, protocol = target.partition(" ")
+        if method not in ("GET", "HEAD") or not target.startswith("/"):
+            await self._write_response(writer, "400 Bad Request", [], b"", request_line)
+            return
+        raw_path, _, query = target.partition("?")
+        path = urllib.parse.unquote(raw_path, "iso-8859-1")
+        # https://bugs.python.org/issue16679
+        decoded_path = path.encode("latin-1").decode("utf-8", "ignore")
+
+        if m := re.fullmatch(r"/livereload/([0-9]+)/[0-9]+", decoded_path):
+            epoch = int(m[1])
+            if self._visible_epoch <= epoch:
+                # Stall the browser, respond as soon as there's something new.
+                # If there's not, respond anyway after a minute.
+                self._log_poll_request(headers.get("HTTP_REFERER"), request_id=decoded_path)
+                await self._wait_for_epoch(epoch, self.poll_response_timeout)
+            body = b"%d" % self._visible_epoch
+            await self._write_response(
+                writer, "200 OK", [("Content-Type", "text/plain")], body, request_line
+            )
+            return
+
+        if m := re.fullmatch(r"/livereload/events/([0-9]+)", decoded_path):
+            self._log_poll_request(headers.get("HTTP_REFERER"), request_id=decoded_path)
+            await self._push_events(writer, int(m[1]), request_line)
+            return
+
+        environ = dict(self.base_environ)  # type: ignore[attr-defined]
+        environ.update(headers)
+        environ.update(
+            REQUEST_METHOD=method,
+            PATH_INFO=path,
+            QUERY_STRING=query,
+            SERVER_PROTOCOL=protocol or "HTTP/1.0",
+            REMOTE_ADDR=writer.get_extra_info("peername", ("", 0))[0],
         )
-        return wsgiref.util.FileWrapper(file)
+        response: list = []
+
+        def start_response(status, response_headers, exc_info=None):
+            response[:] = [status, response_headers]
+
+        def serve():
+            result = self.serve_request(environ, start_response)
+            try:
+                return b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+
+        # Reading the files happens in a small pool of threads, not in a thread per connection.
+        assert self._loop is not None
+        body = await self._loop.run_in_executor(None, serve)
+        status, response_headers = response
+        if method == "HEAD":
+            body = b""
+        await self._write_response(writer, status, response_headers, body, request_line)
+
+    async def _push_events(self, writer: asyncio.StreamWriter, epoch: int, request_line: str):
+        """Send a Server-Sent Event to the browser as soon as there's a build newer than `epoch`."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        log.debug(f'"{request_line}" code 200')
+        while not await self._wait_for_epoch(epoch, self.push_keepalive_interval):
+            if self._shutdown:
+                return
+            # Also lets us find out if the browser has disconnected.
+            writer.write(b": keepalive\n\n")
+            await writer.drain()
+        writer.write(b"data: %d\n\n" % self._visible_epoch)
+        await writer.drain()
+
+    @classmethod
+    async def _write_response(
+        cls,
+        writer: asyncio.StreamWriter,
+        status: str,
+        headers: list[tuple[str, str]],
+        body: bytes,
+        request_line: str,
+    ) -> None:
+        lines = [f"HTTP/1.1 {status}", *(f"{k}: {v}" for k, v in headers), "Connection: close"]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+        code = status.split(" ", 1)[0]
+        level = logging.DEBUG if code in ("200", "304") else logging.WARNING
+        log.log(level, f'"{request_line}" code {code}')
 
     def _inject_js_into_html(self, content, epoch):
         try:
@@ -331,7 +668,9 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
             body_end = len(content)
         # The page will reload if the livereload poller returns a newer epoch than what it knows.
         # The other timestamp becomes just a unique identifier for the initiating page.
-        script = _SCRIPT_TEMPLATE.substitute(epoch=epoch, request_id=_timestamp())
+        script = _SCRIPT_TEMPLATE.substitute(
+            epoch=epoch, request_id=_timestamp(), push="true" if self.use_asyncio else "false"
+        )
         return b"%b<script>%b</script>%b" % (
             content[:body_end],
             script.encode(),
@@ -360,7 +699,7 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
 
 class _Handler(wsgiref.simple_server.WSGIRequestHandler):
     def log_request(self, code="-", size="-"):
-        level = logging.DEBUG if str(code) == "200" else logging.WARNING
+        level = logging.DEBUG if str(code) in ("200", "304") else logging.WARNING
         log.log(level, f'"{self.requestline}" code {code}')
 
     def log_message(self, format, *args):
@@ -371,6 +710,84 @@ def _timestamp() -> int:
     return round(time.monotonic() * 1000)
 
 
+def _sync_dir(source_dir: str, dest_dir: str) -> None:
+    """Make `dest_dir` a copy of `source_dir`, copying only the files that differ."""
+    dirs: set[str] = set()
+    files: list[str] = []
+    for dirpath, _, filenames in os.walk(source_dir):
+        rel_dir = os.path.normpath(os.path.relpath(dirpath, source_dir))
+        dirs.add(rel_dir)
+        files.extend(os.path.normpath(os.path.join(rel_dir, name)) for name in filenames)
+
+    # Remove what's not in the source first, in case a file was replaced with a directory or vice versa.
+    files_set = set(files)
+    for dirpath, _, filenames in os.walk(dest_dir, topdown=False):
+        rel_dir = os.path.normpath(os.path.relpath(dirpath, dest_dir))
+        for name in filenames:
+            if os.path.normpath(os.path.join(rel_dir, name)) not in files_set:
+                os.remove(os.path.join(dirpath, name))
+        if rel_dir not in dirs:
+            os.rmdir(dirpath)
+
+    for rel_dir in sorted(dirs):
+        os.makedirs(os.path.join(dest_dir, rel_dir), exist_ok=True)
+    for rel_path in files:
+        src = os.path.join(source_dir, rel_path)
+        dest = os.path.join(dest_dir, rel_path)
+        src_stat = os.stat(src)
+        try:
+            dest_stat = os.stat(dest)
+        except OSError:
+            pass
+        else:
+            if (src_stat.st_size, src_stat.st_mtime_ns) == (
+                dest_stat.st_size,
+                dest_stat.st_mtime_ns,
+            ):
+                continue
+        shutil.copy2(src, dest)
+
+
+_COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether the value of an Accept-Encoding header allows gzip."""
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() == "gzip":
+            m = re.fullmatch(r"\s*q\s*=\s*([0-9.]+)\s*", params)
+            try:
+                return not m or float(m[1]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _is_not_modified(environ: dict, etag: str, mtime: float | None) -> bool:
+    """Check the conditional request headers against the current version of the file."""
+    if if_none_match := environ.get("HTTP_IF_NONE_MATCH"):
+        # If-Modified-Since is ignored if there's If-None-Match.
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag in (etag, "W/" + etag) for tag in tags)
+    if mtime is not None and (if_modified_since := environ.get("HTTP_IF_MODIFIED_SINCE")):
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
 def _try_relativize_path(path: str) -> str:
     """Make the path relative to current directory if it's under that directory."""
     p = pathlib.Path(path)
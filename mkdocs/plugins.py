@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging
 import sys
+import threading
+import time
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, MutableMapping, TypeVar, overload
 
 if sys.version_info >= (3, 10):
@@ -16,6 +18,7 @@ if TYPE_CHECKING:
 
 from mkdocs import utils
 from mkdocs.config.base import Config, ConfigErrors, ConfigWarnings, LegacyConfig, PlainConfigSchema
+from mkdocs.utils import tracing
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -69,6 +72,21 @@ class BasePlugin(Generic[SomeConfig]):
     supports_multiple_instances: bool = False
     """Set to true in subclasses to declare support for adding the same plugin multiple times."""
 
+    supports_parallel_build: bool = False
+    """Set to true in subclasses to declare that the plugin's page events can run in worker processes.
+
+    With `jobs` greater than 1, the `on_pre_page`, `on_page_read_source`, `on_page_markdown` and
+    `on_page_content` events run in separate processes. Any changes that such handlers make outside
+    of the page's `markdown`, `meta`, `content`, `toc`, `title` and anchor data are lost.
+    If any plugin handling these events doesn't declare support, pages are rendered serially.
+
+    Additionally, templates of pages are then rendered in worker threads, while the `on_env`,
+    `on_page_context` and `on_post_page` events still run in the main thread. The `on_page_context`
+    event of a page can run before the `on_post_page` event of the previous page, and filters
+    added to the environment must be thread-safe. If any plugin handling these events doesn't
+    declare support, templates are rendered serially.
+    """
+
     def __class_getitem__(cls, config_class: type[Config]):
         """Eliminates the need to write `config_class = FooConfig` when subclassing BasePlugin[FooConfig]."""
         name = f'{cls.__name__}[{config_class.__name__}]'
@@ -457,6 +475,41 @@ def event_priority(priority: float) -> Callable[[T], T]:
     return decorator
 
 
+def event_requires_output(required: bool) -> Callable[[T], T]:
+    """
+    A decorator to declare whether an `on_post_page` or `on_post_template` handler needs the output.
+
+    By default these handlers receive the whole rendered output as one string, and can replace it.
+    When none of the handlers of an event need it, MkDocs writes the output to disk while it is
+    being rendered, without ever holding all of it in memory. Handlers declared with
+    `required=False` are then called after the output is written, with an empty string instead
+    of the output, and what they return is ignored.
+
+    Usage example:
+
+    ```python
+    @plugins.event_requires_output(False)  # Only the page is used, not its output.
+    def on_post_page(self, output, page, config, **kwargs):
+        self.built_pages.append(page.file.src_uri)
+    ```
+
+    Recommended shim for backwards compatibility with older versions of MkDocs:
+
+    ```python
+    try:
+        from mkdocs.plugins import event_requires_output
+    except ImportError:
+        event_requires_output = lambda required: lambda f: f  # No-op fallback
+    ```
+    """
+
+    def decorator(event_method):
+        event_method.mkdocs_requires_output = required
+        return event_method
+
+    return decorator
+
+
 class CombinedEvent(Generic[P, T]):
     """
     A descriptor that allows defining multiple event handlers and declaring them under one event's name.
@@ -490,6 +543,21 @@ class CombinedEvent(Generic[P, T]):
         return CombinedEvent(*(f.__get__(instance, owner) for f in self.methods))
 
 
+class EventStats:
+    """The accumulated time that a plugin spent handling one event."""
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self, calls: int = 0, seconds: float = 0.0) -> None:
+        self.calls = calls
+        """How many times the handler was called."""
+        self.seconds = seconds
+        """The total wall time spent in the handler."""
+
+    def __repr__(self) -> str:
+        return f'EventStats(calls={self.calls}, seconds={self.seconds:.6f})'
+
+
 class PluginCollection(dict, MutableMapping[str, BasePlugin]):
     """
     A collection of plugins.
@@ -505,6 +573,13 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
         super().__init__(*args, **kwargs)
         self.events: dict[str, list[Callable]] = {k: [] for k in EVENTS}
         self._event_origins: dict[Callable, str] = {}
+        self.event_stats: dict[tuple[str, str], EventStats] = {}
+        """The time spent in each event handler, keyed by the plugin name and the event name.
+
+        This accumulates over all events that ran so far (e.g. over all rebuilds of `mkdocs serve`),
+        clear it to start over.
+        """
+        self._event_stats_lock = threading.Lock()
 
     def _register_event(
         self, event_name: str, method: CombinedEvent | Callable, plugin_name: str | None = None
@@ -559,19 +634,64 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
         """
         pass_item = item is not None
         for method in self.events[name]:
-            self._current_plugin = self._event_origins.get(method, '<unknown>')
+            plugin_name = self._current_plugin = self._event_origins.get(method, '<unknown>')
             if log.getEffectiveLevel() <= logging.DEBUG:
-                log.debug(f"Running `{name}` event from plugin '{self._current_plugin}'")
-            if pass_item:
-                result = method(item, **kwargs)
-            else:
-                result = method(**kwargs)
+                log.debug(f"Running `{name}` event from plugin '{plugin_name}'")
+            start = time.perf_counter()
+            with tracing.span(f'{plugin_name}: on_{name}', 'plugin event'):
+                if pass_item:
+                    result = method(item, **kwargs)
+                else:
+                    result = method(**kwargs)
+            self._add_event_time(plugin_name, name, time.perf_counter() - start)
             # keep item if method returned `None`
             if result is not None:
                 item = result
         self._current_plugin = None
         return item
 
+    def _add_event_time(self, plugin_name: str, event_name: str, seconds: float, calls: int = 1):
+        with self._event_stats_lock:
+            stats = self.event_stats.get((plugin_name, event_name))
+            if stats is None:
+                stats = self.event_stats[plugin_name, event_name] = EventStats()
+            stats.calls += calls
+            stats.seconds += seconds
+
+    def _take_event_stats(self) -> dict[tuple[str, str], EventStats]:
+        """Remove and return the stats accumulated so far, e.g. to send them from a worker process."""
+        with self._event_stats_lock:
+            result, self.event_stats = self.event_stats, {}
+        return result
+
+    def _add_event_stats(self, event_stats: dict[tuple[str, str], EventStats]) -> None:
+        """Add the stats that were accumulated elsewhere, e.g. in a worker process."""
+        for (plugin_name, event_name), stats in event_stats.items():
+            self._add_event_time(plugin_name, event_name, stats.seconds, stats.calls)
+
+    def _format_event_stats(self) -> str:
+        """Format the stats of all events as a table, the slowest ones first."""
+        rows = [('Plugin', 'Event', 'Calls', 'Total (s)', 'Per call (ms)')]
+        items = sorted(self.event_stats.items(), key=lambda item: -item[1].seconds)
+        for (plugin_name, event_name), stats in items:
+            rows.append(
+                (
+                    plugin_name,
+                    f'on_{event_name}',
+                    str(stats.calls),
+                    f'{stats.seconds:.3f}',
+                    f'{stats.seconds * 1000 / stats.calls:.2f}',
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return '\n'.join(
+            '  '.join(
+                cell.ljust(width) if i < 2 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
+
     def on_startup(self, *, command: Literal['build', 'gh-deploy', 'serve'], dirty: bool) -> None:
         return self.run_event('startup', command=command, dirty=dirty)
 
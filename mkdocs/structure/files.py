@@ -2,14 +2,28 @@ from __future__ import annotations
 
 import enum
 import fnmatch
+import hashlib
+import json
 import logging
 import os
 import posixpath
 import shutil
+import time
 import warnings
-from functools import cached_property
 from pathlib import PurePath, PurePosixPath
-from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping, Sequence, overload
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+    overload,
+)
 from urllib.parse import quote as urlquote
 
 import pathspec
@@ -59,11 +73,54 @@ class InclusionLevel(enum.Enum):
         return self.value <= self.NOT_IN_NAV.value
 
 
+# The inclusion predicates that `Files` keeps filtered lists for. Other predicates are applied anew.
+_CACHED_INCLUSIONS = frozenset(
+    (
+        InclusionLevel.all,
+        InclusionLevel.is_included,
+        InclusionLevel.is_excluded,
+        InclusionLevel.is_in_serve,
+        InclusionLevel.is_in_nav,
+        InclusionLevel.is_not_in_nav,
+    )
+)
+
+
 class Files:
     """A collection of [File][mkdocs.structure.files.File] objects."""
 
     def __init__(self, files: Iterable[File]) -> None:
         self._src_uris = {f.src_uri: f for f in files}
+        self._reset_views()
+
+    def _reset_views(self) -> None:
+        # The files of each kind (e.g. the documentation pages), in order.
+        self._by_kind: dict[str, list[File]] = {}
+        # The files of each kind that match an inclusion predicate, as of `_inclusion_changes`.
+        self._by_inclusion: dict[tuple[str, Callable[[InclusionLevel], bool]], list[File]] = {}
+        self._inclusion_changes = File._inclusion_changes
+
+    def _view(
+        self, kind: str, inclusion: Callable[[InclusionLevel], bool] | None = None
+    ) -> list[File]:
+        """Get the files of a kind (a key of `_KINDS`), from the lists that are kept up to date."""
+        files = self._by_kind.get(kind)
+        if files is None:
+            is_kind = _KINDS[kind]
+            files = self._by_kind[kind] = [file for file in self if is_kind(file)]
+        if inclusion is None:
+            return files
+        if inclusion not in _CACHED_INCLUSIONS:
+            return [file for file in files if inclusion(file.inclusion)]
+
+        if self._inclusion_changes != File._inclusion_changes:
+            self._by_inclusion.clear()
+            self._inclusion_changes = File._inclusion_changes
+        key = (kind, inclusion)
+        included = self._by_inclusion.get(key)
+        if included is None:
+            included = self._by_inclusion[key] = [f for f in files if inclusion(f.inclusion)]
+        return included
 
     def __iter__(self) -> Iterator[File]:
         """Iterate over the files within."""
@@ -92,6 +149,9 @@ class Files:
 
     def get_file_from_path(self, path: str) -> File | None:
         """Return a File instance with File.src_uri equal to path."""
+        # Most paths are already normalized, so try to avoid normalizing them.
+        if (file := self._src_uris.get(path)) is not None:
+            return file
         return self._src_uris.get(PurePath(path).as_posix())
 
     def append(self, file: File) -> None:
@@ -101,14 +161,24 @@ class Files:
                 "To replace an existing file, call `remove` before `append`.", DeprecationWarning
             )
             del self._src_uris[file.src_uri]
+            self._reset_views()
         self._src_uris[file.src_uri] = file
 
+        for kind, files in self._by_kind.items():
+            if _KINDS[kind](file):
+                files.append(file)
+        for (kind, inclusion), files in self._by_inclusion.items():
+            if _KINDS[kind](file) and inclusion(file.inclusion):
+                files.append(file)
+
     def remove(self, file: File) -> None:
         """Remove file from Files collection."""
         try:
             del self._src_uris[file.src_uri]
         except KeyError:
             raise ValueError(f'{file.src_uri!r} not in collection')
+        # Searching the lists would take linear time, so they're built again when they're needed.
+        self._reset_views()
 
     def copy_static_files(
         self,
@@ -117,31 +187,32 @@ class Files:
         inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included,
     ) -> None:
         """Copy static files from source to destination."""
-        for file in self:
-            if not file.is_documentation_page() and inclusion(file.inclusion):
-                file.copy_file(dirty)
+        for file in self._view('not_documentation', inclusion):
+            file.copy_file(dirty)
+
+    # The lists that these methods return are copies, so callers are free to modify them.
 
     def documentation_pages(
         self, *, inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included
     ) -> Sequence[File]:
         """Return iterable of all Markdown page file objects."""
-        return [file for file in self if file.is_documentation_page() and inclusion(file.inclusion)]
+        return list(self._view('documentation', inclusion))
 
     def static_pages(self) -> Sequence[File]:
         """Return iterable of all static page file objects."""
-        return [file for file in self if file.is_static_page()]
+        return list(self._view('static'))
 
     def media_files(self) -> Sequence[File]:
         """Return iterable of all file objects which are not documentation or static pages."""
-        return [file for file in self if file.is_media_file()]
+        return list(self._view('media'))
 
     def javascript_files(self) -> Sequence[File]:
         """Return iterable of all javascript file objects."""
-        return [file for file in self if file.is_javascript()]
+        return list(self._view('javascript'))
 
     def css_files(self) -> Sequence[File]:
         """Return iterable of all CSS file objects."""
-        return [file for file in self if file.is_css()]
+        return list(self._view('css'))
 
     def add_files_from_theme(self, env: jinja2.Environment, config: MkDocsConfig) -> None:
         """Retrieve static files from Jinja environment and add to collection."""
@@ -176,6 +247,53 @@ class Files:
     def _files(self, value: Iterable[File]):
         warnings.warn("Do not access Files._files.", DeprecationWarning)
         self._src_uris = {f.src_uri: f for f in value}
+        self._reset_views()
+
+
+_T = TypeVar('_T')
+
+
+class _cached_slot(Generic[_T]):
+    """
+    Same as `functools.cached_property`, but keeps the value in the slot of the same name with a
+    leading underscore, so that instances don't need a `__dict__` for it.
+
+    The value can be overwritten, and deleting it makes it be computed again on the next access.
+    """
+
+    def __init__(self, func: Callable[[Any], _T]) -> None:
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = owner.__dict__['_' + name]
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> _cached_slot[_T]:
+        ...
+
+    @overload
+    def __get__(self, instance: object, owner: type | None = None) -> _T:
+        ...
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance: object, value: _T) -> None:
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance: object) -> None:
+        try:
+            self.slot.__delete__(instance)
+        except AttributeError:
+            pass
 
 
 class File:
@@ -212,6 +330,27 @@ class File:
     additional transformations to the path, based on `use_directory_urls`.
     """
 
+    # A site can have very many files, so they don't have a `__dict__` unless something adds other
+    # attributes to them. The values derived from the paths are cached in the slots with a leading
+    # underscore.
+    __slots__ = (
+        'src_uri',
+        'src_dir',
+        'dest_dir',
+        'use_directory_urls',
+        '_inclusion',
+        'generated_by',
+        'page',
+        '_content',
+        '_name',
+        '_dest_uri',
+        '_url',
+        '_abs_src_path',
+        '_abs_dest_path',
+        '__dict__',
+        '__weakref__',
+    )
+
     src_uri: str
     """The pure path (always '/'-separated) of the source file relative to the source directory."""
 
@@ -232,15 +371,25 @@ class File:
     dest_dir: str
     """The OS path of the destination directory (top-level site_dir) that the file should be copied to."""
 
-    inclusion: InclusionLevel = InclusionLevel.UNDEFINED
-    """Whether the file will be excluded from the built site."""
+    _inclusion_changes: ClassVar[int] = 0
+    """Counts the changes of the `inclusion` of any file, so that `Files` know when to filter again."""
+
+    @property
+    def inclusion(self) -> InclusionLevel:
+        """Whether the file will be excluded from the built site."""
+        return self._inclusion
 
-    generated_by: str | None = None
+    @inclusion.setter
+    def inclusion(self, value: InclusionLevel) -> None:
+        self._inclusion = value
+        File._inclusion_changes += 1
+
+    generated_by: str | None
     """If not None, indicates that a plugin generated this file on the fly.
 
     The value is the plugin's entrypoint name and can be used to find the plugin by key in the PluginCollection."""
 
-    _content: str | bytes | None = None
+    _content: str | bytes | None
     """If set, the file's content will be read from here.
 
     This logic is handled by `content_bytes`/`content_string`, which should be used instead of
@@ -264,7 +413,7 @@ class File:
     def dest_path(self, value: str):
         self.dest_uri = PurePath(value).as_posix()
 
-    page: Page | None = None
+    page: Page | None
 
     @overload
     @classmethod
@@ -344,6 +493,10 @@ class File:
         if dest_uri is not None:
             self.dest_uri = dest_uri
         self.inclusion = inclusion
+        # These used to be class attributes, so subclasses can have their own defaults for them.
+        for name in ('generated_by', 'page', '_content'):
+            if not hasattr(self, name):
+                setattr(self, name, None)
 
     def __repr__(self):
         return (
@@ -368,7 +521,7 @@ class File:
         stem, ext = posixpath.splitext(filename)
         return 'index' if stem == 'README' else stem
 
-    name = cached_property(_get_stem)
+    name = _cached_slot(_get_stem)
     """Return the name of the file without its extension."""
 
     def _get_dest_path(self, use_directory_urls: bool | None = None) -> str:
@@ -386,7 +539,7 @@ class File:
                 return posixpath.join(parent, self.name, 'index.html')
         return self.src_uri
 
-    dest_uri = cached_property(_get_dest_path)
+    dest_uri = _cached_slot(_get_dest_path)
     """The pure path (always '/'-separated) of the destination file relative to the destination directory."""
 
     def _get_url(self, use_directory_urls: bool | None = None) -> str:
@@ -399,10 +552,10 @@ class File:
             url = (dirname or '.') + '/'
         return urlquote(url)
 
-    url = cached_property(_get_url)
+    url = _cached_slot(_get_url)
     """The URI of the destination file relative to the destination directory as a string."""
 
-    @cached_property
+    @_cached_slot
     def abs_src_path(self) -> str | None:
         """
         The absolute concrete path of the source file. Will use backslashes on Windows.
@@ -413,7 +566,7 @@ class File:
             return None
         return os.path.normpath(os.path.join(self.src_dir, self.src_uri))
 
-    @cached_property
+    @_cached_slot
     def abs_dest_path(self) -> str:
         """The absolute concrete path of the destination file. Will use backslashes on Windows."""
         return os.path.normpath(os.path.join(self.dest_dir, self.dest_uri))
@@ -521,13 +674,29 @@ class File:
         return self.src_uri.endswith('.css')
 
 
+# The kinds of files that `Files` keeps lists of.
+_KINDS: dict[str, Callable[[File], bool]] = {
+    'documentation': lambda file: file.is_documentation_page(),
+    'not_documentation': lambda file: not file.is_documentation_page(),
+    'static': lambda file: file.is_static_page(),
+    'media': lambda file: file.is_media_file(),
+    'javascript': lambda file: file.is_javascript(),
+    'css': lambda file: file.is_css(),
+}
+
+
 _default_exclude = pathspec.gitignore.GitIgnoreSpec.from_lines(['.*', '/templates/'])
 
 
+def _get_exclude(config: MkDocsConfig) -> pathspec.gitignore.GitIgnoreSpec:
+    """The patterns of files to exclude: the defaults, followed by `exclude_docs`."""
+    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
+    return _default_exclude + exclude if exclude else _default_exclude
+
+
 def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
     """Re-calculate which files are excluded, based on the patterns in the config."""
-    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
-    exclude = _default_exclude + exclude if exclude else _default_exclude
+    exclude = _get_exclude(config)
     drafts: pathspec.gitignore.GitIgnoreSpec | None = config.get('draft_docs')
     nav_exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('not_in_nav')
 
@@ -545,21 +714,233 @@ def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
 
 def get_files(config: MkDocsConfig) -> Files:
     """Walk the `docs_dir` and return a Files collection."""
-    files: list[File] = []
-    conflicting_files: list[tuple[File, File]] = []
-    for source_dir, dirnames, filenames in os.walk(config['docs_dir'], followlinks=True):
-        relative_dir = os.path.relpath(source_dir, config['docs_dir'])
-        dirnames.sort()
-        filenames.sort(key=_file_sort_key)
+    snapshot = _DocsDirSnapshot(config) if config.get('cache_dir') else None
+    listing = _list_docs_dir(config['docs_dir'], _get_exclude(config), snapshot)
+    files = _get_files_from_listing(config, listing, snapshot)
+    if snapshot is not None:
+        snapshot.save()
+    return files
 
-        files_by_dest: dict[str, File] = {}
-        for filename in filenames:
+
+class _DocsDirSnapshot:
+    """
+    A record of the directories in `docs_dir`: their modification times, their entries, and the
+    destination and URL of each file in them.
+
+    A directory is only listed again if its modification time changed since the snapshot was
+    taken, which is the case when entries are added to it, removed from it or renamed in it.
+    The snapshot is kept in `cache_dir`, and during `mkdocs serve` also in memory.
+    """
+
+    version = 1
+
+    racy_interval = 2 * 10**9
+    """Directories modified this recently (in nanoseconds) when they're listed could change again
+    without their modification time changing, so they aren't reused in the next build."""
+
+    def __init__(self, config: MkDocsConfig, previous: _DocsDirSnapshot | None = None) -> None:
+        self.docs_dir = os.path.abspath(config['docs_dir'])
+        self.use_directory_urls = bool(config['use_directory_urls'])
+        self.path: str | None = None
+        if cache_dir := config.get('cache_dir'):
+            key = hashlib.sha256(self.docs_dir.encode()).hexdigest()[:16]
+            self.path = os.path.join(cache_dir, 'listings', f'{key}.json')
+
+        self.previous_dirs: dict[str, list] = {}
+        """Maps the relative path of a directory to its modification time (or `None`),
+        its subdirectories and its files."""
+        self.previous_urls: dict[str, list[str]] = {}
+        """Maps the relative path of a file to its `dest_uri` and `url`."""
+        if previous is not None and previous.docs_dir == self.docs_dir:
+            self.previous_dirs = previous.previous_dirs
+            if previous.use_directory_urls == self.use_directory_urls:
+                self.previous_urls = previous.previous_urls
+        elif self.path is not None:
+            self._load(self.path)
+
+        self.dirs: dict[str, list] = {}
+        self.urls: dict[str, list[str]] = {}
+        self.changed = False
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.debug(f"Ignoring the snapshot of the docs_dir in '{path}': {e}")
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get('version') != self.version
+            or data.get('docs_dir') != self.docs_dir
+        ):
+            return
+        self.previous_dirs = data['dirs']
+        if data['use_directory_urls'] == self.use_directory_urls:
+            self.previous_urls = data['urls']
+
+    def list_dir(self, source_dir: str, key: str) -> tuple[list[str], list[str]] | None:
+        """Return the sorted subdirectories and files in a directory, or `None` if it can't be listed."""
+        try:
+            mtime = os.stat(source_dir).st_mtime_ns
+        except OSError:
+            return None
+        previous = self.previous_dirs.get(key)
+        if previous is not None and previous[0] == mtime:
+            self.dirs[key] = previous
+            return previous[1], previous[2]
+
+        self.changed = True
+        result = _scan_dir(source_dir)
+        if result is not None:
+            racy = time.time_ns() - mtime < self.racy_interval
+            self.dirs[key] = [None if racy else mtime, *result]
+        return result
+
+    def get_file(self, path: str, config: MkDocsConfig) -> File:
+        """Create the `File` at the relative `path` in `docs_dir`, with its URLs from the snapshot if possible."""
+        if (urls := self.previous_urls.get(path)) is not None:
             file = File(
-                os.path.join(relative_dir, filename),
+                path,
                 config['docs_dir'],
                 config['site_dir'],
                 config['use_directory_urls'],
+                dest_uri=urls[0],
             )
+            file.url = urls[1]
+        else:
+            file = File(path, config['docs_dir'], config['site_dir'], config['use_directory_urls'])
+            urls = [file.dest_uri, file.url]
+            self.changed = True
+        self.urls[path] = urls
+        return file
+
+    def save(self) -> None:
+        """Make the snapshot the basis of the next one, and write it to `cache_dir` if it changed."""
+        if not self.dirs:
+            # The listing of `docs_dir` was reused without listing any directories.
+            self.dirs = self.previous_dirs
+        if len(self.dirs) != len(self.previous_dirs) or len(self.urls) != len(self.previous_urls):
+            self.changed = True
+        if self.changed and self.path is not None:
+            data = {
+                'version': self.version,
+                'docs_dir': self.docs_dir,
+                'use_directory_urls': self.use_directory_urls,
+                'dirs': self.dirs,
+                'urls': self.urls,
+            }
+            try:
+                utils.write_file(json.dumps(data).encode(), self.path)
+            except OSError as e:
+                log.debug(f"Failed to save the snapshot of the docs_dir to '{self.path}': {e}")
+        self.previous_dirs, self.previous_urls = self.dirs, self.urls
+        self.dirs, self.urls = {}, {}
+        self.changed = False
+
+
+def _scan_dir(source_dir: str) -> tuple[list[str], list[str]] | None:
+    """Return the sorted subdirectories and files in a directory, or `None` if it can't be listed."""
+    dirnames: list[str] = []
+    filenames: list[str] = []
+    try:
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirnames if is_dir else filenames).append(entry.name)
+    except OSError:
+        return None
+    dirnames.sort()
+    filenames.sort(key=_file_sort_key)
+    return dirnames, filenames
+
+
+def _list_docs_dir(
+    docs_dir: str,
+    exclude: pathspec.gitignore.GitIgnoreSpec | None = None,
+    snapshot: _DocsDirSnapshot | None = None,
+) -> list[list[str]]:
+    """
+    Return the relative paths of all files in `docs_dir`, grouped by directory, in the order of `get_files`.
+
+    The directories that `exclude` matches are not descended into, unless a negated pattern
+    could re-include a file in them. The files in them would all be excluded anyway.
+
+    With a `snapshot`, only the directories that changed since the snapshot are listed again.
+    """
+    listing: list[list[str]] = []
+    negated = [p for p in exclude.patterns if p.include is False] if exclude else []
+
+    def walk(source_dir: str, parts: tuple[str, ...]) -> None:
+        if snapshot is not None:
+            entries = snapshot.list_dir(source_dir, '/'.join(parts))
+        else:
+            entries = _scan_dir(source_dir)
+        if entries is None:
+            return
+        dirnames, filenames = entries
+        relative_dir = os.path.join(*parts) if parts else '.'
+        listing.append([os.path.join(relative_dir, filename) for filename in filenames])
+        for dirname in dirnames:
+            dir_parts = (*parts, dirname)
+            if (
+                exclude is not None
+                and exclude.match_file('/'.join(dir_parts) + '/')
+                and not any(_may_match_inside(p, dir_parts) for p in negated)
+            ):
+                log.debug(f"Skipping excluded directory '{'/'.join(dir_parts)}/'")
+                continue
+            walk(os.path.join(source_dir, dirname), dir_parts)
+
+    walk(docs_dir, ())
+    return listing
+
+
+def _may_match_inside(pattern: pathspec.Pattern, dir_parts: tuple[str, ...]) -> bool:
+    """
+    Check whether a gitignore `pattern` could match some path inside the directory `dir_parts`.
+
+    This errs on the side of `True`: only anchored patterns with simple wildcards are ruled out.
+    """
+    text: str | None = getattr(pattern, 'pattern', None)
+    if not isinstance(text, str):
+        return True
+    text = text.rstrip()
+    if text.startswith('!'):
+        text = text[1:]
+    if '/' not in text.rstrip('/'):
+        return True  # An unanchored pattern matches names at any depth.
+    for segment, part in zip(text.strip('/').split('/'), dir_parts):
+        if '**' in segment or '[' in segment or '\\' in segment:
+            return True
+        if not fnmatch.fnmatchcase(part, segment):
+            return False
+    return True
+
+
+def _get_files_from_listing(
+    config: MkDocsConfig, listing: list[list[str]], snapshot: _DocsDirSnapshot | None = None
+) -> Files:
+    """Same as `get_files`, but takes the result of `_list_docs_dir` instead of walking the `docs_dir`."""
+    files: list[File] = []
+    conflicting_files: list[tuple[File, File]] = []
+    for paths in listing:
+        files_by_dest: dict[str, File] = {}
+        for path in paths:
+            if snapshot is not None:
+                file = snapshot.get_file(path, config)
+            else:
+                file = File(
+                    path,
+                    config['docs_dir'],
+                    config['site_dir'],
+                    config['use_directory_urls'],
+                )
             # Skip README.md if an index file also exists in dir (part 1)
             prev_file = files_by_dest.setdefault(file.dest_uri, file)
             if prev_file is not file:
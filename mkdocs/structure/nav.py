@@ -7,7 +7,7 @@ from urllib.parse import urlsplit
 from mkdocs.exceptions import BuildError
 from mkdocs.structure import StructureItem
 from mkdocs.structure.files import file_sort_key
-from mkdocs.structure.pages import Page, _AbsoluteLinksValidationValue
+from mkdocs.structure.pages import Page, _AbsoluteLinksValidationValue, _active_page
 from mkdocs.utils import nest_paths
 
 if TYPE_CHECKING:
@@ -69,7 +69,10 @@ class Section(StructureItem):
         can be used to highlight the section as the currently viewed section. Defaults
         to `False`.
         """
-        return self.__active
+        if self.__active:
+            return True
+        page = _active_page.get()
+        return page is not None and any(item is self for item in page.ancestors)
 
     @active.setter
     def active(self, value: bool):
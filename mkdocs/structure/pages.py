@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import contextvars
 import enum
+import functools
+import hashlib
+import json
 import logging
+import os
 import posixpath
+import sys
+import threading
 import warnings
-from typing import TYPE_CHECKING, Any, Callable, Iterator, MutableMapping, Sequence
+import zlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    cast,
+)
 from urllib.parse import unquote as urlunquote
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
@@ -15,11 +33,14 @@ import markdown.postprocessors
 import markdown.treeprocessors
 from markdown.util import AMP_SUBSTITUTE
 
+import mkdocs
 from mkdocs import utils
 from mkdocs.structure import StructureItem
-from mkdocs.structure.toc import get_toc
+from mkdocs.structure.toc import _get_toc_tokens, get_toc
 from mkdocs.utils import _removesuffix, get_build_date, get_markdown_title, meta, weak_property
+from mkdocs.utils.cache import DiskCache
 from mkdocs.utils.rendering import get_heading_text
+from mkdocs.utils.yaml import RelativeDirPlaceholder, _DirPlaceholder
 
 if TYPE_CHECKING:
     from xml.etree import ElementTree as etree
@@ -31,6 +52,12 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+_active_page: contextvars.ContextVar[Page | None] = contextvars.ContextVar(
+    'mkdocs_active_page', default=None
+)
+"""The page that is currently being built. Each thread has its own value, so that pages can be
+rendered concurrently."""
+
 
 class Page(StructureItem):
     def __init__(self, title: str | None, file: File, config: MkDocsConfig) -> None:
@@ -113,14 +140,15 @@ class Page(StructureItem):
     @property
     def active(self) -> bool:
         """When `True`, indicates that this page is the currently viewed page. Defaults to `False`."""
-        return self.__active
+        return _active_page.get() is self
 
     @active.setter
     def active(self, value: bool):
         """Set active status of page and ancestors."""
-        self.__active = bool(value)
-        if self.parent is not None:
-            self.parent.active = bool(value)
+        if value:
+            _active_page.set(self)
+        elif _active_page.get() is self:
+            _active_page.set(None)
 
     @property
     def is_index(self) -> bool:
@@ -265,10 +293,8 @@ class Page(StructureItem):
         if self.markdown is None:
             raise RuntimeError("`markdown` field hasn't been set (via `read_source`)")
 
-        md = markdown.Markdown(
-            extensions=config['markdown_extensions'],
-            extension_configs=config['mdx_configs'] or {},
-        )
+        pool = _MarkdownPool.get(config)
+        md = pool.acquire()
 
         raw_html_ext = _RawHTMLPreprocessor()
         raw_html_ext._register(md)
@@ -276,14 +302,18 @@ class Page(StructureItem):
         extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
         extract_anchors_ext._register(md)
 
-        relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
+        relative_path_ext = _RelativePathTreeprocessor(
+            self.file, files, config, extract_anchors=extract_anchors_ext, raw_html=raw_html_ext
+        )
         relative_path_ext._register(md)
 
         extract_title_ext = _ExtractTitleTreeprocessor()
         extract_title_ext._register(md)
 
+        # If the conversion fails, the instance is left in an unknown state, so it isn't reused.
         self.content = md.convert(self.markdown)
         self.toc = get_toc(getattr(md, 'toc_tokens', []))
+        pool.release(md)
         self._title_from_render = extract_title_ext.title
         self.present_anchor_ids = (
             extract_anchors_ext.present_anchor_ids | raw_html_ext.present_anchor_ids
@@ -326,29 +356,307 @@ class Page(StructureItem):
                 )
 
 
+class _MarkdownPool:
+    """
+    Markdown instances that are reused for all pages rendered with the same config.
+
+    Creating a `Markdown` instance loads and sets up all the extensions, which can take longer
+    than converting a page. The instances are `reset()` between pages. MkDocs' own processors
+    hold the results for one page, so they are registered again for each page, replacing the
+    previous ones.
+
+    Extension configs that contain `!relative` are resolved when an instance is created, to
+    the directory of the page being rendered, so then each page gets a new instance.
+    """
+
+    _current: ClassVar[_MarkdownPool | None] = None
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, config: MkDocsConfig, key: str) -> None:
+        self.config = config
+        self.key = key
+        self.free: list[markdown.Markdown] = []
+        self.reusable = not _contains_relative_dir(config['mdx_configs'])
+
+    @classmethod
+    def get(cls, config: MkDocsConfig) -> _MarkdownPool:
+        """Get the pool for the config, which is replaced when the config or its extensions change."""
+        key = _fingerprint([config['markdown_extensions'], config['mdx_configs']])
+        with cls._lock:
+            pool = cls._current
+            if pool is None or pool.config is not config or pool.key != key:
+                pool = cls._current = cls(config, key)
+        return pool
+
+    def acquire(self) -> markdown.Markdown:
+        try:
+            return self.free.pop()
+        except IndexError:
+            return markdown.Markdown(
+                extensions=self.config['markdown_extensions'],
+                extension_configs=self.config['mdx_configs'] or {},
+            )
+
+    def release(self, md: markdown.Markdown) -> None:
+        if self.reusable:
+            md.reset()
+            self.free.append(md)
+
+
+def _contains_relative_dir(value: object) -> bool:
+    if isinstance(value, RelativeDirPlaceholder):
+        return True
+    if isinstance(value, Mapping):
+        return any(_contains_relative_dir(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_relative_dir(v) for v in value)
+    return False
+
+
+class _RenderCache:
+    """
+    Persists the results of `Page.render` between builds, in the `cache_dir` of the config.
+
+    The entries are keyed on the Markdown source of the page and the config that affects its
+    rendering. Each entry also records the link targets that the page was resolved against, and
+    it is only reused if all of them still resolve to the same files.
+    """
+
+    def __init__(self, config: MkDocsConfig) -> None:
+        assert config.cache_dir is not None
+        self.disk_cache = DiskCache(
+            os.path.join(config.cache_dir, 'pages'), max_size=config.cache_max_size * 2**20
+        )
+        extension_versions: dict[str, Any] = {}
+        for ext in config.markdown_extensions:
+            # Plugins can add instances of `markdown.Extension` after the config is validated.
+            if isinstance(ext, markdown.Extension):
+                name = f'{type(ext).__module__}.{type(ext).__qualname__}'
+                module = sys.modules.get(type(ext).__module__.partition('.')[0])
+                extension_versions[name] = [getattr(module, '__version__', None), ext.getConfigs()]
+            else:
+                module = sys.modules.get(ext.partition('.')[0])
+                extension_versions[ext] = getattr(module, '__version__', None)
+        config_fingerprint = _fingerprint(
+            [
+                mkdocs.__version__,
+                markdown.__version__,
+                extension_versions,
+                config.mdx_configs,
+                config.use_directory_urls,
+                dict(config.validation.links),
+            ]
+        )
+        self.config_digest = hashlib.sha256(config_fingerprint.encode()).hexdigest()
+
+    def _get_key(self, page: Page) -> str:
+        assert page.markdown is not None
+        key = hashlib.sha256()
+        for part in (
+            self.config_digest,
+            str(log.getEffectiveLevel()),
+            page.file.src_uri,
+            page.file.url,
+            page.file.inclusion.name,
+            page.markdown,
+        ):
+            key.update(part.encode('utf-8', errors='surrogatepass') + b'\0')
+        return key.hexdigest()
+
+    def render(self, page: Page, config: MkDocsConfig, files: Files) -> None:
+        """Render the page like `Page.render` does, but reuse the result of a previous build if possible."""
+        if page.markdown is None or type(page).render is not Page.render:
+            page.render(config, files)
+            return
+
+        key = self._get_key(page)
+        if self._load(key, page, files):
+            return
+
+        recording_files = _LinkTargetsRecorder(files)
+        log_collector = _LogCollector()
+        logger = logging.getLogger('mkdocs')
+        logger.addHandler(log_collector)
+        try:
+            page.render(config, cast('Files', recording_files))
+        finally:
+            logger.removeHandler(log_collector)
+        self._store(key, page, recording_files.targets, log_collector.records)
+
+    def _load(self, key: str, page: Page, files: Files) -> bool:
+        data = self.disk_cache.get(key)
+        if data is None:
+            return False
+        try:
+            entry = json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError) as e:
+            log.debug(f"Ignoring invalid cache entry for '{page.file.src_uri}': {e}")
+            return False
+        for path, target in entry['link_targets'].items():
+            if _get_link_target(files.get_file_from_path(path)) != target:
+                return False
+
+        page.content = entry['content']
+        page.toc = get_toc(entry['toc'])
+        page._title_from_render = entry['title']
+        page.present_anchor_ids = set(entry['present_anchor_ids'])
+        if entry['links_to_anchors'] is not None:
+            page.links_to_anchors = {
+                files.src_uris[src_uri]: links
+                for src_uri, links in entry['links_to_anchors'].items()
+            }
+        for logger_name, level, message in entry['log']:
+            logging.getLogger(logger_name).log(level, message)
+        return True
+
+    def _store(
+        self,
+        key: str,
+        page: Page,
+        link_targets: dict[str, list[str] | None],
+        log_records: list[tuple[str, int, str]],
+    ) -> None:
+        links_to_anchors = None
+        if log.getEffectiveLevel() > logging.DEBUG and page.links_to_anchors is not None:
+            links_to_anchors = {
+                file.src_uri: links for file, links in page.links_to_anchors.items()
+            }
+        entry = {
+            'content': page.content,
+            'toc': _get_toc_tokens(page.toc),
+            'title': page._title_from_render,
+            'present_anchor_ids': sorted(page.present_anchor_ids or ()),
+            'links_to_anchors': links_to_anchors,
+            'link_targets': link_targets,
+            'log': log_records,
+        }
+        try:
+            self.disk_cache.set(key, zlib.compress(json.dumps(entry).encode()))
+        except OSError as e:
+            log.debug(f"Failed to cache the rendered page '{page.file.src_uri}': {e}")
+
+    def trim(self) -> None:
+        self.disk_cache.trim()
+
+
+def _fingerprint(value: object) -> str:
+    """Serialize a config value in a way that's stable between builds."""
+    return json.dumps(value, sort_keys=True, default=_fingerprint_default)
+
+
+def _fingerprint_default(value: object) -> object:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, _DirPlaceholder):
+        return [type(value).__name__, value.suffix]
+    if name := getattr(value, '__qualname__', None):
+        return f'{getattr(value, "__module__", None)}.{name}'
+    # Note that some objects will not be reproducible, which only makes the cache ineffective.
+    return repr(value)
+
+
+def _get_link_target(file: File | None) -> list[str] | None:
+    if file is None:
+        return None
+    return [file.url, file.inclusion.name]
+
+
+class _LinkTargetsRecorder:
+    """Wraps `Files` to record the results of looking up link targets."""
+
+    def __init__(self, files: Files) -> None:
+        self.files = files
+        self.targets: dict[str, list[str] | None] = {}
+
+    def get_file_from_path(self, path: str) -> File | None:
+        file = self.files.get_file_from_path(path)
+        self.targets[path] = _get_link_target(file)
+        return file
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.files, name)
+
+
+class _LogCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[tuple[str, int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.name, record.levelno, record.getMessage()))
+
+
+@functools.lru_cache(maxsize=2**16)
+def _resolve_relative_link(src_dir: str, url: str) -> tuple[str, str, str] | None:
+    """
+    Get the `src_uri` that a link on a page in the directory `src_dir` points to, and its query and anchor.
+
+    Return `None` for any link that isn't a plain relative link to a path.
+    The results are shared by all pages, and they don't depend on the files that exist.
+    """
+    scheme, netloc, path, query, anchor = _urlsplit(url)
+    if scheme or netloc or not path or url.startswith(('/', '\\')) or AMP_SUBSTITUTE in url:
+        return None
+    target_uri = posixpath.normpath(posixpath.join(src_dir, urlunquote(path)).lstrip('/'))
+    return target_uri, query, anchor
+
+
+_urlsplit = functools.lru_cache(maxsize=2**16)(urlsplit)
+_get_relative_url = functools.lru_cache(maxsize=2**16)(utils.get_relative_url)
+
+
 class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
+    md: markdown.Markdown
+
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.present_anchor_ids: set[str] = set()
 
     def run(self, root: etree.Element) -> None:
-        add = self.present_anchor_ids.add
+        if _is_collected_by_relpath(self, 'extract_anchors'):
+            return
         for element in root.iter():
-            if anchor := element.get('id'):
-                add(anchor)
-            if element.tag == 'a':
-                if anchor := element.get('name'):
-                    add(anchor)
+            self.add_anchors(element)
+
+    def add_anchors(self, element: etree.Element) -> None:
+        if anchor := element.get('id'):
+            self.present_anchor_ids.add(anchor)
+        if element.tag == 'a':
+            if anchor := element.get('name'):
+                self.present_anchor_ids.add(anchor)
 
     def _register(self, md: markdown.Markdown) -> None:
+        self.md = md
         md.treeprocessors.register(self, "mkdocs_extract_anchors", priority=5)  # Same as 'toc'.
 
 
+def _is_collected_by_relpath(processor: markdown.util.Processor, name: str) -> bool:
+    """Check whether the 'relpath' treeprocessor collects the anchors of `processor` in its own pass over the tree."""
+    md = getattr(processor, 'md', None)
+    if md is None or 'relpath' not in md.treeprocessors:
+        return False
+    return getattr(md.treeprocessors['relpath'], name, None) is processor
+
+
 class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
-    def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
+    md: markdown.Markdown
+
+    def __init__(
+        self,
+        file: File,
+        files: Files,
+        config: MkDocsConfig,
+        *,
+        extract_anchors: _ExtractAnchorsTreeprocessor | None = None,
+        raw_html: _RawHTMLPreprocessor | None = None,
+    ) -> None:
         self.file = file
         self.files = files
         self.config = config
         self.links_to_anchors: dict[File, dict[str, str]] = {}
+        self._src_dir = posixpath.dirname(file.src_uri)
+        # The anchors for these are collected here, so the tree is only walked once.
+        self.extract_anchors = extract_anchors
+        self.raw_html = raw_html
 
     def run(self, root: etree.Element) -> etree.Element:
         """
@@ -357,19 +665,23 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         Iterates through the full document tree looking for specific
         tags and then makes them relative based on the site navigation
         """
+        add_anchors = self.extract_anchors.add_anchors if self.extract_anchors else None
         for element in root.iter():
+            if add_anchors is not None:
+                add_anchors(element)
             if element.tag == 'a':
                 key = 'href'
             elif element.tag == 'img':
                 key = 'src'
             else:
                 continue
-
             url = element.get(key)
             assert url is not None
             new_url = self.path_to_url(url)
             element.set(key, new_url)
 
+        if self.raw_html is not None:
+            self.raw_html.add_anchors(self.md.htmlStash.rawHtmlBlocks)
         return root
 
     @classmethod
@@ -417,7 +729,14 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
                     tried.add(guess)
 
     def path_to_url(self, url: str) -> str:
-        scheme, netloc, path, query, anchor = urlsplit(url)
+        if (resolved := _resolve_relative_link(self._src_dir, url)) is not None:
+            target_uri, query, anchor = resolved
+            target_file = self.files.get_file_from_path(target_uri)
+            if target_file is not None:
+                return self._link_to_file(target_file, target_uri, url, query, anchor)
+            # The target doesn't exist, go through all the checks to produce the right warning.
+
+        scheme, netloc, path, query, anchor = _urlsplit(url)
 
         absolute_link = None
         warning_level, warning = 0, ''
@@ -497,7 +816,11 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
 
         assert target_uri is not None
         assert target_file is not None
+        return self._link_to_file(target_file, target_uri, url, query, anchor)
 
+    def _link_to_file(
+        self, target_file: File, target_uri: str, url: str, query: str, anchor: str
+    ) -> str:
         if anchor:
             # Register that this page links to the target file with an anchor.
             self.links_to_anchors.setdefault(target_file, {}).setdefault(anchor, url)
@@ -512,43 +835,51 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
                 f"'{target_uri}' which is excluded from the built site."
             )
             log.log(warning_level, warning)
-        path = utils.get_relative_url(target_file.url, self.file.url)
+        path = _get_relative_url(target_file.url, self.file.url)
         return urlunsplit(('', '', path, query, anchor))
 
     def _register(self, md: markdown.Markdown) -> None:
+        self.md = md
         md.treeprocessors.register(self, "relpath", 0)
 
 
 class _RawHTMLPreprocessor(markdown.preprocessors.Preprocessor):
+    md: markdown.Markdown
+
     def __init__(self) -> None:
         super().__init__()
         self.present_anchor_ids: set[str] = set()
 
     def run(self, lines: list[str]) -> list[str]:
+        if not _is_collected_by_relpath(self, 'raw_html'):
+            parser = _HTMLHandler()
+            parser.feed('\n'.join(lines))
+            parser.close()
+            self.present_anchor_ids = parser.present_anchor_ids
+        return lines
+
+    def add_anchors(self, blocks: Sequence[str | etree.Element]) -> None:
+        """Add the anchors of the raw HTML blocks that Markdown kept aside from the tree."""
         parser = _HTMLHandler()
-        parser.feed('\n'.join(lines))
+        for html in blocks:
+            if isinstance(html, str):
+                parser.feed(html)
+            else:
+                for element in html.iter():
+                    if anchor := element.get('id'):
+                        self.present_anchor_ids.add(anchor)
+                    if element.tag == 'a' and (anchor := element.get('name')):
+                        self.present_anchor_ids.add(anchor)
         parser.close()
-        self.present_anchor_ids = parser.present_anchor_ids
-        return lines
+        self.present_anchor_ids |= parser.present_anchor_ids
 
     def _register(self, md: markdown.Markdown) -> None:
+        self.md = md
         md.preprocessors.register(
             self, "mkdocs_raw_html", priority=21  # Right before 'html_block'.
         )
 
 
-class _HTMLHandler(markdown.htmlparser.htmlparser.HTMLParser):  # type: ignore[name-defined]
-    def __init__(self) -> None:
-        super().__init__()
-        self.present_anchor_ids: set[str] = set()
-
-    def handle_starttag(self, tag: str, attrs: Sequence[tuple[str, str]]) -> None:
-        for k, v in attrs:
-            if k == 'id' or (k == 'name' and tag == 'a'):
-                self.present_anchor_ids.add(v)
-        return super().handle_starttag(tag, attrs)
-
-
 class _ExtractTitleTreeprocessor(markdown.treeprocessors.Treeprocessor):
     title: str | None = None
     md: markdown.Markdown
@@ -565,5 +896,17 @@ class _ExtractTitleTreeprocessor(markdown.treeprocessors.Treeprocessor):
         md.treeprocessors.register(self, "mkdocs_extract_title", priority=1)  # Close to the end.
 
 
+class _HTMLHandler(markdown.htmlparser.htmlparser.HTMLParser):  # type: ignore[name-defined]
+    def __init__(self) -> None:
+        super().__init__()
+        self.present_anchor_ids: set[str] = set()
+
+    def handle_starttag(self, tag: str, attrs: Sequence[tuple[str, str]]) -> None:
+        for k, v in attrs:
+            if k == 'id' or (k == 'name' and tag == 'a'):
+                self.present_anchor_ids.add(v)
+        return super().handle_starttag(tag, attrs)
+
+
 class _AbsoluteLinksValidationValue(enum.IntEnum):
     RELATIVE_TO_DOCS = -1
@@ -78,3 +78,13 @@ def _parse_toc_token(token: _TocToken) -> AnchorLink:
     for i in token['children']:
         anchor.children.append(_parse_toc_token(i))
     return anchor
+
+
+def _get_toc_tokens(items: Iterable[AnchorLink]) -> list[_TocToken]:
+    """The reverse of `get_toc`: convert the items back to the tokens of the `toc` extension."""
+    return [
+        _TocToken(
+            level=item.level, id=item.id, name=item.title, children=_get_toc_tokens(item.children)
+        )
+        for item in items
+    ]
@@ -0,0 +1,106 @@
+"""
+# Memory benchmark of the structure objects.
+
+Measures how many bytes each `File`, `Page`, `AnchorLink`, `Section` and `Link`
+takes up, including the values that a build derives and caches for it (such as
+the URLs of a file and the table of contents of a page).
+
+From the root of the MkDocs git repo, use:
+
+    python -m mkdocs.tests.benchmarks.memory --help
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import Callable
+
+import click
+
+from mkdocs.structure.files import File
+from mkdocs.structure.nav import Link, Section
+from mkdocs.structure.pages import Page
+from mkdocs.structure.toc import get_toc
+from mkdocs.tests.base import load_config
+
+
+def _measure(create: Callable[[], list]) -> tuple[list, int]:
+    """Return the objects that `create` returns, and how many bytes they take up."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        objects = create()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return objects, size
+
+
+@click.command()
+@click.option('--count', default=20000, help="The number of files and pages to create.")
+@click.option('--toc-size', default=10, help="The number of table of contents entries per page.")
+def main(count: int, toc_size: int) -> None:
+    config = load_config(site_url='https://example.org/', repo_url='https://github.com/a/b')
+
+    def create_files() -> list[File]:
+        files = [
+            File(
+                f'section{i % 100}/page{i}.md',
+                config.docs_dir,
+                config.site_dir,
+                config.use_directory_urls,
+            )
+            for i in range(count)
+        ]
+        for file in files:
+            # The values that every build computes for every file.
+            _ = (file.name, file.dest_uri, file.url, file.abs_src_path, file.abs_dest_path)
+        return files
+
+    def create_pages() -> list[Page]:
+        pages = [Page(None, file, config) for file in files]
+        for i, page in enumerate(pages):
+            page.markdown, page.meta = '', {}
+            page._title_from_render = f'Page {i}'
+            page.present_anchor_ids = set()
+        return pages
+
+    toc_tokens = [
+        {'level': 2, 'id': f'heading-{i}', 'name': f'Heading {i}', 'children': []}
+        for i in range(toc_size)
+    ]
+
+    def create_tocs() -> list:
+        tocs = []
+        for page in pages:
+            page.toc = get_toc(toc_tokens)  # type: ignore[arg-type]
+            tocs.append(page.toc)
+        return tocs
+
+    def create_sections() -> list[Section]:
+        return [Section(f'Section {i}', [pages[i]]) for i in range(count)]
+
+    def create_links() -> list[Link]:
+        return [Link(f'Link {i}', f'https://example.org/{i}') for i in range(count)]
+
+    files, files_size = _measure(create_files)
+    pages, pages_size = _measure(create_pages)
+    _, tocs_size = _measure(create_tocs)
+    _, sections_size = _measure(create_sections)
+    _, links_size = _measure(create_links)
+
+    click.echo(f"{'Object':<12} {'Bytes':>8}")
+    for name, size in (
+        ('File', files_size / count),
+        ('Page', pages_size / count),
+        ('AnchorLink', tocs_size / (count * toc_size)),
+        ('Section', sections_size / count),
+        ('Link', links_size / count),
+    ):
+        click.echo(f"{name:<12} {size:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
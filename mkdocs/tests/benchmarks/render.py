@@ -0,0 +1,96 @@
+"""
+# Benchmark of rendering Markdown pages.
+
+Measures how long `Page.render` takes for a page with many links and for a page
+with many headings, and how much of that is spent in MkDocs' own processors of
+the Markdown (making links relative, collecting anchors, extracting the title).
+
+From the root of the MkDocs git repo, use:
+
+    python -m mkdocs.tests.benchmarks.render --help
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from typing import Any, Callable
+
+import click
+import markdown
+
+from mkdocs.structure import pages as pages_module
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.pages import Page
+from mkdocs.tests.base import load_config
+
+_processor_times: list[float] = []
+
+
+def _timed(run: Callable) -> Callable:
+    @functools.wraps(run)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return run(*args, **kwargs)
+        finally:
+            _processor_times.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _links_page(count: int, files: int) -> str:
+    lines = ['# Links\n']
+    for i in range(count):
+        target = f'section{i % 10}/page{i % files}.md'
+        lines.append(
+            f'* [Page {i}](../{target}#heading-{i % 20}) and ![image](../img{i % 10}.png)'
+            f' and [external](https://example.org/{i}) <a id="raw-{i}"></a>'
+        )
+    return '\n'.join(lines)
+
+
+def _headings_page(count: int) -> str:
+    lines = ['# Headings\n']
+    for i in range(count):
+        lines.append(
+            f'## Heading `{i}` with *emphasis*\n\nSee [the first one](#heading-0-with-emphasis).\n'
+        )
+    return '\n'.join(lines)
+
+
+@click.command()
+@click.option('--pages', default=20, help="The number of times each page is rendered.")
+@click.option('--links', default=2000, help="The number of lines of links on the link-heavy page.")
+@click.option('--headings', default=500, help="The number of headings on the heading-heavy page.")
+def main(pages: int, links: int, headings: int) -> None:
+    config = load_config(markdown_extensions=['toc', 'attr_list'])
+    site_files = [
+        File(f'section{i % 10}/page{i}.md', config.docs_dir, config.site_dir, True)
+        for i in range(500)
+    ]
+    site_files += [File(f'img{i}.png', config.docs_dir, config.site_dir, True) for i in range(10)]
+    file = File('api/index.md', config.docs_dir, config.site_dir, True)
+    files = Files([*site_files, file])
+
+    for cls in vars(pages_module).values():
+        if isinstance(cls, type) and issubclass(cls, markdown.util.Processor):
+            cls.run = _timed(cls.run)  # type: ignore[attr-defined]
+
+    click.echo(f"{'Page':<12} {'ms/page':>8} {'MkDocs ms/page':>15}")
+    for name, source in (
+        ('links', _links_page(links, 500)),
+        ('headings', _headings_page(headings)),
+    ):
+        page = Page(None, file, config)
+        _processor_times.clear()
+        start = time.perf_counter()
+        for _ in range(pages):
+            page.markdown = source
+            page.render(config, files)
+        total = (time.perf_counter() - start) / pages * 1000
+        click.echo(f"{name:<12} {total:>8.1f} {sum(_processor_times) / pages * 1000:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,20 +2,27 @@
 from __future__ import annotations
 
 import contextlib
+import gzip
 import io
 import os.path
 import re
 import textwrap
+import threading
+import time
 import unittest
 from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest import mock
 
+import jinja2
+import markdown.extensions.abbr
 import markdown.preprocessors
 
+from mkdocs import utils
 from mkdocs.commands import build
 from mkdocs.config import base
 from mkdocs.exceptions import PluginError
+from mkdocs.plugins import BasePlugin, event_requires_output
 from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import get_navigation
 from mkdocs.structure.pages import Page
@@ -213,6 +220,34 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(context['extra_css'], ['../style.css'])
         self.assertEqual(context['extra_javascript'], ['../script.js'])
 
+    def test_context_shared_between_pages(self):
+        cfg = load_config(
+            extra_css=['style.css', 'css/extra.css', 'https://example.org/a/b/c.css'],
+            extra_javascript=['js/a/script.js'],
+        )
+        fs = ['index.md', 'foo.md', 'css/bar.md', 'css/extra/baz.md', 'js/a/b.md', 'js/b/c.md']
+        files = Files([File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls) for f in fs])
+        nav = get_navigation(files, cfg)
+        contexts = [build.get_context(nav, files, cfg, page) for page in nav.pages]
+        for page, context in zip(nav.pages, contexts):
+            with self.subTest(page=page.url):
+                self.assertEqual(context['base_url'], utils.get_relative_url('.', page.url))
+                self.assertEqual(
+                    context['extra_css'],
+                    [utils.normalize_url(path, page) for path in cfg.extra_css],
+                )
+                self.assertEqual(
+                    context['extra_javascript'],
+                    [utils.normalize_url(str(path), page) for path in cfg.extra_javascript],
+                )
+        self.assertEqual(len({c['build_date_utc'] for c in contexts}), 1)
+
+        # Each context gets its own lists, and changes to the config are still picked up.
+        contexts[0]['extra_css'].append('other.css')
+        cfg.extra_css.append('more.css')
+        context = build.get_context(nav, files, cfg, nav.pages[0])
+        self.assertEqual(context['extra_css'][-2:], ['https://example.org/a/b/c.css', 'more.css'])
+
     def test_extra_context(self):
         cfg = load_config(extra={'a': 1})
         context = build.get_context(mock.Mock(), mock.Mock(), cfg)
@@ -220,28 +255,26 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
 
     # Test build._build_theme_template
 
-    @mock.patch('mkdocs.utils.write_file')
-    @mock.patch('mkdocs.commands.build._build_template', return_value='some content')
-    def test_build_theme_template(self, mock_build_template, mock_write_file):
+    @mock.patch('mkdocs.commands.build._write_output')
+    @mock.patch('mkdocs.commands.build._generate_template', return_value=iter(['some content']))
+    def test_build_theme_template(self, mock_generate_template, mock_write_output):
         cfg = load_config()
         env = cfg.theme.get_env()
         build._build_theme_template('main.html', env, Files([]), cfg, mock.Mock())
-        mock_write_file.assert_called_once()
-        mock_build_template.assert_called_once()
+        mock_write_output.assert_called_once()
+        mock_generate_template.assert_called_once()
 
-    @mock.patch('mkdocs.utils.write_file')
-    @mock.patch('mkdocs.commands.build._build_template', return_value='some content')
-    @mock.patch('gzip.GzipFile')
+    @mock.patch('mkdocs.commands.build._generate_template', return_value=iter(['some ', 'content']))
     @tempdir()
-    def test_build_sitemap_template(
-        self, site_dir, mock_gzip_gzipfile, mock_build_template, mock_write_file
-    ):
+    def test_build_sitemap_template(self, site_dir, mock_generate_template):
         cfg = load_config(site_dir=site_dir)
         env = cfg.theme.get_env()
         build._build_theme_template('sitemap.xml', env, Files([]), cfg, mock.Mock())
-        mock_write_file.assert_called_once()
-        mock_build_template.assert_called_once()
-        mock_gzip_gzipfile.assert_called_once()
+        mock_generate_template.assert_called_once()
+        self.assertEqual(Path(site_dir, 'sitemap.xml').read_text(), 'some content')
+        self.assertEqual(
+            gzip.decompress(Path(site_dir, 'sitemap.xml.gz').read_bytes()), b'some content'
+        )
 
     @mock.patch('mkdocs.utils.write_file')
     @mock.patch('mkdocs.commands.build._build_template', return_value='')
@@ -257,10 +290,10 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         mock_write_file.assert_not_called()
         mock_build_template.assert_not_called()
 
-    @mock.patch('mkdocs.utils.write_file')
-    @mock.patch('mkdocs.commands.build._build_template', return_value='')
-    def test_skip_theme_template_empty_output(self, mock_build_template, mock_write_file):
-        cfg = load_config()
+    @mock.patch('mkdocs.commands.build._generate_template', return_value=iter(['', ' \n']))
+    @tempdir()
+    def test_skip_theme_template_empty_output(self, site_dir, mock_generate_template):
+        cfg = load_config(site_dir=site_dir)
         env = cfg.theme.get_env()
         with self.assertLogs('mkdocs') as cm:
             build._build_theme_template('main.html', env, Files([]), cfg, mock.Mock())
@@ -268,8 +301,8 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
             '\n'.join(cm.output),
             "INFO:mkdocs.commands.build:Template skipped: 'main.html' generated empty output.",
         )
-        mock_write_file.assert_not_called()
-        mock_build_template.assert_called_once()
+        self.assertPathNotExists(site_dir, 'main.html')
+        mock_generate_template.assert_called_once()
 
     # Test build._build_extra_template
 
@@ -402,8 +435,8 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         self.assertPathIsFile(site_dir, 'index.html')
 
     @tempdir()
-    @mock.patch('jinja2.environment.Template.render', return_value='')
-    def test_build_page_empty(self, site_dir, render_mock):
+    @mock.patch('jinja2.environment.Template.generate', return_value=iter(['']))
+    def test_build_page_empty(self, site_dir, generate_mock):
         cfg = load_config(site_dir=site_dir, nav=['index.md'])
         fs = [File('index.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)]
         files = Files(fs)
@@ -417,11 +450,11 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
             "INFO:mkdocs.commands.build:Page skipped: 'index.md'. Generated empty output.",
         )
         self.assertPathNotExists(site_dir, 'index.html')
-        render_mock.assert_called_once()
+        generate_mock.assert_called_once()
 
     @tempdir(files={'index.md': 'page content'})
     @tempdir(files={'index.html': '<p>page content</p>'})
-    @mock.patch('mkdocs.utils.write_file')
+    @mock.patch('mkdocs.commands.build._write_page')
     def test_build_page_dirty_modified(self, site_dir, docs_dir, mock_write_file):
         cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, nav=['index.md'])
         fs = [File('index.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)]
@@ -438,7 +471,7 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         mock_write_file.assert_not_called()
 
     @tempdir(files={'testing.html': '<p>page content</p>'})
-    @mock.patch('mkdocs.utils.write_file')
+    @mock.patch('mkdocs.commands.build._write_page')
     def test_build_page_dirty_not_modified(self, site_dir, mock_write_file):
         cfg = load_config(site_dir=site_dir, nav=['testing.md'])
         fs = [File('testing.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)]
@@ -470,8 +503,8 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         self.assertPathIsFile(site_dir, 'index.html')
 
     @tempdir()
-    @mock.patch('mkdocs.utils.write_file', side_effect=OSError('Error message.'))
-    def test_build_page_error(self, site_dir, mock_write_file):
+    @mock.patch('mkdocs.commands.build._write_output', side_effect=OSError('Error message.'))
+    def test_build_page_error(self, site_dir, mock_write_output):
         cfg = load_config(site_dir=site_dir, nav=['index.md'])
         fs = [File('index.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)]
         files = Files(fs)
@@ -488,7 +521,7 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
             '\n'.join(cm.output),
             "ERROR:mkdocs.commands.build:Error building page 'index.md': Error message.",
         )
-        mock_write_file.assert_called_once()
+        mock_write_output.assert_called_once()
 
     @tempdir()
     def test_build_page_plugin_error(self, site_dir):
@@ -922,6 +955,615 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
                 self.assertTrue(main_path.is_file())
                 self.assertIn(textwrap.dedent(expected), main_path.read_text())
 
+    @tempdir(files={f'page{i}.md': f'# Page {i}' for i in range(4)})
+    @tempdir()
+    def test_build_streams_output(self, site_dir, docs_dir):
+        events = []
+
+        class _Plugin(BasePlugin):
+            supports_parallel_build = True
+
+            @event_requires_output(False)
+            def on_post_page(self, output, page, **kwargs):
+                events.append((output, page.file.src_uri, page.active))
+                return 'ignored'
+
+        for jobs in 1, 3:
+            with self.subTest(jobs=jobs):
+                events.clear()
+                cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, jobs=jobs)
+                cfg.plugins['streaming'] = _Plugin()
+                with mock.patch.object(
+                    jinja2.Template, 'render', autospec=True, side_effect=jinja2.Template.render
+                ) as mock_render:
+                    build.build(cfg)
+                # Only the static templates, such as 404.html and sitemap.xml, are fully rendered.
+                self.assertNotIn(
+                    'main.html', [call.args[0].name for call in mock_render.mock_calls]
+                )
+                self.assertEqual(events, [('', f'page{i}.md', True) for i in range(4)])
+                output = Path(site_dir, 'page1', 'index.html').read_text()
+                self.assertIn('<h1 id="page-1">Page 1</h1>', output)
+                self.assertTrue(output.rstrip().endswith('</html>'))
+
+    @tempdir()
+    def test_write_output_removes_partial_file(self, site_dir):
+        def generate():
+            yield '<p>partial</p>'
+            raise ValueError('Template error.')
+
+        with self.assertRaises(ValueError):
+            build._write_output(generate(), os.path.join(site_dir, 'foo', 'index.html'))
+        self.assertPathNotExists(site_dir, 'foo', 'index.html')
+        self.assertEqual(os.listdir(os.path.join(site_dir, 'foo')), [])
+
+        # The output of a previous build is kept.
+        Path(site_dir, 'foo', 'index.html').write_text('<p>previous</p>')
+        with self.assertRaises(ValueError):
+            build._write_output(generate(), os.path.join(site_dir, 'foo', 'index.html'))
+        self.assertEqual(os.listdir(os.path.join(site_dir, 'foo')), ['index.html'])
+        self.assertEqual(Path(site_dir, 'foo', 'index.html').read_text(), '<p>previous</p>')
+        self.assertTrue(build._write_output(['', '<p>ok</p>'], os.path.join(site_dir, 'ok.html')))
+        self.assertFalse(build._write_output([' ', '\n'], os.path.join(site_dir, 'empty.html')))
+        self.assertPathNotExists(site_dir, 'empty.html')
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\n[foo](foo.md#page1-heading)',
+            'foo.md': '## page1 heading\n\n[bar](test/bar.md#nope)',
+            'test/bar.md': '# Bar\n\n[aaa](#a)',
+            'test/baz.md': 'baz',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    def test_parallel_build_matches_serial_build(self, serial_dir, parallel_dir, docs_dir):
+        if not build._can_fork_workers()[0]:
+            self.skipTest("Worker processes can't be used here.")
+
+        expected_logs = '''
+            WARNING:Doc file 'foo.md' contains a link 'test/bar.md#nope', but the doc 'test/bar.md' does not contain an anchor '#nope'.
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+        '''
+        for site_dir, jobs in (serial_dir, 1), (parallel_dir, 2):
+            with self.subTest(jobs=jobs):
+                cfg = load_config(
+                    docs_dir=docs_dir,
+                    site_dir=site_dir,
+                    jobs=jobs,
+                    validation={'anchors': 'warn'},
+                )
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg)
+
+        def read_output(site_dir, path):
+            return re.sub(r'Build Date UTC : .+', '', Path(site_dir, path).read_text())
+
+        for path in 'index.html', 'foo/index.html', 'test/bar/index.html', 'test/baz/index.html':
+            with self.subTest(path=path):
+                self.assertEqual(read_output(serial_dir, path), read_output(parallel_dir, path))
+
+    @tempdir(files={'foo.md': 'page1 content', 'bar.md': 'page2 content'})
+    @tempdir()
+    def test_parallel_build_unsupported_plugin(self, site_dir, docs_dir):
+        if not build._can_fork_workers()[0]:
+            self.skipTest("Worker processes can't be used here.")
+
+        class _UnsupportedPlugin(BasePlugin):
+            def on_page_markdown(self, markdown, **kwargs):
+                return markdown + '\n\nappended'
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, jobs=2)
+        cfg.plugins['unsupported'] = _UnsupportedPlugin()
+
+        expected_logs = '''
+            INFO:Rendering pages serially, because these plugins don't declare `supports_parallel_build`: unsupported
+        '''
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg)
+        self.assertIn('appended', Path(site_dir, 'foo', 'index.html').read_text())
+
+    @tempdir(files={'foo.md': 'page1 content', 'bar.md': 'page2 content'})
+    @tempdir()
+    def test_parallel_build_with_other_threads(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, jobs=2)
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with mock.patch.object(build.sys, 'platform', 'linux'), mock.patch.object(
+                build.multiprocessing, 'get_all_start_methods', return_value=['fork', 'spawn']
+            ):
+                expected_logs = '''
+                    INFO:Rendering pages serially, because other threads are running.
+                '''
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertPathIsFile(site_dir, 'foo', 'index.html')
+
+    @tempdir(files={f'page{i}.md': f'# Page {i}' for i in range(6)})
+    @tempdir()
+    def test_parallel_build_event_stats(self, site_dir, docs_dir):
+        if not build._can_fork_workers()[0]:
+            self.skipTest("Worker processes can't be used here.")
+
+        class _Plugin(BasePlugin):
+            supports_parallel_build = True
+
+            def on_page_markdown(self, markdown, **kwargs):
+                return markdown
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, jobs=3)
+        cfg.plugins['counted'] = _Plugin()
+        build.build(cfg)
+        # The events that ran in worker processes are counted too.
+        self.assertEqual(cfg.plugins.event_stats['counted', 'page_markdown'].calls, 6)
+
+    @tempdir(files={f'page{i}.md': f'# Page {i}' for i in range(6)})
+    @tempdir()
+    def test_parallel_build_page_events_order(self, site_dir, docs_dir):
+        events = []
+
+        class _RecordingPlugin(BasePlugin):
+            supports_parallel_build = True
+
+            def on_page_context(self, context, page, **kwargs):
+                events.append(('page_context', page.file.src_uri, page.active))
+                return context
+
+            def on_post_page(self, output, page, **kwargs):
+                events.append(('post_page', page.file.src_uri, page.active))
+                return output.replace('</body>', '<p>post_page</p></body>')
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, jobs=3)
+        cfg.plugins['recording'] = _RecordingPlugin()
+        build.build(cfg)
+
+        src_uris = [f'page{i}.md' for i in range(6)]
+        for event_name in 'page_context', 'post_page':
+            with self.subTest(event_name=event_name):
+                self.assertEqual(
+                    [(uri, active) for name, uri, active in events if name == event_name],
+                    [(uri, True) for uri in src_uris],
+                )
+        for i in range(6):
+            output = Path(site_dir, f'page{i}', 'index.html').read_text()
+            self.assertIn(f'<h1 id="page-{i}">Page {i}</h1>', output)
+            self.assertIn('<p>post_page</p>', output)
+            self.assertIn(
+                f'<a href="./" class="nav-link active" aria-current="page">Page {i}', output
+            )
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\n[foo](foo.md#page1-heading)',
+            'foo.md': '## page1 heading\n\n[bar](test/bar.md#nope)',
+            'test/bar.md': '# Bar\n\n[aaa](#a)',
+            'test/baz.md': 'baz',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    def test_low_memory_build_matches_regular_build(self, regular_dir, low_memory_dir, docs_dir):
+        expected_logs = '''
+            WARNING:Doc file 'foo.md' contains a link 'test/bar.md#nope', but the doc 'test/bar.md' does not contain an anchor '#nope'.
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+        '''
+        contexts = []
+
+        class _Plugin(BasePlugin):
+            supports_parallel_build = True
+
+            def on_page_context(self, context, page, **kwargs):
+                contexts.append((page, page.markdown, page.content))
+                return context
+
+        def read_output(site_dir, path):
+            return re.sub(r'Build Date UTC : .+', '', Path(site_dir, path).read_text())
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=regular_dir, validation={'anchors': 'warn'})
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg)
+
+        all_jobs = [1, 2] if build._can_fork_workers()[0] else [1]
+        for jobs in all_jobs:
+            with self.subTest(jobs=jobs):
+                contexts.clear()
+                cfg = load_config(
+                    docs_dir=docs_dir,
+                    site_dir=low_memory_dir,
+                    jobs=jobs,
+                    low_memory=True,
+                    validation={'anchors': 'warn'},
+                )
+                cfg.plugins['recording'] = _Plugin()
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg)
+
+                # The content of each page is available while it's being built.
+                self.assertEqual(len(contexts), 4)
+                for page, markdown_source, content in contexts:
+                    self.assertIsNotNone(markdown_source, page.file.src_uri)
+                    self.assertIn('<', content, page.file.src_uri)
+                for path in 'index.html', 'foo/index.html', 'test/bar/index.html':
+                    self.assertEqual(
+                        read_output(regular_dir, path), read_output(low_memory_dir, path)
+                    )
+                # Only the summary of each page is kept after it's written.
+                page = contexts[2][0]
+                self.assertEqual((page.markdown, page.content), (None, None))
+                self.assertEqual(page.title, 'Bar')
+                self.assertEqual(page.present_anchor_ids, {'bar'})
+                self.assertEqual([item.title for item in page.toc], ['Bar'])
+
+    @tempdir(
+        files={
+            'foo.md': '# Foo\n\n## Heading\n\n[bar](bar.md#nope)',
+            'bar.md': '# Bar\n\n[missing](missing.md)',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    def test_render_cache(self, cache_dir, site_dir, docs_dir):
+        def do_build(expected_logs):
+            cfg = load_config(
+                docs_dir=docs_dir,
+                site_dir=site_dir,
+                cache_dir=cache_dir,
+                validation={'anchors': 'warn'},
+            )
+            with mock.patch.object(
+                markdown.Markdown, 'convert', autospec=True, side_effect=markdown.Markdown.convert
+            ) as mock_convert:
+                with self._assert_build_logs(expected_logs):
+                    build.build(cfg)
+            # Return the first line of each page that was rendered.
+            return [call.args[1].partition('\n')[0] for call in mock_convert.call_args_list]
+
+        expected_logs = '''
+            WARNING:Doc file 'bar.md' contains a link 'missing.md', but the target is not found among documentation files.
+            WARNING:Doc file 'foo.md' contains a link 'bar.md#nope', but the doc 'bar.md' does not contain an anchor '#nope'.
+        '''
+        self.assertEqual(do_build(expected_logs), ['# Bar', '# Foo'])
+        foo_output = Path(site_dir, 'foo', 'index.html').read_text()
+        self.assertIn('<h2 id="heading">Heading</h2>', foo_output)
+
+        # Nothing is rendered again, and the warnings are still reported.
+        self.assertEqual(do_build(expected_logs), [])
+        self.assertEqual(
+            re.sub(r'Build Date UTC : .+', '', Path(site_dir, 'foo', 'index.html').read_text()),
+            re.sub(r'Build Date UTC : .+', '', foo_output),
+        )
+
+        # A page is rendered again when the target of one of its links changes.
+        Path(docs_dir, 'missing.md').write_text('# Missing')
+        expected_logs = '''
+            WARNING:Doc file 'foo.md' contains a link 'bar.md#nope', but the doc 'bar.md' does not contain an anchor '#nope'.
+        '''
+        self.assertEqual(do_build(expected_logs), ['# Bar', '# Missing'])
+
+    @tempdir(files={'index.md': '# Home\n\n*[HTML]: Hyper Text Markup Language\n\nHTML'})
+    @tempdir()
+    @tempdir()
+    def test_render_cache_extension_instance(self, cache_dir, site_dir, docs_dir):
+        def do_build(title):
+            cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, cache_dir=cache_dir)
+            # Plugins can add instances of extensions to the validated config.
+            cfg.markdown_extensions.append(
+                markdown.extensions.abbr.AbbrExtension(glossary=dict(Home=title))
+            )
+            with mock.patch.object(
+                markdown.Markdown, 'convert', autospec=True, side_effect=markdown.Markdown.convert
+            ) as mock_convert:
+                build.build(cfg)
+            return mock_convert.call_count
+
+        self.assertEqual(do_build('Homepage'), 1)
+        self.assertIn(
+            '<abbr title="Hyper Text Markup Language">HTML</abbr>',
+            Path(site_dir, 'index.html').read_text(),
+        )
+        self.assertEqual(do_build('Homepage'), 0)
+        # The config of the extension is part of the key.
+        self.assertEqual(do_build('Start'), 1)
+        self.assertIn('<abbr title="Start">Home</abbr>', Path(site_dir, 'index.html').read_text())
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\nSee [foo](foo.md).',
+            'foo.md': '# Foo\n\nfoo content',
+            'bar.md': '# Bar\n\nbar content',
+        }
+    )
+    @tempdir()
+    def test_dirty_build(self, site_dir, docs_dir):
+        def do_build(**kwargs):
+            cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, **kwargs)
+            with mock.patch.object(build, '_write_page', wraps=build._write_page) as mock_write:
+                build.build(cfg, dirty=True)
+            return sorted(call.args[0].file.src_uri for call in mock_write.call_args_list)
+
+        self.assertEqual(do_build(), ['bar.md', 'foo.md', 'index.md'])
+        self.assertPathNotExists(site_dir, '.mkdocs-build-state.json')
+        state_path = build._BuildState.get_path(load_config(site_dir=site_dir))
+        self.addCleanup(lambda: Path(state_path).unlink(missing_ok=True))
+        self.assertPathIsFile(state_path)
+        # Nothing has changed.
+        self.assertEqual(do_build(), [])
+        # Settings that don't affect the output don't affect the pages either.
+        self.assertEqual(do_build(jobs=2, low_memory=True), [])
+
+        # Only the page with changed content is written.
+        Path(docs_dir, 'bar.md').write_text('# Bar\n\nnew bar content')
+        self.assertEqual(do_build(), ['bar.md'])
+        self.assertIn('new bar content', Path(site_dir, 'bar', 'index.html').read_text())
+
+        # A changed title affects the navigation of all pages.
+        Path(docs_dir, 'foo.md').write_text('# New Foo\n\nfoo content')
+        self.assertEqual(do_build(), ['bar.md', 'foo.md', 'index.md'])
+
+        # A changed config option affects all pages.
+        self.assertEqual(do_build(site_name='Other'), ['bar.md', 'foo.md', 'index.md'])
+
+        # A deleted output file is written again.
+        Path(site_dir, 'bar', 'index.html').unlink()
+        self.assertEqual(do_build(site_name='Other'), ['bar.md'])
+
+        # The output of a deleted page is removed, and the link to it changes.
+        Path(docs_dir, 'foo.md').unlink()
+        with self.assertLogs('mkdocs', level='WARNING'):
+            self.assertEqual(do_build(site_name='Other'), ['bar.md', 'index.md'])
+        self.assertPathNotExists(site_dir, 'foo', 'index.html')
+        self.assertPathNotExists(site_dir, 'foo')
+        self.assertPathIsFile(site_dir, 'bar', 'index.html')
+
+        # A clean build removes the state, so the next dirty build writes all pages.
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, site_name='Other')
+        with self.assertLogs('mkdocs', level='WARNING'):
+            build.build(cfg)
+        self.assertPathNotExists(state_path)
+        with self.assertLogs('mkdocs', level='WARNING'):
+            self.assertEqual(do_build(site_name='Other'), ['bar.md', 'index.md'])
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir(
+        files={
+            'main.html': '{% extends "base.html" %}',
+            'base.html': "v1 {{ page.content }}{{ nav.items[0]|nav_fragment('nav.html') }}",
+            'nav.html': '',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    def test_dirty_build_template_change(self, cache_dir, site_dir, theme_dir, docs_dir):
+        def do_build(dirty=True):
+            cfg = load_config(
+                docs_dir=docs_dir,
+                site_dir=site_dir,
+                cache_dir=cache_dir,
+                theme={'name': None, 'custom_dir': theme_dir},
+            )
+            with mock.patch.object(build, '_write_page', wraps=build._write_page) as mock_write:
+                build.build(cfg, dirty=dirty)
+            return sorted(call.args[0].file.src_uri for call in mock_write.call_args_list)
+
+        # A clean build records the state too, when there's a `cache_dir`.
+        self.assertEqual(do_build(dirty=False), ['foo.md', 'index.md'])
+        self.assertPathNotExists(site_dir, '.mkdocs-build-state.json')
+        self.assertEqual(do_build(), [])
+
+        # A change in a template that the page template extends.
+        Path(theme_dir, 'base.html').write_text(
+            "v2 {{ page.content }}{{ nav.items[0]|nav_fragment('nav.html') }}"
+        )
+        self.assertEqual(do_build(), ['foo.md', 'index.md'])
+        self.assertEqual(
+            Path(site_dir, 'foo', 'index.html').read_text(), 'v2 <h1 id="foo">Foo</h1>'
+        )
+
+        # A change in a template that is rendered through `nav_fragment`.
+        Path(theme_dir, 'nav.html').write_text(' {{ nav_item.title }}')
+        self.assertEqual(do_build(), ['foo.md', 'index.md'])
+        self.assertEqual(
+            Path(site_dir, 'foo', 'index.html').read_text(), 'v2 <h1 id="foo">Foo</h1> Home'
+        )
+
+    @tempdir(
+        files={'index.md': '# Home', 'foo.md': '# Foo', 'bar.md': '# Bar', 'snippet.txt': 'text'}
+    )
+    @tempdir()
+    def test_serve_session(self, site_dir, docs_dir):
+        session = build._ServeSession()
+
+        def do_build(*changed_paths):
+            session.changed_paths = [os.path.join(docs_dir, p) for p in changed_paths] or None
+            cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+            with mock.patch.object(
+                markdown.Markdown, 'convert', autospec=True, side_effect=markdown.Markdown.convert
+            ) as mock_convert, mock.patch.object(
+                build, '_write_page', wraps=build._write_page
+            ) as mock_write:
+                build.build(cfg, serve_url='http://localhost:8000/', session=session)
+            return (
+                [call.args[1] for call in mock_convert.call_args_list],
+                sorted(call.args[0].file.src_uri for call in mock_write.call_args_list),
+            )
+
+        all_pages = ['bar.md', 'foo.md', 'index.md']
+        self.assertEqual(do_build(), (['# Home', '# Bar', '# Foo'], all_pages))
+
+        # Only the changed page is rendered and written.
+        Path(docs_dir, 'foo.md').write_text('# Foo\n\nmore')
+        self.assertEqual(do_build('foo.md'), (['# Foo\n\nmore'], ['foo.md']))
+        self.assertIn('more', Path(site_dir, 'foo', 'index.html').read_text())
+
+        # A changed title affects the navigation of all pages.
+        Path(docs_dir, 'bar.md').write_text('# Baz')
+        self.assertEqual(do_build('bar.md'), (['# Baz'], all_pages))
+
+        # Pages could include a file that isn't a page, so everything is built again.
+        Path(docs_dir, 'snippet.txt').write_text('new text')
+        converted, written = do_build('snippet.txt')
+        self.assertEqual(len(converted), 3)
+        self.assertEqual(written, all_pages)
+
+        # When a file is added, everything is built again.
+        Path(docs_dir, 'new.md').write_text('# New')
+        converted, written = do_build('new.md')
+        self.assertEqual(len(converted), 4)
+        self.assertEqual(written, ['bar.md', 'foo.md', 'index.md', 'new.md'])
+
+    @tempdir(files={'index.md': '# Home\n\n--8<-- "foo.md"', 'foo.md': '# Foo'})
+    @tempdir()
+    def test_serve_session_include_extension(self, site_dir, docs_dir):
+        session = build._ServeSession()
+
+        def do_build(*changed_paths):
+            session.changed_paths = [os.path.join(docs_dir, p) for p in changed_paths] or None
+            cfg = load_config(
+                docs_dir=docs_dir,
+                site_dir=site_dir,
+                markdown_extensions=['toc', {'mkdocs.tests.build_tests': {'base_path': docs_dir}}],
+            )
+            with mock.patch.object(
+                build, '_write_page', wraps=build._write_page
+            ) as mock_write, mock.patch.object(
+                build, '_list_docs_dir', wraps=build._list_docs_dir
+            ) as mock_list:
+                build.build(cfg, serve_url='http://localhost:8000/', session=session)
+            return (
+                mock_list.call_count,
+                sorted(call.args[0].file.src_uri for call in mock_write.call_args_list),
+            )
+
+        self.assertEqual(do_build(), (1, ['foo.md', 'index.md']))
+
+        # The page that includes the changed page is rendered again, the listing is reused.
+        Path(docs_dir, 'foo.md').write_text('# Foo\n\nmore')
+        self.assertEqual(do_build('foo.md'), (0, ['foo.md', 'index.md']))
+        self.assertIn('more', Path(site_dir, 'index.html').read_text())
+
+    @tempdir(
+        files={
+            'index.md': '# Home',
+            'foo.md': '---\ntitle: Foo title\n---\n\nfoo',
+            'bar.md': '# Bar',
+            'baz.md': '# Baz',
+        }
+    )
+    @tempdir()
+    def test_serve_session_lazy(self, site_dir, docs_dir):
+        session = build._ServeSession(lazy=True)
+        session.render_in_background = False
+        cfg = load_config(
+            docs_dir=docs_dir, site_dir=site_dir, nav=['index.md', 'foo.md', 'bar.md', 'baz.md']
+        )
+        with mock.patch.object(build, '_write_page', wraps=build._write_page) as mock_write:
+            build.build(cfg, serve_url='http://localhost:8000/', session=session)
+            self.assertEqual(mock_write.call_count, 0)
+            self.assertPathNotExists(site_dir, 'foo', 'index.html')
+
+            # The pages aren't rendered until the site is served.
+            self.assertIsNone(session.lazy_pages)
+            session.publish_lazy_pages()
+            lazy_pages = session.lazy_pages
+            assert lazy_pages is not None
+            self.assertEqual(len(lazy_pages), 4)
+            # The titles are known without rendering the pages.
+            self.assertEqual(
+                [item.title for item in lazy_pages.nav], ['Home', 'Foo title', 'Bar', 'Baz']
+            )
+
+            session.prepare_file(os.path.join(site_dir, 'foo', 'index.html'))
+            self.assertEqual(
+                [call.args[0].file.src_uri for call in mock_write.call_args_list], ['foo.md']
+            )
+            self.assertPathIsFile(site_dir, 'foo', 'index.html')
+            self.assertIn('Bar', Path(site_dir, 'foo', 'index.html').read_text())
+
+            # A page is only rendered once.
+            session.prepare_file(os.path.join(site_dir, 'foo', 'index.html'))
+            session.prepare_file(os.path.join(site_dir, 'sitemap.xml'))
+            self.assertEqual(mock_write.call_count, 1)
+            self.assertEqual(len(lazy_pages), 3)
+
+            # The neighbors of the requested page are rendered first in the background.
+            lazy_pages.start()
+            deadline = time.monotonic() + 10
+            while len(lazy_pages) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            session.stop_lazy_pages()
+            self.assertEqual(
+                [call.args[0].file.src_uri for call in mock_write.call_args_list],
+                ['foo.md', 'bar.md', 'index.md', 'baz.md'],
+            )
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo\n\n## Sub', 'bar.md': '# Bar'})
+    @tempdir(
+        files={
+            'main.html': "{% for nav_item in nav %}{{ nav_item|nav_fragment('nav.html') }}{% endfor %}",
+            'nav.html': '({{ nav_item.title }}{% for item in nav_item.toc %} {{ item.title }}{% endfor %})',
+        }
+    )
+    @tempdir()
+    def test_serve_session_lazy_nav_fragment(self, site_dir, theme_dir, docs_dir):
+        session = build._ServeSession(lazy=True)
+        session.render_in_background = False
+        cfg = load_config(
+            docs_dir=docs_dir,
+            site_dir=site_dir,
+            use_directory_urls=False,
+            nav=['index.md', 'foo.md', 'bar.md'],
+            theme={'name': None, 'custom_dir': theme_dir},
+        )
+        build.build(cfg, serve_url='http://localhost:8000/', session=session)
+        session.publish_lazy_pages()
+        session.prepare_file(os.path.join(site_dir, 'bar.html'))
+        self.assertEqual(Path(site_dir, 'bar.html').read_text(), '(Home)(Foo)(Bar Bar)')
+        # The table of contents of a page is known once it's rendered.
+        session.prepare_file(os.path.join(site_dir, 'foo.html'))
+        session.prepare_file(os.path.join(site_dir, 'index.html'))
+        self.assertEqual(Path(site_dir, 'index.html').read_text(), '(Home Home)(Foo Foo)(Bar Bar)')
+        session.stop_lazy_pages()
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir()
+    def test_serve_session_lazy_rebuild(self, site_dir, docs_dir):
+        session = build._ServeSession(lazy=True)
+        session.render_in_background = False
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        build.build(cfg, serve_url='http://localhost:8000/', session=session)
+        session.publish_lazy_pages()
+        old_pages = session.lazy_pages
+        assert old_pages is not None
+
+        def on_pre_build(config):
+            # The pages of the site being served can't be rendered while the site is rebuilt.
+            self.assertTrue(session.build_lock.locked())
+            self.assertIs(session.lazy_pages, old_pages)
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        cfg.plugins.events['pre_build'].append(on_pre_build)
+        build.build(cfg, serve_url='http://localhost:8000/', session=session)
+        self.assertFalse(session.build_lock.locked())
+        new_pages = session.next_lazy_pages
+        assert new_pages is not None
+
+        # The site is still served until the new one is published, so its pages are rendered.
+        session.prepare_file(os.path.join(site_dir, 'foo', 'index.html'))
+        self.assertPathIsFile(site_dir, 'foo', 'index.html')
+        self.assertEqual(len(old_pages), 1)
+
+        session.publish_lazy_pages()
+        self.assertIs(session.lazy_pages, new_pages)
+        old_pages.prepare_file(os.path.join(site_dir, 'index.html'))
+        self.assertEqual(len(old_pages), 1)
+        self.assertEqual(len(new_pages), 2)
+        session.stop_lazy_pages()
+
     # Test build.site_directory_contains_stale_files
 
     @tempdir(files=['index.html'])
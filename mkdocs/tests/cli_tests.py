@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 
 import io
+import json
 import logging
+import os
 import unittest
 from unittest import mock
 
@@ -9,6 +11,7 @@ import pytest
 from click.testing import CliRunner
 
 from mkdocs import __main__ as cli
+from mkdocs.utils import memory, profiling
 
 
 class CLITests(unittest.TestCase):
@@ -32,6 +35,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -67,6 +73,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -86,6 +95,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -107,6 +119,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -128,6 +143,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=True,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -149,6 +167,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=False,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -168,6 +189,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -187,6 +211,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -206,6 +233,9 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=False,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
         )
 
     @pytest.mark.skip()
@@ -225,6 +255,31 @@ class CLITests(unittest.TestCase):
             use_directory_urls=None,
             watch_theme=True,
             watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=False,
+        )
+
+    @pytest.mark.skip()
+    @mock.patch('mkdocs.commands.serve.serve', autospec=True)
+    def test_serve_lazy(self, mock_serve):
+        result = self.runner.invoke(cli.cli, ["serve", '--lazy'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        mock_serve.assert_called_once_with(
+            dev_addr=None,
+            open_in_browser=False,
+            livereload=True,
+            build_type=None,
+            config_file=None,
+            strict=None,
+            theme=None,
+            use_directory_urls=None,
+            watch_theme=False,
+            watch=(),
+            jobs=None,
+            no_cache=False,
+            lazy=True,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -243,6 +298,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             site_dir=None,
+            jobs=None,
         )
         for log_name in 'mkdocs', 'mkdocs.structure.pages', 'mkdocs.plugins.foo':
             self.assertEqual(logging.getLogger(log_name).getEffectiveLevel(), logging.INFO)
@@ -297,6 +353,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             site_dir=None,
+            jobs=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -314,6 +371,7 @@ class CLITests(unittest.TestCase):
             theme='readthedocs',
             use_directory_urls=None,
             site_dir=None,
+            jobs=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -331,6 +389,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=True,
             site_dir=None,
+            jobs=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -348,6 +407,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=False,
             site_dir=None,
+            jobs=None,
         )
 
     @mock.patch('mkdocs.config.load_config', autospec=True)
@@ -365,8 +425,77 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             site_dir='custom',
+            jobs=None,
         )
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_no_cache(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--no-cache'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        mock_load_config.assert_called_once_with(
+            config_file=None,
+            strict=None,
+            theme=None,
+            use_directory_urls=None,
+            site_dir=None,
+            jobs=None,
+        )
+        self.assertIsNone(mock_load_config.return_value.cache_dir)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_trace(self, mock_build, mock_load_config):
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(
+                cli.cli, ['build', '--trace', 'trace.json'], catch_exceptions=False
+            )
+
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(mock_build.call_count, 1)
+            with open('trace.json') as f:
+                events = json.load(f)['traceEvents']
+        self.assertIn('load_config', [event['name'] for event in events])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_profile_pages(self, mock_build, mock_load_config):
+        def build(cfg, **kwargs):
+            self.assertIsNotNone(profiling.PageProfiler.active)
+            with profiling.profile_page('index.md'):
+                pass
+
+        mock_build.side_effect = build
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(
+                cli.cli, ['build', '--profile-pages', 'pages.prof'], catch_exceptions=False
+            )
+
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(mock_build.call_count, 1)
+            self.assertTrue(os.path.isfile('pages.prof'))
+        self.assertIsNone(profiling.PageProfiler.active)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_memory_report(self, mock_build, mock_load_config):
+        def build(cfg, **kwargs):
+            with memory.phase('foo'):
+                pass
+
+        mock_build.side_effect = build
+        with self.assertLogs('mkdocs.utils.memory') as cm:
+            result = self.runner.invoke(
+                cli.cli, ['build', '--memory-report'], catch_exceptions=False
+            )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertRegex(cm.output[0], r'\nfoo +\d')
+        self.assertIsNone(memory.MemoryReport.active)
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_verbose(self, mock_build, mock_load_config):
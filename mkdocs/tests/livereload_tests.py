@@ -2,6 +2,8 @@
 
 import contextlib
 import email
+import gzip
+import http.client
 import io
 import sys
 import threading
@@ -10,6 +12,8 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
+from watchdog.observers.polling import PollingObserver
+
 from mkdocs.livereload import LiveReloadServer
 from mkdocs.tests.base import change_dir, tempdir
 
@@ -28,7 +32,9 @@ class FakeRequest:
 
 
 @contextlib.contextmanager
-def testing_server(root, builder=lambda: None, mount_path="/"):
+def testing_server(
+    root, builder=lambda: None, mount_path="/", watch_method="polling", build_root=None
+):
     """Create the server and start most of its parts, but don't listen on a socket."""
     with mock.patch("socket.socket"):
         server = LiveReloadServer(
@@ -38,11 +44,13 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
             root=root,
             mount_path=mount_path,
             polling_interval=0.2,
+            watch_method=watch_method,
+            build_root=build_root,
         )
         server.server_name = "localhost"
         server.server_port = 0
         server.setup_environ()
-    server.observer.start()
+    server._start_observer()
     thread = threading.Thread(target=server._build_loop, daemon=True)
     thread.start()
     yield server
@@ -50,8 +58,41 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
     thread.join()
 
 
-def do_request(server, content):
-    request = FakeRequest(content + " HTTP/1.1")
+@contextlib.contextmanager
+def running_async_server(root, builder=lambda: None):
+    """Create the server in asyncio mode and run it on a random local port."""
+    server = LiveReloadServer(
+        builder,
+        host="127.0.0.1",
+        port=0,
+        root=root,
+        polling_interval=0.2,
+        watch_method="polling",
+        use_asyncio=True,
+    )
+    server.server_bind()
+    server.server_activate()
+    server._start_observer()
+    server.serve_thread.start()
+    thread = threading.Thread(target=server._build_loop, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown(wait=True)
+    thread.join()
+
+
+def do_async_request(server, path):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response, response.read().decode()
+
+
+def do_request(server, content, headers=None):
+    content += " HTTP/1.1\r\n"
+    for name, value in (headers or {}).items():
+        content += f"{name}: {value}\r\n"
+    request = FakeRequest(content + "\r\n")
     server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
     response = request.out_file.getvalue()
 
@@ -61,6 +102,8 @@ def do_request(server, content):
 
     headers = email.message_from_bytes(headers)
     headers["_status"] = status
+    if headers.get("content-encoding") == "gzip":
+        content = gzip.decompress(content)
     return headers, content.decode()
 
 
@@ -143,6 +186,143 @@ class BuildTests(unittest.TestCase):
             Path(site_dir, "aaa").rename(Path(site_dir, "bbb"))
             self.assertTrue(started_building.wait(timeout=10))
 
+    @tempdir({"foo.docs": "a", "bar.docs": "b"})
+    def test_rebuild_gets_changed_paths(self, docs_dir):
+        started_building = threading.Event()
+        changed_paths = []
+
+        def rebuild():
+            changed_paths.append(server.changed_paths)
+            started_building.set()
+
+        with testing_server(docs_dir, rebuild) as server:
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("c")
+            self.assertTrue(started_building.wait(timeout=10))
+
+        self.assertEqual(changed_paths, [{str(Path(docs_dir, "foo.docs"))}])
+        self.assertIsNone(server.changed_paths)
+
+    @tempdir({"foo.docs": "a"})
+    def test_rebuild_with_native_observer(self, docs_dir):
+        started_building = threading.Event()
+
+        with testing_server(docs_dir, started_building.set, watch_method="auto") as server:
+            self.assertNotIsInstance(server.observer, PollingObserver)
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertTrue(started_building.wait(timeout=10))
+            started_building.clear()
+
+            # Reading a file doesn't count as a change.
+            Path(docs_dir, "foo.docs").read_text()
+            self.assertFalse(started_building.wait(timeout=0.5))
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "requires inotify")
+    @tempdir({"foo.docs": "a"})
+    def test_native_observer_falls_back_to_polling(self, docs_dir):
+        started_building = threading.Event()
+
+        error = OSError(28, "inotify watch limit reached")
+        with mock.patch(
+            "watchdog.observers.inotify.InotifyEmitter.on_thread_start", side_effect=error
+        ):
+            with self.assertLogs("mkdocs.livereload") as cm:
+                with testing_server(docs_dir, started_building.set, watch_method="auto") as server:
+                    server.watch(docs_dir)
+                    self.assertIsInstance(server.observer, PollingObserver)
+
+                    Path(docs_dir, "foo.docs").write_text("b")
+                    self.assertTrue(started_building.wait(timeout=10))
+
+        self.assertRegex(
+            "\n".join(cm.output),
+            r"^WARNING:mkdocs.livereload:\[[0-9:]+\] Failed to watch files natively "
+            r"\(\[Errno 28\] inotify watch limit reached\), polling them for changes instead.",
+        )
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "requires inotify")
+    @tempdir({"foo.docs": "a"})
+    def test_native_observer_no_fallback(self, docs_dir):
+        error = OSError(28, "inotify watch limit reached")
+        with mock.patch(
+            "watchdog.observers.inotify.InotifyEmitter.on_thread_start", side_effect=error
+        ):
+            with testing_server(docs_dir, watch_method="native") as server:
+                with self.assertRaises(OSError):
+                    server.watch(docs_dir)
+
+    @tempdir({"foo.docs": "a"})
+    @tempdir({"foo.site": "original", "sub/bar.site": "bar"})
+    @tempdir()
+    def test_serves_previous_build_during_rebuild(self, build_dir, site_dir, docs_dir):
+        started_building = threading.Event()
+        finish_building = threading.Event()
+        finished_building = threading.Event()
+
+        def rebuild():
+            started_building.set()
+            self.assertTrue(finish_building.wait(timeout=10))
+            self.assertEqual(server.build_root, build_dir)
+            # The build directory starts as a copy of the served one.
+            self.assertEqual(Path(build_dir, "sub", "bar.site").read_text(), "bar")
+            Path(build_dir, "foo.site").write_text(Path(docs_dir, "foo.docs").read_text())
+            Path(build_dir, "sub", "bar.site").unlink()
+            finished_building.set()
+
+        published_roots = []
+
+        with testing_server(site_dir, rebuild, build_root=build_dir) as server:
+            server.publish_build = lambda: published_roots.append(server.root)
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertTrue(started_building.wait(timeout=10))
+
+            # Doesn't wait for the rebuild to finish.
+            _, output = do_request(server, "GET /foo.site")
+            self.assertEqual(output, "original")
+
+            finish_building.set()
+            self.assertTrue(finished_building.wait(timeout=10))
+            time.sleep(0.1)
+
+            _, output = do_request(server, "GET /foo.site")
+            self.assertEqual(output, "b")
+            self.assertEqual(server.root, build_dir)
+            self.assertEqual(server.build_root, site_dir)
+            # The rebuild is published together with the swap of the directories.
+            self.assertEqual(published_roots, [build_dir])
+            with self.assertLogs("mkdocs.livereload"):
+                _, output = do_request(server, "GET /sub/bar.site")
+            self.assertIn("404", output)
+
+    @tempdir({"foo.docs": "a"})
+    @tempdir({"foo.site": "original"})
+    @tempdir()
+    def test_rebuild_without_previous_build(self, build_dir, site_dir, docs_dir):
+        started_building = threading.Event()
+        reused = []
+
+        def rebuild():
+            reused.append(Path(build_dir, "foo.site").exists())
+            started_building.set()
+
+        with testing_server(site_dir, rebuild, build_root=build_dir) as server:
+            server.reuses_previous_build = lambda changed_paths: changed_paths is None
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertTrue(started_building.wait(timeout=10))
+            # The previous build isn't copied, the rebuild doesn't use it.
+            self.assertEqual(reused, [False])
+
     @tempdir()
     def test_rebuild_on_edit(self, site_dir):
         started_building = threading.Event()
@@ -332,6 +512,91 @@ class BuildTests(unittest.TestCase):
             _, output = do_request(server, "GET /multi_body.html")
             self.assertRegex(output, fr"^<body>foo</body><body>bar{SCRIPT_REGEX}</body>$")
 
+    @tempdir({"test.css": "div { color: red; }"})
+    def test_conditional_requests(self, site_dir):
+        with testing_server(site_dir) as server:
+            headers, _ = do_request(server, "GET /test.css")
+            etag, last_modified = headers["etag"], headers["last-modified"]
+            self.assertEqual(headers["cache-control"], "no-cache")
+
+            headers, output = do_request(server, "GET /test.css", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "304 Not Modified")
+            self.assertEqual(headers["etag"], etag)
+            self.assertEqual(output, "")
+
+            headers, _ = do_request(server, "GET /test.css", {"If-Modified-Since": last_modified})
+            self.assertEqual(headers["_status"], "304 Not Modified")
+
+            # If-None-Match takes precedence over If-Modified-Since.
+            headers, output = do_request(
+                server,
+                "GET /test.css",
+                {"If-None-Match": '"other"', "If-Modified-Since": last_modified},
+            )
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertEqual(output, "div { color: red; }")
+
+            Path(site_dir, "test.css").write_text("div { color: blue; }")
+            headers, output = do_request(server, "GET /test.css", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertNotEqual(headers["etag"], etag)
+            self.assertEqual(output, "div { color: blue; }")
+
+    @tempdir()
+    @tempdir({"foo.html": "<body>foo</body>"})
+    def test_conditional_requests_for_modified_html(self, site_dir, docs_dir):
+        with testing_server(site_dir) as server:
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            headers, first_output = do_request(server, "GET /foo.html")
+            etag = headers["etag"]
+            self.assertNotIn("last-modified", headers)
+
+            headers, _ = do_request(server, "GET /foo.html", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "304 Not Modified")
+            _, output = do_request(server, "GET /foo.html")
+            self.assertEqual(output, first_output)
+
+            # The injected script changes after a rebuild, even if the file didn't.
+            initial_epoch = server._visible_epoch
+            Path(docs_dir, "foo.docs").write_text("b")
+            do_request(server, f"GET /livereload/{initial_epoch}/0")
+
+            headers, output = do_request(server, "GET /foo.html", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertNotEqual(headers["etag"], etag)
+            self.assertIn(f"livereload({server._visible_epoch}, ", output)
+
+    @tempdir({"test.js": "console.log('hi');" * 50, "small.css": "div {}", "test.png": "x" * 1000})
+    def test_serves_compressed_files(self, site_dir):
+        with testing_server(site_dir) as server:
+            accept = {"Accept-Encoding": "gzip, deflate"}
+            headers, output = do_request(server, "GET /test.js", accept)
+            self.assertEqual(headers["content-encoding"], "gzip")
+            self.assertEqual(headers["vary"], "Accept-Encoding")
+            self.assertLess(int(headers["content-length"]), len(output))
+            self.assertEqual(output, "console.log('hi');" * 50)
+            gzip_etag = headers["etag"]
+
+            headers, output = do_request(server, "GET /test.js")
+            self.assertNotIn("content-encoding", headers)
+            self.assertEqual(headers["vary"], "Accept-Encoding")
+            self.assertEqual(headers["content-length"], str(len(output)))
+            self.assertNotEqual(headers["etag"], gzip_etag)
+
+            headers, _ = do_request(server, "GET /test.js", {"Accept-Encoding": "gzip;q=0"})
+            self.assertNotIn("content-encoding", headers)
+
+            headers, _ = do_request(server, "GET /test.js", {"If-None-Match": gzip_etag, **accept})
+            self.assertEqual(headers["_status"], "304 Not Modified")
+
+            for path in "/small.css", "/test.png":
+                with self.subTest(path):
+                    headers, _ = do_request(server, "GET " + path, accept)
+                    self.assertNotIn("content-encoding", headers)
+                    self.assertNotIn("vary", headers)
+
     @tempdir({"index.html": "<body>aaa</body>", "foo/index.html": "<body>bbb</body>"})
     def test_serves_directory_index(self, site_dir):
         with testing_server(site_dir) as server:
@@ -624,3 +889,66 @@ class BuildTests(unittest.TestCase):
 
             Path(docs_dir, "subdir", "test").write_text("test")
             self.assertTrue(started_building.wait(timeout=10))
+
+
+class AsyncServerTests(unittest.TestCase):
+    @tempdir()
+    def test_shutdown_before_start(self, site_dir):
+        server = LiveReloadServer(
+            lambda: None, host="127.0.0.1", port=0, root=site_dir, use_asyncio=True
+        )
+        server.server_bind()
+        # E.g. a KeyboardInterrupt during the initial build.
+        thread = threading.Thread(target=server.shutdown, kwargs=dict(wait=True), daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(server.socket.fileno(), -1)
+
+    @tempdir({"test.css": "div { color: red; }", "index.html": "<body>hi</body>"})
+    def test_serves_files(self, site_dir):
+        with running_async_server(site_dir) as server:
+            server.watch(site_dir)
+            response, output = do_async_request(server, "/test.css")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(output, "div { color: red; }")
+            self.assertEqual(response.getheader("Content-Type"), "text/css")
+
+            response, output = do_async_request(server, "/")
+            self.assertEqual(response.status, 200)
+            self.assertRegex(output, fr"^<body>hi{SCRIPT_REGEX}</body>$")
+            self.assertIn("var start = true && window.EventSource ? listen : poll;", output)
+
+            with self.assertLogs("mkdocs.livereload") as cm:
+                response, output = do_async_request(server, "/missing.css")
+            self.assertEqual(response.status, 404)
+            self.assertIn('"GET /missing.css HTTP/1.1" code 404', "\n".join(cm.output))
+
+    @tempdir({"foo.docs": "a"})
+    @tempdir({"index.html": "<body>hi</body>"})
+    def test_push_notification(self, site_dir, docs_dir):
+        with running_async_server(site_dir) as server:
+            server.watch(docs_dir)
+            epoch = server._visible_epoch
+
+            conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+            with self.assertLogs("mkdocs.livereload"):
+                conn.request("GET", f"/livereload/events/{epoch}")
+                response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+
+            time.sleep(0.01)
+            Path(docs_dir, "foo.docs").write_text("b")
+            line = response.fp.readline()
+            self.assertRegex(line, rb"^data: [0-9]+\n$")
+            self.assertGreater(int(line[6:]), epoch)
+            conn.close()
+
+    @tempdir({"index.html": "<body>hi</body>"})
+    def test_polling_still_supported(self, site_dir):
+        with running_async_server(site_dir) as server:
+            epoch = server._visible_epoch
+            response, output = do_async_request(server, f"/livereload/{epoch - 1}/123")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(output, str(epoch))
@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 import unittest
 from typing import TYPE_CHECKING, Optional
+from unittest import mock
 
 if TYPE_CHECKING:
     from typing_extensions import assert_type
@@ -230,6 +231,29 @@ class TestPluginCollection(unittest.TestCase):
             'second new page content',
         )
 
+    def test_event_stats(self):
+        collection = plugins.PluginCollection()
+        plugin = DummyPlugin()
+        plugin.load_config({'foo': 'new'})
+        collection['foo'] = plugin
+        times = iter([1.0, 1.5, 2.0, 2.25, 3.0, 6.0])
+        with mock.patch('time.perf_counter', lambda: next(times)):
+            collection.on_page_content('page content', page=None, config={}, files=[])
+            collection.on_page_content('page content', page=None, config={}, files=[])
+            collection.on_nav(['nav item'], config={}, files=[])
+
+        self.assertEqual(set(collection.event_stats), {('foo', 'page_content'), ('foo', 'nav')})
+        stats = collection.event_stats['foo', 'page_content']
+        self.assertEqual((stats.calls, stats.seconds), (2, 0.75))
+        stats = collection.event_stats['foo', 'nav']
+        self.assertEqual((stats.calls, stats.seconds), (1, 3.0))
+        self.assertEqual(
+            collection._format_event_stats(),
+            'Plugin  Event            Calls  Total (s)  Per call (ms)\n'
+            'foo     on_nav               1      3.000        3000.00\n'
+            'foo     on_page_content      2      0.750         375.00',
+        )
+
     def test_event_returns_None(self):
         collection = plugins.PluginCollection()
         plugin = DummyPlugin()
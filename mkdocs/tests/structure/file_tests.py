@@ -1,9 +1,18 @@
 import os
+import pickle
 import sys
 import unittest
 from unittest import mock
 
-from mkdocs.structure.files import File, Files, _sort_files, file_sort_key, get_files
+from mkdocs.structure.files import (
+    File,
+    Files,
+    InclusionLevel,
+    _scan_dir,
+    _sort_files,
+    file_sort_key,
+    get_files,
+)
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
 
 
@@ -285,6 +294,29 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         del f.name
         self.assertFalse(f.is_documentation_page())
 
+    def test_file_pickle_and_extra_attrs(self):
+        f = File('foo.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        self.assertEqual(f.url, 'foo/')
+        f.dest_uri = 'bar.html'
+        # Plugins can still add their own attributes.
+        f.extra = 'baz'
+
+        copied = pickle.loads(pickle.dumps(f))
+        self.assertEqual(copied.src_uri, 'foo.md')
+        self.assertEqual(copied.url, 'foo/')
+        self.assertEqual(copied.dest_uri, 'bar.html')
+        self.assertEqual(copied.extra, 'baz')
+        self.assertIsNone(copied.page)
+
+    def test_file_subclass_defaults(self):
+        class _GeneratedFile(File):
+            generated_by = 'my-plugin'
+
+        f = _GeneratedFile('foo.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        self.assertEqual(f.generated_by, 'my-plugin')
+        self.assertIsNone(f.page)
+        self.assertIsNone(f.edit_uri)
+
     def test_generated_file(self):
         f = File(
             'foo/bar.md',
@@ -599,8 +631,81 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         )
         self.assertEqual(
             [f.src_uri for f in files if f.inclusion.is_excluded()],
-            ['.dotfile', 'templates/foo.html'],
+            ['.dotfile'],
+        )
+
+    @tempdir(
+        files=[
+            'index.md',
+            '.git/HEAD',
+            'node_modules/pkg/README.md',
+            'api/index.md',
+            'api/dump/a.md',
+            'api/dump/keep.md',
+            'templates/foo.html',
+            'foo/templates/bar.md',
+        ]
+    )
+    def test_get_files_prunes_excluded_dirs(self, tdir):
+        config = load_config(docs_dir=tdir, exclude_docs='node_modules/\n/api/dump/\n')
+        with self.assertLogs('mkdocs', level='DEBUG') as cm:
+            files = get_files(config)
+        self.assertEqual(
+            [f.src_uri for f in files], ['index.md', 'api/index.md', 'foo/templates/bar.md']
         )
+        skipped = [line for line in cm.output if 'Skipping excluded directory' in line]
+        self.assertEqual(len(skipped), 4)
+
+        # A negated pattern that could match inside a directory prevents skipping it.
+        for exclude_docs, expected in [
+            ('node_modules/\n/api/dump/\n!/api/dump/keep.md', ['api/index.md', 'api/dump/keep.md']),
+            ('node_modules/\n/api/dump/\n!/api/*/keep.md', ['api/index.md', 'api/dump/keep.md']),
+            ('node_modules/\n/api/dump/\n!keep.md', ['api/index.md', 'api/dump/keep.md']),
+            ('node_modules/\n/api/dump/\n!/other/keep.md', ['api/index.md']),
+            (
+                'node_modules/\n/api/dump/\n!README.md',
+                ['node_modules/pkg/README.md', 'api/index.md'],
+            ),
+        ]:
+            with self.subTest(exclude_docs):
+                config = load_config(docs_dir=tdir, exclude_docs=exclude_docs)
+                files = get_files(config)
+                self.assertCountEqual(
+                    [f.src_uri for f in files if f.inclusion.is_included()],
+                    ['index.md', *expected, 'foo/templates/bar.md'],
+                )
+
+    @tempdir(files=['index.md', 'a/foo.md', 'b/index.md', 'b/bar.md', 'b/c/bar.png'])
+    @tempdir()
+    def test_get_files_with_snapshot(self, cache_dir, docs_dir):
+        def get_state(files):
+            return [(f.src_uri, f.dest_uri, f.url, f.inclusion) for f in files]
+
+        # Directories modified just before they're listed aren't reused, so make them older.
+        for path in ('', 'a', 'b', 'b/c'):
+            os.utime(os.path.join(docs_dir, path), (1e9, 1e9))
+        config = load_config(docs_dir=docs_dir, cache_dir=cache_dir)
+        files = get_files(config)
+        expected = get_state(files)
+        self.assertEqual(len(os.listdir(os.path.join(cache_dir, 'listings'))), 1)
+
+        with mock.patch('mkdocs.structure.files._scan_dir', wraps=_scan_dir) as scan_dir:
+            files = get_files(config)
+        scan_dir.assert_not_called()
+        self.assertEqual(get_state(files), expected)
+
+        with open(os.path.join(docs_dir, 'b', 'new.md'), 'w') as f:
+            f.write('# New')
+        with mock.patch('mkdocs.structure.files._scan_dir', wraps=_scan_dir) as scan_dir:
+            files = get_files(config)
+        scan_dir.assert_called_once_with(os.path.join(docs_dir, 'b'))
+        self.assertIn('b/new.md', files.src_uris)
+        self.assertEqual(get_state(files), get_state(get_files(load_config(docs_dir=docs_dir))))
+
+        config = load_config(docs_dir=docs_dir, cache_dir=cache_dir, use_directory_urls=False)
+        self.assertEqual(get_state(get_files(config)), get_state(get_files(config)))
+        self.assertEqual(files.get_file_from_path('a/foo.md').url, 'a/foo/')
+        self.assertEqual(get_files(config).get_file_from_path('a/foo.md').url, 'a/foo.html')
 
     @tempdir(
         files=[
@@ -731,6 +836,47 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(len(files.src_uris), 6)
         self.assertFalse(extra_file.src_uri in files.src_uris)
 
+    def test_files_views_are_kept_up_to_date(self):
+        fs = [
+            File('index.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('foo.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('foo.css', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+        ]
+        files = Files(fs)
+        self.assertEqual(files.documentation_pages(), [fs[0], fs[1]])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.is_excluded), [])
+        self.assertEqual(files.css_files(), [fs[2]])
+
+        # The returned lists are copies.
+        files.documentation_pages().clear()  # type: ignore[attr-defined]
+        self.assertEqual(files.documentation_pages(), [fs[0], fs[1]])
+
+        fs[1].inclusion = InclusionLevel.DRAFT
+        self.assertEqual(files.documentation_pages(), [fs[0]])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.is_excluded), [fs[1]])
+        self.assertEqual(
+            files.documentation_pages(inclusion=lambda inclusion: inclusion.is_in_serve()),
+            [fs[0], fs[1]],
+        )
+
+        extra_md = File('extra.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        extra_css = File('extra.css', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        files.append(extra_md)
+        files.append(extra_css)
+        self.assertEqual(files.documentation_pages(), [fs[0], extra_md])
+        self.assertEqual(files.css_files(), [fs[2], extra_css])
+        self.assertEqual(files.media_files(), [fs[2], extra_css])
+
+        files.remove(fs[0])
+        files.remove(fs[2])
+        self.assertEqual(files.documentation_pages(), [extra_md])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.all), [fs[1], extra_md])
+        self.assertEqual(files.css_files(), [extra_css])
+
+        with self.assertWarns(DeprecationWarning):
+            files.append(extra_md)
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.all), [fs[1], extra_md])
+
     def test_files_move_to_end(self):
         fs = [
             File('a.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
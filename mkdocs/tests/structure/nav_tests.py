@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import sys
+import threading
 import unittest
 
 from mkdocs.structure.files import File, Files, set_exclusions
@@ -531,6 +532,35 @@ class SiteNavigationTests(unittest.TestCase):
         self.assertFalse(site_navigation.items[1].children[3].active)
         self.assertFalse(site_navigation.items[1].active)
 
+    def test_active_is_per_thread(self):
+        nav_cfg = [
+            {'Home': 'index.md'},
+            {'API Guide': [{'Running': 'api-guide/running.md'}]},
+            {'About': [{'License': 'about/license.md'}]},
+        ]
+        cfg = load_config(nav=nav_cfg)
+        fs = ['index.md', 'api-guide/running.md', 'about/license.md']
+        files = Files([File(s, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls) for s in fs])
+        site_navigation = get_navigation(files, cfg)
+        api_section, about_section = site_navigation.items[1:]
+
+        site_navigation.pages[1].active = True
+        results = []
+
+        def check_other_thread():
+            results.append((api_section.active, about_section.active))
+            site_navigation.pages[2].active = True
+            results.append((api_section.active, about_section.active))
+
+        thread = threading.Thread(target=check_other_thread)
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [(False, False), (False, True)])
+        self.assertTrue(api_section.active)
+        self.assertFalse(about_section.active)
+        site_navigation.pages[1].active = False
+        self.assertFalse(api_section.active)
+
     def test_get_by_type_nested_sections(self):
         nav_cfg = [
             {
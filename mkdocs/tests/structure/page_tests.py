@@ -10,7 +10,14 @@ import markdown
 
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.structure.files import File, Files
-from mkdocs.structure.pages import Page, _ExtractTitleTreeprocessor, _RelativePathTreeprocessor
+from mkdocs.structure import pages
+from mkdocs.structure.pages import (
+    Page,
+    _ExtractAnchorsTreeprocessor,
+    _ExtractTitleTreeprocessor,
+    _RawHTMLPreprocessor,
+    _RelativePathTreeprocessor,
+)
 from mkdocs.tests.base import dedent, tempdir
 
 DOCS_DIR = os.path.join(
@@ -739,6 +746,83 @@ class PageTests(unittest.TestCase):
             ),
         )
 
+    def test_page_render_reuses_markdown(self):
+        cfg = load_config(markdown_extensions=['toc', 'footnotes', 'abbr'])
+        foo = File('foo.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        bar = File('bar.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        files = Files([foo, bar])
+        pages = [Page(None, foo, cfg), Page(None, bar, cfg)]
+        pages[0].markdown = '# Foo\n\nA note[^1] on HTML.\n\n[^1]: Note.\n\n*[HTML]: HyperText'
+        pages[1].markdown = '# Bar\n\nSee <a id="x"></a>[foo](foo.md#foo), more HTML.'
+        with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as markdown_cls:
+            for page in pages:
+                page.render(cfg, files)
+        markdown_cls.assert_called_once()
+
+        # Nothing from the first page is carried over to the second one.
+        self.assertIn('footnote', pages[0].content)
+        self.assertIn('<abbr', pages[0].content)
+        self.assertEqual(
+            pages[1].content,
+            '<h1 id="bar">Bar</h1>\n<p>See <a id="x"></a><a href="../foo/#foo">foo</a>, more HTML.</p>',
+        )
+        self.assertEqual([item.title for item in pages[1].toc], ['Bar'])
+        self.assertEqual(pages[1].title, 'Bar')
+        self.assertEqual(pages[0].present_anchor_ids, {'foo', 'fn:1', 'fnref:1'})
+        self.assertEqual(pages[1].present_anchor_ids, {'bar', 'x'})
+        self.assertEqual(pages[0].links_to_anchors, {foo: {'fn:1': '#fn:1', 'fnref:1': '#fnref:1'}})
+        self.assertEqual(pages[1].links_to_anchors, {foo: {'foo': 'foo.md#foo'}})
+
+    def test_page_render_present_anchor_ids(self):
+        cfg = load_config(markdown_extensions=['attr_list'])
+        fl = File('foo.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        pg = Page(None, fl, cfg)
+        pg.markdown = dedent(
+            '''
+            # Foo { #custom }
+
+            <div id="block"><a name="named"></a></div>
+
+            Inline <span id="inline"></span> and `<a id="code-span"></a>`.
+
+                <a id="code-block"></a>
+            '''
+        )
+        pg.render(cfg, Files([fl]))
+        self.assertEqual(pg.present_anchor_ids, {'custom', 'block', 'named', 'inline'})
+
+    def test_page_render_registers_processors(self):
+        cfg = load_config()
+        fl = File('foo.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        pg = Page(None, fl, cfg)
+        pg.markdown = '# Foo'
+        pg.render(cfg, Files([fl]))
+        pool = pages._MarkdownPool.get(cfg)
+        md = pool.free[-1]
+        # Plugins look up MkDocs' processors by their names.
+        self.assertIsInstance(md.preprocessors['mkdocs_raw_html'], _RawHTMLPreprocessor)
+        self.assertIsInstance(md.treeprocessors['relpath'], _RelativePathTreeprocessor)
+        self.assertIsInstance(
+            md.treeprocessors['mkdocs_extract_anchors'], _ExtractAnchorsTreeprocessor
+        )
+        self.assertIsInstance(md.treeprocessors['mkdocs_extract_title'], _ExtractTitleTreeprocessor)
+        self.assertGreater(
+            md.treeprocessors.get_index_for_name('relpath'),
+            md.treeprocessors.get_index_for_name('unescape'),
+        )
+
+    def test_extract_anchors_without_relpath(self):
+        cfg = load_config()
+        fl = File('foo.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+        md = markdown.Markdown(extensions=['toc'])
+        raw_html_ext = _RawHTMLPreprocessor()
+        raw_html_ext._register(md)
+        extract_anchors_ext = _ExtractAnchorsTreeprocessor(fl, Files([fl]), cfg)
+        extract_anchors_ext._register(md)
+        md.convert('# Foo\n\n<div id="block"></div>\n\n[bar](bar.md)')
+        self.assertEqual(extract_anchors_ext.present_anchor_ids, {'foo'})
+        self.assertEqual(raw_html_ext.present_anchor_ids, {'block'})
+
     def test_missing_page(self):
         cfg = load_config()
         fl = File('missing.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
@@ -1014,6 +1098,24 @@ class RelativePathExtensionTests(unittest.TestCase):
             '<a href="../non-existent.md">link</a>',
         )
 
+    def test_resolved_links_depend_on_current_files(self):
+        # Resolving links is memoized across pages and builds, which must not make results stale.
+        for files, logs, expected in [
+            (['sub/index.md', 'sub/foo.md'], '', '<a href="foo/#x">link</a>'),
+            (
+                ['sub/index.md'],
+                "WARNING:Doc file 'sub/index.md' contains a link 'foo.md#x', but the target 'sub/foo.md' is not found among documentation files.",
+                '<a href="foo.md#x">link</a>',
+            ),
+            (['sub/index.md', 'sub/foo.md'], '', '<a href="foo/#x">link</a>'),
+            (['sub/other.md', 'sub/foo.md'], '', '<a href="../foo/#x">link</a>'),
+        ]:
+            with self.subTest(files=files):
+                self.assertEqual(
+                    self.get_rendered_result(content='[link](foo.md#x)', files=files, logs=logs),
+                    expected,
+                )
+
     def test_relative_slash_link_with_suggestion(self):
         self.assertEqual(
             self.get_rendered_result(
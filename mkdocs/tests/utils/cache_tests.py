@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+import os
+import unittest
+
+from mkdocs.tests.base import tempdir
+from mkdocs.utils.cache import DiskCache
+
+
+class DiskCacheTests(unittest.TestCase):
+    @tempdir()
+    def test_get_and_set(self, cache_dir):
+        cache = DiskCache(os.path.join(cache_dir, 'pages'), max_size=1000)
+        self.assertIsNone(cache.get('abcd'))
+        cache.set('abcd', b'value')
+        self.assertEqual(cache.get('abcd'), b'value')
+        cache.set('abcd', b'other value')
+        self.assertEqual(cache.get('abcd'), b'other value')
+        self.assertEqual(os.listdir(os.path.join(cache_dir, 'pages', 'ab')), ['abcd'])
+
+    @tempdir()
+    def test_trim_evicts_least_recently_used(self, cache_dir):
+        cache = DiskCache(cache_dir, max_size=25)
+        for i, key in enumerate(['aa01', 'aa02', 'bb03', 'bb04']):
+            cache.set(key, b'x' * 10)
+            os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+        # Reading an entry marks it as recently used.
+        self.assertIsNotNone(cache.get('aa01'))
+
+        cache.trim()
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertIsNone(cache.get('aa02'))
+        self.assertIsNone(cache.get('bb03'))
+        self.assertIsNotNone(cache.get('bb04'))
+
+    @tempdir()
+    def test_trim_missing_dir(self, cache_dir):
+        cache = DiskCache(os.path.join(cache_dir, 'missing'), max_size=0)
+        cache.trim()
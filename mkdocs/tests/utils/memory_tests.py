@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import os
+import tracemalloc
+import unittest
+
+from mkdocs.commands import build
+from mkdocs.tests.base import load_config, tempdir
+from mkdocs.utils import memory
+
+
+class MemoryTests(unittest.TestCase):
+    def test_phase_without_report(self):
+        with memory.phase('foo'):
+            pass
+        self.assertIsNone(memory.MemoryReport.active)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_report_memory(self):
+        with self.assertLogs('mkdocs') as cm:
+            with memory.report_memory():
+                report = memory.MemoryReport.active
+                self.assertTrue(tracemalloc.is_tracing())
+                with memory.phase('allocate'):
+                    data = [bytearray(1024 * 1024) for _ in range(4)]
+                with memory.phase('free'):
+                    del data
+        self.assertIsNone(memory.MemoryReport.active)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        allocate, free = report.phases
+        self.assertEqual((allocate.name, free.name), ('allocate', 'free'))
+        self.assertGreaterEqual(allocate.change, 4 * 1024 * 1024)
+        self.assertGreaterEqual(allocate.peak, allocate.retained)
+        self.assertLessEqual(free.change, -4 * 1024 * 1024)
+        self.assertGreaterEqual(free.peak, allocate.retained)
+        self.assertRegex(cm.output[0], r'\nallocate +\d+\.\d MB +\d+\.\d MB +\+\d+\.\d MB\n')
+
+    @tempdir(files={'index.md': '# Home\n\n## Foo', 'foo.md': '# Foo\n\nBar'})
+    @tempdir()
+    def test_report_build(self, site_dir, docs_dir):
+        cfg = load_config(
+            docs_dir=docs_dir, site_dir=os.path.join(site_dir, 'site'), plugins=['search'], jobs=2
+        )
+        with self.assertLogs('mkdocs') as cm:
+            with memory.report_memory():
+                report = memory.MemoryReport.active
+                build.build(cfg)
+
+        output = '\n'.join(cm.output)
+        self.assertIn('Rendering pages serially, because the memory of the build', output)
+        self.assertIn('Memory used by the build:', output)
+        names = [phase.name for phase in report.phases]
+        self.assertEqual(names[0], 'on_config')
+        self.assertIn('build_pages', names)
+        self.assertEqual(names[-1], 'on_post_build')
+
+        self.assertEqual(report.objects['Page.content'][0], 2)
+        self.assertEqual(report.objects['Page.present_anchor_ids'][0], 2)
+        self.assertGreater(report.objects['Page.content'][1], 0)
+        self.assertGreater(report.objects['File'][0], 2)
+        self.assertGreater(report.objects['Jinja template cache'][0], 0)
+        self.assertGreaterEqual(report.objects['search: SearchIndex._entries'][0], 3)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import os
+import pstats
+import unittest
+
+from mkdocs.commands import build
+from mkdocs.tests.base import load_config, tempdir
+from mkdocs.utils import profiling
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_profile_page_without_profiling(self):
+        with profiling.profile_page('foo.md'):
+            pass
+        self.assertIsNone(profiling.PageProfiler.active)
+
+    def test_get_component(self):
+        def run():
+            pass
+
+        def on_page_markdown():
+            pass
+
+        self.assertIsNone(profiling._get_component(self.test_get_component.__code__))
+        self.assertIsNone(profiling._get_component(os.path.join.__code__))
+        self.assertIsNone(profiling._get_component('<built-in method len>'))
+        self.assertRegex(
+            profiling._get_component(run.__code__),
+            r"^'([\w<>]+\.)*run' \(utils/profiling_tests\.py\)$",
+        )
+        self.assertTrue(
+            profiling._get_component(on_page_markdown.__code__).startswith("plugin event '")
+        )
+        template = compile('', os.path.join('templates', 'main.html'), 'exec')
+        self.assertEqual(profiling._get_component(template), "template 'main.html'")
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo\n\n' + '*foo* ' * 1000})
+    @tempdir()
+    def test_profile_build(self, site_dir, docs_dir):
+        path = os.path.join(site_dir, 'pages.prof')
+        cfg = load_config(docs_dir=docs_dir, site_dir=os.path.join(site_dir, 'site'), jobs=2)
+        with self.assertLogs('mkdocs') as cm:
+            with profiling.profile_pages_to_file(path, count=1):
+                build.build(cfg)
+        self.assertIsNone(profiling.PageProfiler.active)
+
+        output = '\n'.join(cm.output)
+        self.assertIn('Rendering pages serially, because pages are being profiled.', output)
+        self.assertIn('The slowest pages:', output)
+        self.assertRegex(output, r'\d ms  foo\.md  \(mostly ')
+        self.assertNotIn('index.md', output)
+
+        stats = pstats.Stats(path)
+        functions = {func[2] for func in stats.stats}  # type: ignore[attr-defined]
+        self.assertIn('render', functions)
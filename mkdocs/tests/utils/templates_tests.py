@@ -1,8 +1,13 @@
 import unittest
 from textwrap import dedent
+from unittest import mock
 
+import jinja2
 import yaml
 
+from mkdocs.commands.build import get_context
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.nav import get_navigation
 from mkdocs.tests.base import load_config
 from mkdocs.utils import templates
 
@@ -47,3 +52,70 @@ class UtilsTemplatesTests(unittest.TestCase):
                 '<script src="here/plain_string.mjs"></script>',
             ],
         )
+
+    def test_nav_fragment(self):
+        cfg = load_config(
+            use_directory_urls=False,
+            nav=[
+                {'Home': 'index.md'},
+                {'A': [{'One': 'a/one.md'}, {'Two': 'a/two.md'}]},
+                {'B': [{'Three': 'b/three.md'}]},
+            ],
+        )
+        fs = ['index.md', 'a/one.md', 'a/two.md', 'b/three.md']
+        files = Files([File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls) for f in fs])
+        nav = get_navigation(files, cfg)
+        doc_files = files.documentation_pages()
+        item_template = (
+            "({{ nav_item.title }}{% if nav_item.active %}*{% endif %}{{ extra }}"
+            "{% for nav_item in nav_item.children or [] %} {{ include_item }}{% endfor %}"
+            "{% if nav_item.is_page %} {{ nav_item.url|url }}{% endif %})"
+        )
+        env = jinja2.Environment(
+            loader=jinja2.DictLoader(
+                {
+                    'main.html': "{% for nav_item in nav %}{{ nav_item|nav_fragment('item.html') }}{% endfor %}",
+                    'item.html': item_template.replace(
+                        '{{ include_item }}', "{{ nav_item|nav_fragment('item.html') }}"
+                    ),
+                    'main_include.html': "{% for nav_item in nav %}{% include 'item_include.html' %}{% endfor %}",
+                    'item_include.html': item_template.replace(
+                        '{{ include_item }}', "{% include 'item_include.html' %}"
+                    ),
+                }
+            )
+        )
+        env.filters['url'] = templates.url_filter
+        env.filters['nav_fragment'] = templates.nav_fragment_filter
+
+        def render(page, template_name='main.html', **extra):
+            page.active = True
+            try:
+                context = {**get_context(nav, doc_files, cfg, page), **extra}
+                return env.get_template(template_name).render(context)
+            finally:
+                page.active = False
+
+        home, one, two, three = nav.pages
+        self.assertEqual(
+            render(one),
+            '(Home ../index.html)(A* (One* one.html) (Two two.html))(B (Three ../b/three.html))',
+        )
+        with mock.patch.object(
+            jinja2.Template, 'render', autospec=True, side_effect=jinja2.Template.render
+        ) as m:
+            self.assertEqual(
+                render(two),
+                '(Home ../index.html)(A* (One one.html) (Two* two.html))(B (Three ../b/three.html))',
+            )
+        # The other items were already rendered while inactive, for a page in the same directory.
+        # Only 'main.html', 'A' and its pages (active now or active before) are rendered.
+        self.assertEqual(m.call_count, 4)
+
+        # The output is the same as with `{% include %}`, including variables added to the context.
+        for page in home, one, two, three:
+            for extra in {}, {'extra': '!'}:
+                with self.subTest(page=page.url, extra=extra):
+                    self.assertEqual(
+                        render(page, **extra), render(page, 'main_include.html', **extra)
+                    )
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+import json
+import os
+import threading
+import unittest
+
+from mkdocs.commands import build
+from mkdocs.tests.base import load_config, tempdir
+from mkdocs.utils import tracing
+
+
+class TracingTests(unittest.TestCase):
+    def test_span_without_tracing(self):
+        with tracing.span('foo', x=1):
+            pass
+        self.assertIsNone(tracing._Tracer.active)
+        self.assertEqual(tracing._take_events(), [])
+
+    @tempdir()
+    def test_trace_to_file(self, out_dir):
+        path = os.path.join(out_dir, 'trace.json')
+        with tracing.trace_to_file(path):
+            with tracing.span('outer', 'test', x=1):
+                with tracing.span('inner'):
+                    pass
+
+            def in_thread():
+                with tracing.span('other'):
+                    pass
+
+            thread = threading.Thread(target=in_thread)
+            thread.start()
+            thread.join()
+        self.assertIsNone(tracing._Tracer.active)
+
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual(events[0]['ph'], 'M')
+        spans = {event['name']: event for event in events[1:]}
+        self.assertEqual(set(spans), {'outer', 'inner', 'other'})
+        outer, inner = spans['outer'], spans['inner']
+        self.assertEqual((outer['cat'], outer['ph'], outer['args']), ('test', 'X', {'x': 1}))
+        self.assertEqual((inner['cat'], inner['ph']), ('plugin', 'X'))
+        self.assertNotIn('args', inner)
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+        self.assertEqual(outer['tid'], inner['tid'])
+        self.assertNotEqual(outer['tid'], spans['other']['tid'])
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir()
+    def test_trace_build(self, site_dir, docs_dir):
+        path = os.path.join(site_dir, 'trace.json')
+        cfg = load_config(docs_dir=docs_dir, site_dir=os.path.join(site_dir, 'site'))
+        with tracing.trace_to_file(path):
+            build.build(cfg)
+
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        names = [event['name'] for event in events if event['ph'] == 'X']
+        for phase in (
+            'on_config',
+            'on_pre_build',
+            'get_files',
+            'on_files',
+            'get_navigation',
+            'on_env',
+            'copy_static_files',
+            'build_templates',
+            'validate_anchor_links',
+            'on_post_build',
+        ):
+            self.assertEqual(names.count(phase), 1, phase)
+        pages = [event['args']['page'] for event in events if event['name'] == 'populate_page']
+        self.assertEqual(sorted(pages), ['foo.md', 'index.md'])
+        pages = [event['args']['page'] for event in events if event['name'] == 'build_page']
+        self.assertEqual(sorted(pages), ['foo.md', 'index.md'])
@@ -162,5 +162,6 @@ class Theme(MutableMapping[str, Any]):
         env = jinja2.Environment(loader=loader, auto_reload=False)
         env.filters['url'] = templates.url_filter
         env.filters['script_tag'] = templates.script_tag_filter
+        env.filters['nav_fragment'] = templates.nav_fragment_filter
         localization.install_translations(env, self.locale, self.dirs)
         return env
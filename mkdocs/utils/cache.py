@@ -1,11 +1,18 @@
-import datetime
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
 import urllib.request
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 import mkdocs_get_deps.cache
 
 import mkdocs
 
+if TYPE_CHECKING:
+    import datetime
+
 
 def download_url(url: str) -> bytes:
     req = urllib.request.Request(url, headers={"User-Agent": f"mkdocs/{mkdocs.__version__}"})
@@ -34,3 +41,67 @@ def download_and_cache_url(
     return mkdocs_get_deps.cache.download_and_cache_url(
         url=url, cache_duration=cache_duration, download=download, comment=comment
     )
+
+
+class DiskCache:
+    """
+    A persistent mapping of string keys to bytes, stored as one file per entry in a directory.
+
+    The size of the directory is limited by `trim()`, which evicts the least recently used entries.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under the key, or `None` if there is no such entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+        except OSError:
+            return None
+        # Mark the entry as recently used.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store the value under the key, replacing any previous entry."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so that concurrent readers never see a partial entry.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    def trim(self) -> None:
+        """Delete the least recently used entries until the total size is within `max_size`."""
+        entries = []
+        total_size = 0
+        with contextlib.suppress(FileNotFoundError), os.scandir(self.path) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as files:
+                    for entry in files:
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total_size -= size
@@ -0,0 +1,159 @@
+"""Measurement of the memory used by each phase of a build, and by the objects that it keeps."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING, Any, ClassVar, ContextManager, Iterable, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    import jinja2
+
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure.files import Files
+
+log = logging.getLogger(__name__)
+
+
+class _PhaseStats(NamedTuple):
+    name: str
+    peak: int
+    """The most memory allocated at any moment during the phase."""
+    retained: int
+    """The memory still allocated at the end of the phase."""
+    change: int
+    """How much the allocated memory grew (or shrank) during the phase."""
+
+
+class MemoryReport:
+    """Measures the memory used by each phase of a build, and by the objects that the build keeps."""
+
+    active: ClassVar[MemoryReport | None] = None
+    """The report of the current build, if its memory is measured."""
+
+    def __init__(self) -> None:
+        self.phases: list[_PhaseStats] = []
+        self.objects: dict[str, tuple[int, int]] = {}
+        """Maps a kind of objects to their count and their total size."""
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # Python 3.9+, otherwise the peak is of the whole build.
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases.append(_PhaseStats(name, peak, current, current - start))
+
+    def format(self) -> str:
+        lines = [f"{'Phase':<32} {'Peak':>10} {'Retained':>10} {'Change':>10}"]
+        for phase in self.phases:
+            lines.append(
+                f"{phase.name:<32} {_format_size(phase.peak):>10} "
+                f"{_format_size(phase.retained):>10} {_format_size(phase.change, sign=True):>10}"
+            )
+        if self.objects:
+            lines.append('')
+            lines.append(f"{'Objects':<32} {'Count':>10} {'Size':>10}")
+            for kind, (count, size) in sorted(self.objects.items(), key=lambda item: -item[1][1]):
+                lines.append(f"{kind:<32} {count:>10} {_format_size(size):>10}")
+        return '\n'.join(lines)
+
+
+def _format_size(size: int, sign: bool = False) -> str:
+    return f"{size / 1024 / 1024:{'+' if sign else ''}.1f} MB"
+
+
+def _strings_size(strings: Iterable[Any]) -> int:
+    return sum(sys.getsizeof(s) for s in strings if isinstance(s, (str, bytes)))
+
+
+def _slot_values(obj: object) -> Iterator[Any]:
+    # Accessing `__dict__` would create it, it's only there for the attributes that plugins add.
+    for name in type(obj).__slots__:  # type: ignore[attr-defined]
+        if not name.startswith('__'):
+            yield getattr(obj, name, None)
+
+
+def _code_size(code: Any) -> int:
+    """Get the size of a code object, including the code objects nested in it."""
+    size = sys.getsizeof(code) + sys.getsizeof(code.co_code)
+    for const in code.co_consts:
+        size += _code_size(const) if hasattr(const, 'co_code') else sys.getsizeof(const)
+    return size
+
+
+def _template_size(template: jinja2.Template) -> int:
+    functions = [template.root_render_func, *template.blocks.values()]
+    return sys.getsizeof(template) + sum(_code_size(f.__code__) for f in functions)
+
+
+def _measure_objects(
+    config: MkDocsConfig, files: Files, env: jinja2.Environment
+) -> dict[str, tuple[int, int]]:
+    pages = [file.page for file in files if file.page is not None]
+    markdowns = [page.markdown for page in pages if page.markdown is not None]
+    contents = [page.content for page in pages if page.content is not None]
+    anchor_sets = [page.present_anchor_ids for page in pages if page.present_anchor_ids]
+    objects = {
+        'Page.markdown': (len(markdowns), _strings_size(markdowns)),
+        'Page.content': (len(contents), _strings_size(contents)),
+        'Page.present_anchor_ids': (
+            len(anchor_sets),
+            sum(sys.getsizeof(ids) + _strings_size(ids) for ids in anchor_sets),
+        ),
+        'File': (
+            len(files),
+            sum(sys.getsizeof(file) + _strings_size(_slot_values(file)) for file in files),
+        ),
+    }
+    # Templates are cached in the environment, along with the code that Jinja compiled for them.
+    templates = list(env.cache.values()) if env.cache is not None else []
+    objects['Jinja template cache'] = (len(templates), sum(_template_size(t) for t in templates))
+
+    for name, plugin in config.plugins.items():
+        entries = getattr(getattr(plugin, 'search_index', None), '_entries', None)
+        if isinstance(entries, list):
+            size = sys.getsizeof(entries) + sum(
+                sys.getsizeof(entry) + _strings_size(entry.values()) for entry in entries
+            )
+            objects[f'{name}: SearchIndex._entries'] = (len(entries), size)
+    return objects
+
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Measure the memory used by the code in the `with` block, if the build's memory is measured."""
+    if (report := MemoryReport.active) is None:
+        return _NO_PHASE
+    return report.phase(name)
+
+
+def measure_objects(config: MkDocsConfig, files: Files, env: jinja2.Environment) -> None:
+    """Measure the size of the objects that the build keeps, if the build's memory is measured."""
+    if (report := MemoryReport.active) is not None:
+        report.objects = _measure_objects(config, files, env)
+
+
+@contextlib.contextmanager
+def report_memory() -> Iterator[None]:
+    """Trace memory allocations while the block runs, then report the memory used by each phase."""
+    report = MemoryReport.active = MemoryReport()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        MemoryReport.active = None
+        if started:
+            tracemalloc.stop()
+        if report.phases:
+            log.info(f"Memory used by the build:\n{report.format()}")
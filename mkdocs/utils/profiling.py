@@ -0,0 +1,130 @@
+"""Profiling of the rendering of each page, to find the slowest pages and what makes them slow."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import logging
+import os
+import pstats
+import sysconfig
+import time
+from typing import ClassVar, ContextManager, Iterator
+
+log = logging.getLogger(__name__)
+
+# Functions that run the processors of Markdown extensions, their time is attributed to the processor.
+_PROCESSOR_METHODS = ('run', 'handleMatch')
+
+_STDLIB_DIR = os.path.normcase(sysconfig.get_paths()['stdlib'])
+# Installed packages can be inside of the stdlib directory, but they're not part of it.
+_PACKAGES_DIRS = tuple(
+    {os.path.normcase(sysconfig.get_paths()[key]) for key in ('purelib', 'platlib')}
+)
+
+# The plugin collection only dispatches the events, the time is attributed to the plugins.
+_PLUGINS_MODULE = os.path.normcase(os.path.join('mkdocs', 'plugins.py'))
+
+
+class _PageStats:
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.components: dict[str, float] = {}
+
+    def dominant(self) -> tuple[str, float] | None:
+        if not self.components:
+            return None
+        return max(self.components.items(), key=lambda item: item[1])
+
+
+def _get_component(code: object) -> str | None:
+    """Get the name of the extension processor or template that the code belongs to, if it's one."""
+    filename = getattr(code, 'co_filename', None)
+    if not filename or filename.startswith('<'):
+        return None
+    if not filename.endswith('.py'):
+        # Jinja compiles templates with their file name.
+        return f"template '{os.path.basename(filename)}'"
+    name: str = code.co_name  # type: ignore[attr-defined]
+    path = os.path.normcase(filename)
+    if path.startswith(_STDLIB_DIR) and not path.startswith(_PACKAGES_DIRS):
+        return None
+    qualname: str = getattr(code, 'co_qualname', name)
+    short_path = '/'.join(filename.replace(os.sep, '/').rsplit('/', 2)[-2:])
+    if name.startswith('on_') and not path.endswith(_PLUGINS_MODULE):
+        return f"plugin event '{qualname}' ({short_path})"
+    if name in _PROCESSOR_METHODS:
+        return f"'{qualname}' ({short_path})"
+    return None
+
+
+class PageProfiler:
+    """Profiles the rendering of each page separately, and keeps the merged stats of all pages."""
+
+    active: ClassVar[PageProfiler | None] = None
+    """The profiler of the current build, if it's profiled."""
+
+    def __init__(self) -> None:
+        self.pages: dict[str, _PageStats] = {}
+        self.stats: pstats.Stats | None = None
+
+    @contextlib.contextmanager
+    def profile(self, src_uri: str) -> Iterator[None]:
+        page = self.pages.setdefault(src_uri, _PageStats())
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiler is already active, e.g. for a nested call.
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            page.seconds += time.perf_counter() - start
+            for entry in profiler.getstats():
+                if component := _get_component(entry.code):
+                    # Recursive calls would be counted repeatedly, keep the outermost one.
+                    current = page.components.get(component, 0.0)
+                    page.components[component] = max(current, entry.totaltime)
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def format_slowest_pages(self, count: int) -> str:
+        lines = []
+        slowest = sorted(self.pages.items(), key=lambda item: -item[1].seconds)[:count]
+        for src_uri, page in slowest:
+            line = f"{page.seconds * 1000:9.2f} ms  {src_uri}"
+            if dominant := page.dominant():
+                line += f"  (mostly {dominant[0]}: {dominant[1] * 1000:.2f} ms)"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+_NO_PROFILE = contextlib.nullcontext()
+
+
+def profile_page(src_uri: str) -> ContextManager[None]:
+    """Profile the code in the `with` block as part of the page, if pages are being profiled."""
+    if (profiler := PageProfiler.active) is None:
+        return _NO_PROFILE
+    return profiler.profile(src_uri)
+
+
+@contextlib.contextmanager
+def profile_pages_to_file(path: str, count: int = 10) -> Iterator[None]:
+    """Profile each page while the block runs, then report the slowest ones and save the stats to `path`."""
+    profiler = PageProfiler.active = PageProfiler()
+    try:
+        yield
+    finally:
+        PageProfiler.active = None
+        if profiler.stats is not None:
+            profiler.stats.dump_stats(path)
+            log.info(
+                f"The slowest pages:\n{profiler.format_slowest_pages(count)}\n"
+                f"Wrote the profile of all pages to '{path}'"
+            )
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence, TypedDict
+import weakref
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, TypedDict
 
 if TYPE_CHECKING:
     import datetime
 
+import jinja2.meta
+from jinja2 import nodes
 from markupsafe import Markup
 
 try:
@@ -15,10 +18,12 @@ except ImportError:
 from mkdocs.utils import normalize_url
 
 if TYPE_CHECKING:
+    from jinja2.runtime import Context
+
     from mkdocs.config.config_options import ExtraScriptValue
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocs.structure.files import File
-    from mkdocs.structure.nav import Navigation
+    from mkdocs.structure.nav import Link, Navigation, Section
     from mkdocs.structure.pages import Page
 
 
@@ -53,3 +58,68 @@ def script_tag_filter(context: TemplateContext, extra_script: ExtraScriptValue)
             html += ' async'
     html += '></script>'
     return Markup(html).format(url_filter(context, str(extra_script)), extra_script)
+
+
+_nav_fragments: weakref.WeakKeyDictionary[Navigation, dict[tuple, tuple[Markup, list]]]
+_nav_fragments = weakref.WeakKeyDictionary()
+
+
+@contextfilter
+def nav_fragment_filter(
+    context: Context, nav_item: Page | Section | Link, template_name: str, **variables: Any
+) -> Markup:
+    """
+    A Template filter to render the template of a navigation item, as `{% include %}` would.
+
+    Items that aren't active (the current page isn't among them or their children) render the
+    same for every page in the same directory, if the rest of the context is also the same, so
+    their HTML is cached for the rest of the build.
+    """
+    env = context.environment
+    variables = {**context.get_all(), 'nav_item': nav_item, **variables}
+    if nav_item.active:
+        return Markup(env.get_template(template_name).render(variables))
+
+    # URLs relative to the page only depend on its directory.
+    page = variables.get('page')
+    url = getattr(page, 'url', None)
+    if url is not None:
+        dirname, _, basename = url.rpartition('/')
+        url = dirname if '.' in basename else url
+    key: list = [template_name, url]
+    objects = []
+    for name, value in sorted(variables.items()):
+        if name == 'page':
+            continue
+        if isinstance(value, (list, tuple)) and all(map(_is_simple_value, value)):
+            value = tuple(value)
+        elif not _is_simple_value(value):
+            # The objects are kept alive along with the HTML, so that their IDs aren't reused.
+            objects.append(value)
+            value = id(value)
+        key += (name, value)
+    try:
+        cache = _nav_fragments.setdefault(context['nav'], {})
+    except TypeError:  # A `nav` that isn't a `Navigation`, nothing to keep the cache with.
+        cache = {}
+    if (entry := cache.get(key_tuple := tuple(key))) is None:
+        html = Markup(env.get_template(template_name).render(variables))
+        entry = cache[key_tuple] = (html, objects)
+    return entry[0]
+
+
+def _is_simple_value(value: object) -> bool:
+    return value is None or isinstance(value, (str, int, float))
+
+
+def _find_referenced_templates(ast: nodes.Template) -> Iterator[str | None]:
+    """Like `jinja2.meta.find_referenced_templates`, but also finds templates rendered through `nav_fragment`."""
+    yield from jinja2.meta.find_referenced_templates(ast)
+    for node in ast.find_all(nodes.Filter):
+        if node.name == 'nav_fragment':
+            name = node.args[0] if node.args else None
+            if isinstance(name, nodes.Const) and isinstance(name.value, str):
+                yield name.value
+            else:
+                # The template name is computed at runtime.
+                yield None
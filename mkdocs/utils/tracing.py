@@ -0,0 +1,110 @@
+"""Recording of timed spans of a build, exported in the Chrome trace event format."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, ClassVar, ContextManager, Iterator
+
+log = logging.getLogger(__name__)
+
+
+class _Tracer:
+    active: ClassVar[_Tracer | None] = None
+    """The tracer that records the spans of the current build, if it's traced."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, category: str, start: int, end: int, args: dict[str, Any]) -> None:
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start / 1000,
+            'dur': (end - start) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name: str, category: str = 'plugin', **args: Any) -> ContextManager[None]:
+    """
+    Record the time that the code in the `with` block takes, if the build is traced.
+
+    Spans appear in the trace written by `mkdocs build --trace`. They can be nested, and they're
+    recorded per thread. When the build isn't traced, this does nothing.
+
+    Arguments:
+        name: The name of the span, shown in the trace viewer.
+        category: The category of the span, to be able to filter spans in the trace viewer.
+        **args: Additional JSON-serializable data to show for the span.
+
+    Example:
+        ```python
+        from mkdocs.utils.tracing import span
+
+        def on_post_build(self, config, **kwargs):
+            with span("my_plugin: write index", entries=len(self.entries)):
+                ...
+        ```
+    """
+    if (tracer := _Tracer.active) is None:
+        return _NO_SPAN
+    return _record_span(tracer, name, category, args)
+
+
+@contextlib.contextmanager
+def _record_span(tracer: _Tracer, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        tracer.add(name, category, start, time.perf_counter_ns(), args)
+
+
+def _take_events() -> list[dict[str, Any]]:
+    """Remove and return the spans recorded so far, e.g. to send them from a worker process."""
+    if (tracer := _Tracer.active) is None:
+        return []
+    with tracer._lock:
+        events, tracer.events = tracer.events, []
+    return events
+
+
+def _add_events(events: list[dict[str, Any]]) -> None:
+    """Add spans that were recorded elsewhere, e.g. in a worker process."""
+    if (tracer := _Tracer.active) is not None and events:
+        with tracer._lock:
+            tracer.events.extend(events)
+
+
+@contextlib.contextmanager
+def trace_to_file(path: str) -> Iterator[None]:
+    """Record all spans while the block runs, then write them to `path` as a Chrome trace."""
+    tracer = _Tracer.active = _Tracer()
+    try:
+        yield
+    finally:
+        _Tracer.active = None
+        events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'mkdocs ({pid})'}}
+            for pid in sorted({event['pid'] for event in tracer.events})
+        ]
+        events.extend(sorted(tracer.events, key=lambda event: event['ts']))
+        data = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        log.info(f"Wrote the trace of the build to '{path}'")